@@ -0,0 +1,112 @@
+# Per-request overhead of RetryableExecutor addons.
+# "naive" awaits every hook of every addon (as it was done before hooks were
+# compiled), "compiled" is the current RetryableExecutor.
+
+import asyncio
+import time
+from typing import Any
+
+from multidict import CIMultiDict
+from yarl import URL
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.addons.auth import StaticBearerAuthAddon
+from extapi.http.addons.headers import AddHeadersAddon
+from extapi.http.addons.status import StatusValidationAddon
+from extapi.http.executors.retry import RetryableExecutor
+from extapi.http.types import BackendResponseProtocol, RequestData, Response
+
+N = 100_000
+
+
+class NullResponse(BackendResponseProtocol[None]):
+    def original(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return b""
+
+
+class NullExecutor(AbstractExecutor[None]):
+    async def execute(self, request: RequestData) -> Response[None]:
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=200,
+            backend_response=NullResponse(),
+        )
+
+
+class NaiveRetryableExecutor(RetryableExecutor[Any]):
+    async def _before_request(self, request: RequestData):
+        for addon in self._addons:
+            await addon.before_request(request)
+
+    async def _process_response(self, request, response):
+        for addon in self._addons:
+            response = await addon.process_response(request, response)
+        return response
+
+    async def _need_retry(self, response):
+        for addon in self._retry_addons:
+            need_retry, timeout = await addon.need_retry(response)
+            if need_retry:
+                return need_retry, timeout
+        return False, None
+
+
+def add_client_header(headers: CIMultiDict) -> None:
+    headers["X-Client"] = "bench"
+
+
+async def run(executor: RetryableExecutor) -> float:
+    request = RequestData(method="GET", url=URL("https://example.com"))
+    started_at = time.perf_counter()
+    for _ in range(N):
+        await executor.execute(request)
+    return time.perf_counter() - started_at
+
+
+async def run_hooks(executor: RetryableExecutor) -> float:
+    # the addon pipeline alone, without the rest of execute()
+    request = RequestData(method="GET", url=URL("https://example.com"))
+    response = await NullExecutor().execute(request)
+    started_at = time.perf_counter()
+    for _ in range(N):
+        await executor._before_request(request)
+        await executor._process_response(request, response)
+        await executor._need_retry(response)
+    return time.perf_counter() - started_at
+
+
+def report(name: str, naive_time: float, compiled_time: float) -> None:
+    print(f"{name}:")
+    print(f"  naive:    {naive_time / N * 1e6:.2f} us/request")
+    print(f"  compiled: {compiled_time / N * 1e6:.2f} us/request")
+    print(f"  speedup:  {naive_time / compiled_time:.2f}x")
+
+
+async def main():
+    addons: list[Any] = [
+        AddHeadersAddon(add_client_header),
+        StaticBearerAuthAddon("token"),
+        StatusValidationAddon(),
+    ]
+    naive = NaiveRetryableExecutor(NullExecutor(), addons=addons, log_retries=False)
+    compiled = RetryableExecutor(NullExecutor(), addons=addons, log_retries=False)
+
+    for name, runner in (("hooks", run_hooks), ("execute", run)):
+        # warm up
+        await runner(naive)
+        await runner(compiled)
+
+        naive_time = min([await runner(naive) for _ in range(3)])
+        compiled_time = min([await runner(compiled) for _ in range(3)])
+        report(name, naive_time, compiled_time)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
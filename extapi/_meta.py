@@ -4,3 +4,8 @@ import sys
 PY311 = sys.version_info >= (3, 11)
 has_open_telemetry = importlib.util.find_spec("opentelemetry") is not None
 has_prometheus = importlib.util.find_spec("prometheus_client") is not None
+has_fcntl = importlib.util.find_spec("fcntl") is not None
+has_orjson = importlib.util.find_spec("orjson") is not None
+has_msgspec = importlib.util.find_spec("msgspec") is not None
+has_zstandard = importlib.util.find_spec("zstandard") is not None
+has_brotli = importlib.util.find_spec("brotli") is not None
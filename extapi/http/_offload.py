@@ -0,0 +1,30 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor
+from typing import Any, TypeVar
+
+DEFAULT_OFFLOAD_SIZE = 1024 * 1024
+
+T = TypeVar("T")
+
+
+def loads_str(loads: Callable[[str], Any], encoding: str | None, data: bytes) -> Any:
+    # module level to be picklable for process pools
+    if encoding is None:
+        return loads(data.decode())
+    return loads(data.decode(encoding=encoding))
+
+
+async def run_decode(
+    decode: Callable[[bytes], T],
+    data: bytes,
+    *,
+    pool: Executor | None,
+    offload_size: int = DEFAULT_OFFLOAD_SIZE,
+) -> T:
+    # Bodies of at least `offload_size` bytes are decoded in `pool` not to
+    # block the event loop, small ones inline: handing them over costs more.
+    # `decode` has to be picklable for a ProcessPoolExecutor.
+    if pool is None or len(data) < offload_size:
+        return decode(data)
+    return await asyncio.get_running_loop().run_in_executor(pool, decode, data)
@@ -0,0 +1,195 @@
+import json
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Sequence
+from typing import Any
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], *, keepends: bool = False
+) -> AsyncIterator[bytes]:
+    # Lines within a chunk are sliced from it directly,
+    # only a line spanning several chunks is accumulated
+    pending: bytearray | None = None
+    async for chunk in chunks:
+        start = 0
+        end = chunk.find(b"\n")
+        if pending is not None:
+            if end < 0:
+                pending += chunk
+                continue
+
+            pending += chunk[: end + 1]
+            yield _cut_line(pending, 0, len(pending), keepends)
+            pending = None
+            start = end + 1
+            end = chunk.find(b"\n", start)
+
+        while end >= 0:
+            yield _cut_line(chunk, start, end + 1, keepends)
+            start = end + 1
+            end = chunk.find(b"\n", start)
+
+        if start < len(chunk):
+            pending = bytearray(chunk[start:])
+
+    if pending:
+        yield _cut_line(pending, 0, len(pending), keepends)
+
+
+def _cut_line(buffer: bytes | bytearray, start: int, end: int, keepends: bool) -> bytes:
+    if not keepends:
+        if end > start and buffer[end - 1] == 0x0A:  # \n
+            end -= 1
+        if end > start and buffer[end - 1] == 0x0D:  # \r
+            end -= 1
+
+    return bytes(buffer[start:end])
+
+
+async def iter_ndjson(
+    lines: AsyncIterable[bytes],
+    *,
+    decode: Callable[[bytes], Any] = json.loads,
+) -> AsyncIterator[Any]:
+    # newline delimited JSON, blank lines are skipped
+    async for line in lines:
+        if line and not line.isspace():
+            yield decode(line)
+
+
+# characters that change the structure, everything else (numbers,
+# literals, whitespace, colons) is skipped by the regex engine
+_structural_re = re.compile(rb'[\[\]{}",]')
+# the rest of a string after the opening quote
+_string_tail_re = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# inside of an item only brackets matter: skips up to the next one
+# or up to a string continuing in the next chunk
+_item_skip_re = re.compile(rb'(?:[^\[\]{}"]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+
+_QUOTE = ord('"')
+_COMMA = ord(",")
+_LBRACE = ord("{")
+_LBRACKET = ord("[")
+_RBRACKET = ord("]")
+
+
+async def iter_json_items(
+    chunks: AsyncIterable[bytes],
+    path: str | Sequence[str] = (),
+    *,
+    decode: Callable[[bytes], Any] = json.loads,
+) -> AsyncIterator[Any]:
+    # Yields items of the top-level JSON array or of an array nested in
+    # objects at `path` ("data.items" or ("data", "items")) as the chunks
+    # arrive. Only the bytes of the current item are kept in memory, each
+    # item is decoded separately by `decode`.
+    keys_path: list[str | None] = list(
+        (path.split(".") if path else []) if isinstance(path, str) else path
+    )
+
+    buffer = bytearray()
+    pos = 0
+    # containers we are in and their current keys (None for arrays)
+    stack: list[int] = []
+    keys: list[str | None] = []
+    expect_key = False
+    # len(stack) inside the target array, -1 until it is found
+    target_depth = -1
+    item_start = -1
+
+    async for chunk in chunks:
+        buffer += chunk
+
+        while True:
+            depth = len(stack)
+            if depth > target_depth >= 0:
+                # inside an item, it is decoded once complete
+                pos = _item_skip_re.match(buffer, pos).end()  # type: ignore[union-attr]
+                if pos == len(buffer) or buffer[pos] == _QUOTE:
+                    break
+
+                char = buffer[pos]
+                pos += 1
+                if char == _LBRACE or char == _LBRACKET:
+                    stack.append(char)
+                    keys.append(None)
+                else:
+                    stack.pop()
+                    keys.pop()
+                continue
+
+            match = _structural_re.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+
+            start = match.start()
+            char = buffer[start]
+
+            if char == _QUOTE:
+                tail = _string_tail_re.match(buffer, start + 1)
+                if tail is None:
+                    # the string continues in the next chunk
+                    pos = start
+                    break
+
+                pos = tail.end()
+                if expect_key:
+                    if target_depth < 0:
+                        keys[-1] = json.loads(buffer[start:pos])
+                    expect_key = False
+                continue
+
+            pos = start + 1
+
+            if char == _COMMA:
+                if depth == target_depth:
+                    item = bytes(buffer[item_start:start])
+                    yield decode(item)
+                    item_start = pos
+                else:
+                    expect_key = bool(stack) and stack[-1] == _LBRACE
+
+            elif char == _LBRACE or char == _LBRACKET:
+                if (
+                    char == _LBRACKET
+                    and target_depth < 0
+                    and depth == len(keys_path)
+                    and keys == keys_path
+                ):
+                    target_depth = depth + 1
+                    item_start = pos
+
+                stack.append(char)
+                keys.append(None)
+                expect_key = char == _LBRACE
+
+            else:  # closing brace or bracket
+                if depth == target_depth and char == _RBRACKET:
+                    item = bytes(buffer[item_start:start])
+                    if item.strip():
+                        yield decode(item)
+                    return
+
+                if not stack:
+                    raise ValueError(f"unexpected {chr(char)!r} in JSON")
+                stack.pop()
+                keys.pop()
+                expect_key = False
+
+        # drop everything before the current item
+        keep_from = item_start if item_start >= 0 else pos
+        if keep_from:
+            del buffer[:keep_from]
+            pos -= keep_from
+            if item_start >= 0:
+                item_start = 0
+
+    if target_depth >= 0:
+        raise ValueError("unexpected end of JSON array")
+    # e.g. an error object instead of the expected array
+    if keys_path:
+        raise ValueError(
+            f"JSON array at path {'.'.join(map(str, keys_path))!r} not found"
+        )
+    raise ValueError("top-level JSON array not found")
@@ -0,0 +1,49 @@
+import math
+import time
+
+
+class RollingCounters:
+    # `size` counters summed over the last `window_seconds`,
+    # expired by whole buckets of `window_seconds / buckets`
+
+    __slots__ = ("_bucket_seconds", "_buckets", "_bucket", "_totals")
+
+    def __init__(self, size: int, *, window_seconds: float, buckets: int):
+        assert window_seconds > 0
+        assert buckets > 0
+
+        self._bucket_seconds = window_seconds / buckets
+        self._buckets = [[0] * size for _ in range(buckets)]
+        self._bucket = self._current_bucket()
+        self._totals = [0] * size
+
+    @property
+    def totals(self) -> list[int]:
+        self._advance()
+        return self._totals
+
+    def add(self, *values: int) -> None:
+        self._advance()
+        bucket = self._buckets[self._bucket % len(self._buckets)]
+        for i, value in enumerate(values):
+            bucket[i] += value
+            self._totals[i] += value
+
+    def reset(self) -> None:
+        for bucket in self._buckets:
+            bucket[:] = [0] * len(bucket)
+        self._totals[:] = [0] * len(self._totals)
+
+    def _current_bucket(self) -> int:
+        return math.floor(time.monotonic() / self._bucket_seconds)
+
+    def _advance(self) -> None:
+        current = self._current_bucket()
+        for expired in range(
+            max(self._bucket + 1, current - len(self._buckets) + 1), current + 1
+        ):
+            bucket = self._buckets[expired % len(self._buckets)]
+            for i, value in enumerate(bucket):
+                self._totals[i] -= value
+            bucket[:] = [0] * len(bucket)
+        self._bucket = max(self._bucket, current)
@@ -1,12 +1,31 @@
 import abc
-from collections.abc import Mapping
-from typing import Any, Generic, Protocol, TypeVar, runtime_checkable
+import asyncio
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    Mapping,
+)
+from typing import (
+    Any,
+    ClassVar,
+    Generic,
+    Literal,
+    Protocol,
+    TypeVar,
+    overload,
+    runtime_checkable,
+)
 
 from multidict import CIMultiDict
 from yarl import URL
 
 from extapi._meta import PY311
 
+from .backends.buffered import BufferedResponseWrap
+from .codecs.json import JsonCodec, get_default_json_codec
 from .types import RequestData, Response, StrOrURL
 
 if PY311:
@@ -17,6 +36,7 @@ else:
 T_co = TypeVar("T_co", covariant=True)
 T_contr = TypeVar("T_contr", contravariant=True)
 T = TypeVar("T")
+M = TypeVar("M")
 
 
 class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
@@ -36,6 +56,41 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
     def generalize(self) -> "AbstractExecutor[T_co]":
         return self
 
+    @property
+    def auto_read_body(self) -> bool:
+        # whether the body is read for requests with auto_read_body=None
+        return True
+
+    @property
+    def json_codec(self) -> JsonCodec:
+        # encodes request json, e.g. for CompressionExecutor
+        return get_default_json_codec()
+
+    def buffered_response(
+        self,
+        request: RequestData,
+        *,
+        status: int,
+        headers: CIMultiDict,
+        body: bytes | memoryview,
+        original: Any = None,
+    ) -> Response[T_co]:
+        # A response with an already read body (e.g. a cached one or one
+        # shared by coalesced requests), decoded like the executor's own
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=status,
+            headers=headers,
+            backend_response=BufferedResponseWrap(body, original=original),
+        )
+
+    def reads_body(self, request: RequestData) -> bool:
+        # the effective auto_read_body of the request
+        if request.auto_read_body is not None:
+            return request.auto_read_body
+        return self.auto_read_body
+
     @abc.abstractmethod
     async def execute(
         self,
@@ -43,6 +98,89 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
     ) -> Response[T_co]:
         raise NotImplementedError  # pragma: no cover
 
+    async def execute_model(
+        self,
+        request: RequestData,
+        *,
+        response_model: type[M],
+    ) -> M:
+        # executes the request and decodes the body into `response_model`
+        async with await self.execute(request) as response:
+            return await response.decode(response_model)
+
+    @overload
+    def execute_many(
+        self,
+        requests: Iterable[RequestData] | AsyncIterable[RequestData],
+        *,
+        max_in_flight: int = ...,
+        return_exceptions: Literal[False] = ...,
+        ordered: bool = ...,
+    ) -> AsyncGenerator[tuple[RequestData, Response[T_co]], None]: ...
+
+    @overload
+    def execute_many(
+        self,
+        requests: Iterable[RequestData] | AsyncIterable[RequestData],
+        *,
+        max_in_flight: int = ...,
+        return_exceptions: bool,
+        ordered: bool = ...,
+    ) -> AsyncGenerator[tuple[RequestData, Response[T_co] | Exception], None]: ...
+
+    async def execute_many(
+        self,
+        requests: Iterable[RequestData] | AsyncIterable[RequestData],
+        *,
+        max_in_flight: int = 10,
+        return_exceptions: bool = False,
+        ordered: bool = False,
+    ) -> AsyncGenerator[tuple[RequestData, Response[T_co] | Exception], None]:
+        # requests are pulled lazily - only when there is a free slot,
+        # so `requests` may be arbitrarily long. Yielded responses
+        # must be closed by the caller.
+        assert max_in_flight > 0
+
+        next_request = _request_puller(requests)
+        in_flight: dict[asyncio.Task[Response[T_co]], RequestData] = {}
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    request = await next_request()
+                    if request is None:
+                        exhausted = True
+                        break
+
+                    in_flight[asyncio.create_task(self.execute(request))] = request
+
+                if not in_flight:
+                    return
+
+                if ordered:
+                    head = next(iter(in_flight))
+                    await asyncio.wait((head,))
+                    done: Iterable[asyncio.Task[Response[T_co]]] = (head,)
+                else:
+                    done, _ = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                for task in done:
+                    request = in_flight.pop(task)
+                    try:
+                        result: Response[T_co] | Exception = task.result()
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        result = e
+
+                    yield request, result
+        finally:
+            if in_flight:
+                await _discard_tasks(in_flight)
+
     async def get(
         self,
         url: StrOrURL,
@@ -53,6 +191,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
         headers: CIMultiDict | Mapping[str, Any] | None = None,
         timeout: Any | float | None = None,
         auto_read_body: bool | None = None,
+        max_body_size: int | None = None,
         **kwargs,
     ) -> Response[T_co]:
         return await self.execute(
@@ -65,6 +204,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
                 headers=_map_headers(headers),
                 timeout=timeout,
                 auto_read_body=auto_read_body,
+                max_body_size=max_body_size,
                 kwargs=kwargs,
             )
         )
@@ -79,6 +219,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
         headers: CIMultiDict | Mapping[str, Any] | None = None,
         timeout: Any | float | None = None,
         auto_read_body: bool | None = None,
+        max_body_size: int | None = None,
         **kwargs,
     ) -> Response[T_co]:
         return await self.execute(
@@ -91,6 +232,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
                 headers=_map_headers(headers),
                 timeout=timeout,
                 auto_read_body=auto_read_body,
+                max_body_size=max_body_size,
                 kwargs=kwargs,
             )
         )
@@ -105,6 +247,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
         headers: CIMultiDict | Mapping[str, Any] | None = None,
         timeout: Any | float | None = None,
         auto_read_body: bool | None = None,
+        max_body_size: int | None = None,
         **kwargs,
     ) -> Response[T_co]:
         return await self.execute(
@@ -117,6 +260,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
                 headers=_map_headers(headers),
                 timeout=timeout,
                 auto_read_body=auto_read_body,
+                max_body_size=max_body_size,
                 kwargs=kwargs,
             )
         )
@@ -131,6 +275,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
         headers: CIMultiDict | Mapping[str, Any] | None = None,
         timeout: Any | float | None = None,
         auto_read_body: bool | None = None,
+        max_body_size: int | None = None,
         **kwargs,
     ) -> Response[T_co]:
         return await self.execute(
@@ -143,6 +288,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
                 headers=_map_headers(headers),
                 timeout=timeout,
                 auto_read_body=auto_read_body,
+                max_body_size=max_body_size,
                 kwargs=kwargs,
             )
         )
@@ -157,6 +303,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
         headers: CIMultiDict | Mapping[str, Any] | None = None,
         timeout: Any | float | None = None,
         auto_read_body: bool | None = None,
+        max_body_size: int | None = None,
         **kwargs,
     ) -> Response[T_co]:
         return await self.execute(
@@ -169,6 +316,7 @@ class AbstractExecutor(Generic[T_co], metaclass=abc.ABCMeta):
                 headers=_map_headers(headers),
                 timeout=timeout,
                 auto_read_body=auto_read_body,
+                max_body_size=max_body_size,
                 kwargs=kwargs,
             )
         )
@@ -184,6 +332,36 @@ def _map_headers(headers: CIMultiDict | Mapping[str, Any] | None) -> CIMultiDict
     return CIMultiDict(headers)
 
 
+def _request_puller(
+    requests: Iterable[RequestData] | AsyncIterable[RequestData],
+) -> Callable[[], Awaitable[RequestData | None]]:
+    if isinstance(requests, AsyncIterable):
+        async_iterator = aiter(requests)
+
+        async def pull_async() -> RequestData | None:
+            return await anext(async_iterator, None)
+
+        return pull_async
+
+    iterator = iter(requests)
+
+    async def pull() -> RequestData | None:
+        return next(iterator, None)
+
+    return pull
+
+
+async def _discard_tasks(tasks: Iterable[asyncio.Task[Response[Any]]]) -> None:
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+
+    # responses that managed to complete still hold connections
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, Response):
+            await result.backend_response.close()
+
+
 @runtime_checkable
 class Retryable(Protocol[T_contr]):
     async def need_retry(
@@ -193,6 +371,10 @@ class Retryable(Protocol[T_contr]):
 
 @runtime_checkable
 class Addon(Protocol[T]):
+    # True if the addon modifies request headers only through
+    # request.mutable_headers(), so that they may be shared between attempts
+    copy_on_write_headers: ClassVar[bool] = False
+
     async def before_request(self, request: RequestData) -> None:
         return None
 
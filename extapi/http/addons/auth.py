@@ -1,8 +1,12 @@
-from base64 import b64encode
-from collections.abc import Awaitable, Callable
-from typing import Generic, TypeVar
-
-from multidict import CIMultiDict
+import asyncio
+import binascii
+import json
+import logging
+import math
+import time
+from base64 import b64encode, urlsafe_b64decode
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, Generic, TypeVar
 
 from extapi._helpers import execute_sync_async
 from extapi.http.abc import Addon, Retryable
@@ -14,10 +18,137 @@ T = TypeVar("T")
 AsyncBearerTokenGetter = Callable[[], Awaitable[str]]
 SyncBearerTokenGetter = Callable[[], str]
 
+# either a token or an OAuth token response with `access_token` and `expires_in`
+TokenFetchResult = str | Mapping[str, Any]
+AsyncTokenFetcher = Callable[[], Awaitable[TokenFetchResult]]
+SyncTokenFetcher = Callable[[], TokenFetchResult]
+
+
+class CachingTokenProvider:
+    # A token getter for BearerAuthAddon that caches the token until it
+    # expires. The lifetime is taken from `expires_in` of a token response,
+    # from `exp` of a JWT or is `default_ttl` (forever if None). The token is
+    # refreshed in the background `refresh_ahead` seconds (at most half of the
+    # lifetime) before it expires, only an expired token makes callers wait.
+    # Refreshes are single-flight, a token rejected with 401 is invalidated
+    # once no matter how many requests got the 401.
+
+    __slots__ = (
+        "_fetcher",
+        "_refresh_ahead",
+        "_default_ttl",
+        "_logger",
+        "_token",
+        "_expires_at",
+        "_refresh_at",
+        "_refresh_task",
+    )
+
+    def __init__(
+        self,
+        fetcher: SyncTokenFetcher | AsyncTokenFetcher,
+        *,
+        refresh_ahead: float = 60.0,
+        default_ttl: float | None = None,
+    ):
+        self._fetcher = fetcher
+        self._refresh_ahead = refresh_ahead
+        self._default_ttl = default_ttl
+        self._logger = logging.getLogger("extapi.auth.token")
+        self._token: str | None = None
+        self._expires_at = math.inf
+        self._refresh_at = math.inf
+        self._refresh_task: asyncio.Task[str] | None = None
+
+    @property
+    def token(self) -> str | None:
+        return self._token
+
+    async def __call__(self) -> str:
+        token = self._token
+        if token is not None:
+            now = time.monotonic()
+            if now < self._refresh_at:
+                return token
+            if now < self._expires_at:
+                self._refresh()
+                return token
+
+        return await asyncio.shield(self._refresh())
+
+    def invalidate(self, token: str | None = None) -> None:
+        # only the token that was actually rejected is dropped,
+        # a newer one might have been fetched in the meantime
+        if token is None or token == self._token:
+            self._token = None
+
+    async def close(self) -> None:
+        task = self._refresh_task
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _refresh(self) -> "asyncio.Task[str]":
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._fetch())
+            self._refresh_task.add_done_callback(self._refreshed)
+        return self._refresh_task
+
+    def _refreshed(self, task: "asyncio.Task[str]") -> None:
+        self._refresh_task = None
+        if task.cancelled() or task.exception() is None:
+            return
+
+        if self._token is not None:
+            # the current token is still valid, retry closer to its expiration
+            now = time.monotonic()
+            self._refresh_at = now + (self._expires_at - now) / 2
+            self._logger.warning(
+                "background token refresh failed: %r", task.exception()
+            )
+
+    async def _fetch(self) -> str:
+        result: TokenFetchResult = await execute_sync_async(self._fetcher)
+
+        ttl: float | None
+        if isinstance(result, str):
+            token, ttl = result, _jwt_ttl(result)
+        else:
+            token = result["access_token"]
+            expires_in = result.get("expires_in")
+            ttl = float(expires_in) if expires_in is not None else _jwt_ttl(token)
+
+        if ttl is None:
+            ttl = self._default_ttl
+
+        now = time.monotonic()
+        self._token = token
+        if ttl is None:
+            self._expires_at = self._refresh_at = math.inf
+        else:
+            self._expires_at = now + ttl
+            self._refresh_at = self._expires_at - min(self._refresh_ahead, ttl / 2)
+        return token
+
+
+def _jwt_ttl(token: str) -> float | None:
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+
+    payload = parts[1]
+    try:
+        claims = json.loads(urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"]) - time.time()
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+
 
 class BearerAuthAddon(Addon[T], Retryable[T], Generic[T]):
     __slots__ = ("_token_getter",)
 
+    copy_on_write_headers = True
+
     def __init__(
         self,
         token_getter: SyncBearerTokenGetter | AsyncBearerTokenGetter,
@@ -30,16 +161,29 @@ class BearerAuthAddon(Addon[T], Retryable[T], Generic[T]):
         return False, None
 
     async def before_request(self, request: RequestData) -> None:
-        if request.headers is None:
-            request.headers = CIMultiDict()
-
         token = await execute_sync_async(self._token_getter)
-        request.headers["Authorization"] = f"Bearer {token}"
+        request.mutable_headers()["Authorization"] = f"Bearer {token}"
+
+    async def process_response(
+        self, request: RequestData, response: Response[T]
+    ) -> Response[T]:
+        if response.status == 401 and isinstance(
+            self._token_getter, CachingTokenProvider
+        ):
+            token = None
+            if request.headers is not None:
+                token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            self._token_getter.invalidate(token)
+        return response
 
 
 class StaticBearerAuthAddon(BearerAuthAddon[T], Generic[T]):
     def __init__(self, token: str):
         super().__init__(lambda: token)
+        self.__header_value = f"Bearer {token}"
+
+    async def before_request(self, request: RequestData) -> None:
+        request.mutable_headers()["Authorization"] = self.__header_value
 
     async def need_retry(self, response: Response[T]) -> tuple[bool, float | None]:
         return False, None
@@ -48,6 +192,8 @@ class StaticBearerAuthAddon(BearerAuthAddon[T], Generic[T]):
 class StaticBasicAuthAddon(Addon[T], Retryable[T], Generic[T]):
     __slots__ = ("_login", "_password")
 
+    copy_on_write_headers = True
+
     def __init__(
         self,
         *,
@@ -67,6 +213,4 @@ class StaticBasicAuthAddon(Addon[T], Retryable[T], Generic[T]):
         return False, None
 
     async def before_request(self, request: RequestData) -> None:
-        if request.headers is None:
-            request.headers = CIMultiDict()
-        request.headers["Authorization"] = self.__header_value
+        request.mutable_headers()["Authorization"] = self.__header_value
@@ -1,9 +1,9 @@
 from collections.abc import Callable
-from typing import Awaitable, TypeVar
+from typing import Awaitable, TypeVar, cast
 
 from multidict import CIMultiDict
 
-from extapi._helpers import execute_sync_async
+from extapi._helpers import is_async_callable
 from extapi.http.abc import Addon
 from extapi.http.types import RequestData
 
@@ -14,14 +14,20 @@ T = TypeVar("T")
 
 
 class AddHeadersAddon(Addon[T]):
-    __slots__ = ("_adder",)
+    __slots__ = ("_adder", "_is_async")
+
+    copy_on_write_headers = True
 
     def __init__(
         self,
         adder: AsyncHeadersAdder | SyncHeadersAdder,
     ):
         self._adder = adder
+        self._is_async = is_async_callable(adder)
 
     async def before_request(self, request: RequestData) -> None:
-        request.headers = request.headers or CIMultiDict()
-        await execute_sync_async(self._adder, request.headers)
+        headers = request.mutable_headers()
+        if self._is_async:
+            await cast(AsyncHeadersAdder, self._adder)(headers)
+        else:
+            self._adder(headers)
@@ -11,6 +11,8 @@ T = TypeVar("T")
 
 
 class LoggingAddon(Addon[T], Generic[T]):
+    copy_on_write_headers = True
+
     def __init__(self, *, log_params: bool = True):
         self._logger = logging.getLogger("extapi.http.addons.log")
         self._log_params = log_params
@@ -22,19 +24,23 @@ class LoggingAddon(Addon[T], Generic[T]):
         return request.url
 
     async def before_request(self, request: RequestData) -> None:
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+
         url = self._get_url(request)
         self._logger.debug("executing request %s %s", request.method, str(url))
 
     async def process_response(
         self, request: RequestData, response: Response[T]
     ) -> Response[T]:
-        url = self._get_url(request)
+        level = logging.DEBUG if response.status < 500 else logging.ERROR
+        if not self._logger.isEnabledFor(level):
+            return response
 
-        logger_method = (
-            self._logger.debug if response.status < 500 else self._logger.error
-        )
+        url = self._get_url(request)
 
-        logger_method(
+        self._logger.log(
+            level,
             "received response %s %s -> status=%s",
             request.method,
             str(url),
@@ -79,6 +85,9 @@ class VerboseLoggingAddon(LoggingAddon[T], Generic[T]):
         self._truncate_response_data = truncate_response_data
 
     async def before_request(self, request: RequestData) -> None:
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+
         url = self._get_url(request)
 
         json = request.json
@@ -100,11 +109,12 @@ class VerboseLoggingAddon(LoggingAddon[T], Generic[T]):
     async def process_response(
         self, request: RequestData, response: Response[T]
     ) -> Response[T]:
+        level = logging.DEBUG if response.status < 500 else logging.ERROR
+        if not self._logger.isEnabledFor(level):
+            return response
+
         url = self._get_url(request)
 
-        logger_method = (
-            self._logger.debug if response.status < 500 else self._logger.error
-        )
         resp_body: str | None = None
         if self._log_response_data:
             resp_body_bytes = await response.read()
@@ -112,7 +122,8 @@ class VerboseLoggingAddon(LoggingAddon[T], Generic[T]):
                 resp_body_bytes = resp_body_bytes[: self._truncate_response_data]
             resp_body = resp_body_bytes.decode("utf-8")
 
-        logger_method(
+        self._logger.log(
+            level,
             "received response %s %s -> status=%s headers=%s body=%s",
             request.method,
             str(url),
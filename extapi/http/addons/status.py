@@ -8,15 +8,14 @@ T = TypeVar("T")
 
 
 class StatusValidationAddon(Addon[T], Generic[T]):
+    copy_on_write_headers = True
+
     def __init__(
         self,
         expected_statuses: Iterable[int] = (200, 201),
     ):
         self._expected_statuses = set(expected_statuses)
 
-    async def before_request(self, request: RequestData) -> None:
-        return None  # pragma: no cover
-
     async def process_response(
         self, request: RequestData, response: Response[T]
     ) -> Response[T]:
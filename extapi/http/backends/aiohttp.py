@@ -1,23 +1,113 @@
-from collections.abc import Callable
-from typing import Any
+import functools
+import re
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor
+from email.message import Message
+from typing import Any, TypeVar
 
 import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
 
+from extapi.http._offload import DEFAULT_OFFLOAD_SIZE, loads_str, run_decode
 from extapi.http.abc import AbstractExecutor
+from extapi.http.backends.buffered import BufferedResponseWrap
+from extapi.http.bodies import ReplayableBody
+from extapi.http.codecs.json import (
+    JSON_CONTENT_TYPE,
+    JsonCodec,
+    get_default_json_codec,
+)
 from extapi.http.types import (
+    DEFAULT_CHUNK_SIZE,
     DEFAULT_JSON_DECODER,
     BackendResponseProtocol,
+    BodyTooLargeError,
     RequestData,
     Response,
 )
 
+# the same content types aiohttp.ClientResponse.json() accepts
+_json_content_type_re = re.compile(r"^application/(?:[\w.+-]+?\+)?json")
+
+M = TypeVar("M")
+
+
+def _keep_body(response: aiohttp.ClientResponse, body: bytes) -> None:
+    # ClientResponse.read() stores the body in a private attribute for its
+    # json() and text(), the only place the internals are touched
+    try:
+        response._body = body
+    except AttributeError:  # pragma: no cover
+        pass
+
+
+def _parse_content_type(value: str | None) -> tuple[str, str | None]:
+    # the mimetype and the charset as aiohttp.ClientResponse parses them
+    message = Message()
+    message["Content-Type"] = value or "application/octet-stream"
+    return message.get_content_type(), message.get_content_charset()
+
+
+async def _read_json(
+    response: BackendResponseProtocol[Any],
+    json_codec: JsonCodec | None,
+    *,
+    content_type: str,
+    charset: str | None,
+    content_type_error: Callable[..., aiohttp.ContentTypeError],
+    encoding: str | None,
+    loads: Callable[[str], Any],
+    decode_pool: Executor | None,
+    offload_size: int | None,
+) -> Any:
+    # the same checks as aiohttp.ClientResponse.json(),
+    # the body may be decoded in the decode pool though
+    if not _json_content_type_re.match(content_type):
+        raise content_type_error(
+            message=f"Attempt to decode JSON with unexpected mimetype: {content_type}"
+        )
+
+    data = await response.read()
+    if not data or data.isspace():
+        return None
+
+    decode: Callable[[bytes], Any]
+    if json_codec is not None and encoding is None and loads is DEFAULT_JSON_DECODER:
+        decode = json_codec.decode
+    else:
+        # RFC 8259: JSON without a charset is UTF-8
+        decode = functools.partial(loads_str, loads, encoding or charset or "utf-8")
+    return await response.run_decode(
+        decode, data, pool=decode_pool, offload_size=offload_size
+    )
+
 
 class AiohttpResponseWrap(BackendResponseProtocol[aiohttp.ClientResponse]):
-    __slots__ = ("_original", "_body")
+    __slots__ = (
+        "_original",
+        "_body",
+        "_json_codec",
+        "_decode_pool",
+        "_offload_size",
+        "_max_body_size",
+    )
 
-    def __init__(self, response: aiohttp.ClientResponse, *, body: bytes | None = None):
+    def __init__(
+        self,
+        response: aiohttp.ClientResponse,
+        *,
+        body: bytes | None = None,
+        json_codec: JsonCodec | None = None,
+        decode_pool: Executor | None = None,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+        max_body_size: int | None = None,
+    ):
         self._original = response
         self._body = body
+        self._json_codec = json_codec
+        self._decode_pool = decode_pool
+        self._offload_size = offload_size
+        self._max_body_size = max_body_size
 
     def original(self) -> aiohttp.ClientResponse:
         return self._original
@@ -31,17 +121,128 @@ class AiohttpResponseWrap(BackendResponseProtocol[aiohttp.ClientResponse]):
             return self._body
 
         # if body is not supplied - delegate to original
-        return await self._original.read()
+        if self._max_body_size is None:
+            self._body = await self._original.read()
+            return self._body
+
+        # the chunks are joined with a single copy
+        chunks = [chunk async for chunk in self.iter_chunks(DEFAULT_CHUNK_SIZE)]
+        self._body = b"".join(chunks)
+        _keep_body(self._original, self._body)
+        return self._body
 
     async def json(
         self,
         *,
         encoding: str | None,
         loads: Callable[[str], Any] = DEFAULT_JSON_DECODER,
+        decode_pool: Executor | None = None,
+        offload_size: int | None = None,
     ) -> Any:
-        # always delegate to original aiohttp.ClientResponse
-        # because the data has already been read
-        return await self._original.json(encoding=encoding, loads=loads)
+        original = self._original
+        return await _read_json(
+            self,
+            self._json_codec,
+            content_type=original.content_type,
+            charset=original.charset,
+            content_type_error=functools.partial(
+                aiohttp.ContentTypeError,
+                original.request_info,
+                original.history,
+                status=original.status,
+                headers=original.headers,
+            ),
+            encoding=encoding,
+            loads=loads,
+            decode_pool=decode_pool,
+            offload_size=offload_size,
+        )
+
+    def headers(self) -> CIMultiDict:
+        return self._original.headers.copy()
+
+    def json_codec(self) -> JsonCodec:
+        return self._json_codec or get_default_json_codec()
+
+    async def run_decode(
+        self,
+        decode: Callable[[bytes], M],
+        data: bytes,
+        *,
+        pool: Executor | None = None,
+        offload_size: int | None = None,
+    ) -> M:
+        # per call settings take precedence over the executor ones
+        return await run_decode(
+            decode,
+            data,
+            pool=pool or self._decode_pool,
+            offload_size=self._offload_size if offload_size is None else offload_size,
+        )
+
+    async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        if self._body is not None:
+            async for chunk in super().iter_chunks(chunk_size):
+                yield chunk
+            return
+
+        received = 0
+        async for chunk in self._original.content.iter_chunked(chunk_size):
+            received += len(chunk)
+            if self._max_body_size is not None and received > self._max_body_size:
+                # the rest of the body is not read, the connection is dropped
+                self._original.close()
+                raise BodyTooLargeError(self._original.url, self._max_body_size)
+            yield chunk
+
+
+class AiohttpBufferedResponseWrap(BufferedResponseWrap):
+    # An already read body, with the checks of AiohttpResponseWrap.json()
+
+    __slots__ = ("_content_type", "_charset", "_content_type_error")
+
+    def __init__(
+        self,
+        body: bytes | memoryview,
+        *,
+        content_type: str,
+        charset: str | None,
+        content_type_error: Callable[..., aiohttp.ContentTypeError],
+        original: aiohttp.ClientResponse | None = None,
+        json_codec: JsonCodec | None = None,
+        decode_pool: Executor | None = None,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+    ):
+        super().__init__(
+            body,
+            original=original,
+            json_codec=json_codec,
+            decode_pool=decode_pool,
+            offload_size=offload_size,
+        )
+        self._content_type = content_type
+        self._charset = charset
+        self._content_type_error = content_type_error
+
+    async def json(
+        self,
+        *,
+        encoding: str | None,
+        loads: Callable[[str], Any] = DEFAULT_JSON_DECODER,
+        decode_pool: Executor | None = None,
+        offload_size: int | None = None,
+    ) -> Any:
+        return await _read_json(
+            self,
+            self._json_codec,
+            content_type=self._content_type,
+            charset=self._charset,
+            content_type_error=self._content_type_error,
+            encoding=encoding,
+            loads=loads,
+            decode_pool=decode_pool,
+            offload_size=offload_size,
+        )
 
 
 _aiohttp_extra_kwargs = [
@@ -71,6 +272,10 @@ class AiohttpExecutor(AbstractExecutor[aiohttp.ClientResponse]):
         "_ssl",
         "_session",
         "_default_timeout",
+        "_json_codec",
+        "_decode_pool",
+        "_offload_size",
+        "_max_body_size",
     )
 
     def __init__(
@@ -79,6 +284,10 @@ class AiohttpExecutor(AbstractExecutor[aiohttp.ClientResponse]):
         ssl: bool | Any = True,
         default_timeout: float = 10.0,
         auto_read_body: bool = True,
+        json_codec: JsonCodec | None = None,
+        decode_pool: Executor | None = None,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+        max_body_size: int | None = None,
         **kwargs,
     ):
         super().__init__()
@@ -86,19 +295,78 @@ class AiohttpExecutor(AbstractExecutor[aiohttp.ClientResponse]):
         self._session = self._make_session(*args, **kwargs)
         self._default_timeout = default_timeout
         self._auto_read_body = auto_read_body
+        # the stdlib json is used unless a codec is passed explicitly
+        self._json_codec = json_codec
+        self._decode_pool = decode_pool
+        self._offload_size = offload_size
+        self._max_body_size = max_body_size
 
     def _make_session(self, *args, **kwargs) -> aiohttp.ClientSession:
         return aiohttp.ClientSession(*args, **kwargs)
 
+    @property
+    def auto_read_body(self) -> bool:
+        return self._auto_read_body
+
+    @property
+    def json_codec(self) -> JsonCodec:
+        return self._json_codec or get_default_json_codec()
+
+    def buffered_response(
+        self,
+        request: RequestData,
+        *,
+        status: int,
+        headers: CIMultiDict,
+        body: bytes | memoryview,
+        original: Any = None,
+    ) -> Response[aiohttp.ClientResponse]:
+        if original is not None:
+            request_info, history = original.request_info, original.history
+        else:
+            request_info = aiohttp.RequestInfo(
+                request.url,
+                request.method,
+                CIMultiDictProxy(CIMultiDict(request.headers or ())),
+                request.url,
+            )
+            history = ()
+
+        content_type, charset = _parse_content_type(headers.get("Content-Type"))
+        backend_response = AiohttpBufferedResponseWrap(
+            body,
+            content_type=content_type,
+            charset=charset,
+            content_type_error=functools.partial(
+                aiohttp.ContentTypeError,
+                request_info,
+                history,
+                status=status,
+                headers=CIMultiDictProxy(headers),
+            ),
+            original=original,
+            json_codec=self._json_codec,
+            decode_pool=self._decode_pool,
+            offload_size=self._offload_size,
+        )
+        return Response[aiohttp.ClientResponse](
+            method=request.method,
+            url=request.url,
+            status=status,
+            headers=headers,
+            backend_response=backend_response,
+        )
+
     async def close(self):
         await self._session.close()
 
     async def execute(self, request: RequestData) -> Response[aiohttp.ClientResponse]:
         timeout = request.timeout or self._default_timeout
-        auto_read_body = (
-            request.auto_read_body
-            if request.auto_read_body is not None
-            else self._auto_read_body
+        auto_read_body = self.reads_body(request)
+        max_body_size = (
+            request.max_body_size
+            if request.max_body_size is not None
+            else self._max_body_size
         )
 
         # aiohttp-specific kwargs
@@ -110,26 +378,67 @@ class AiohttpExecutor(AbstractExecutor[aiohttp.ClientResponse]):
             if key in request.kwargs
         }
 
+        json = request.json
+        data = request.data
+        if json is not None and data is None and self._json_codec is not None:
+            # encoded once by our codec instead of on every attempt,
+            # otherwise json_serialize of the session encodes it as usual
+            data = aiohttp.BytesPayload(
+                request.encode_json(self._json_codec),
+                content_type=JSON_CONTENT_TYPE,
+            )
+            json = None
+
+        headers = request.headers
+        if data is not None and isinstance(data, ReplayableBody):
+            # a fresh stream for every attempt
+            size = data.size
+            data = aiohttp.AsyncIterablePayload(
+                # the stream writer takes memoryviews as well
+                data.chunks(),  # type: ignore[arg-type]
+                content_type=data.content_type,
+            )
+            if size is not None and (
+                headers is None or "Content-Length" not in headers
+            ):
+                headers = CIMultiDict(headers or ())
+                headers["Content-Length"] = str(size)
+
         response = await self._session.request(
             method=request.method,
             url=request.url,
             params=request.params,
-            json=request.json,
-            data=request.data,
-            headers=request.headers,
+            json=json,
+            data=data,
+            headers=headers,
             timeout=timeout,  # type: ignore[arg-type]
             ssl=self._ssl,
             **aiohttp_kwargs,
         )
 
-        body: bytes | None = None
+        if (
+            max_body_size is not None
+            and request.method != "HEAD"
+            and response.content_length is not None
+            and response.content_length > max_body_size
+        ):
+            # refused before reading anything
+            response.close()
+            raise BodyTooLargeError(request.url, max_body_size, response.content_length)
+
+        backend_response = AiohttpResponseWrap(
+            response,
+            json_codec=self._json_codec,
+            decode_pool=self._decode_pool,
+            offload_size=self._offload_size,
+            max_body_size=max_body_size,
+        )
         if auto_read_body:
-            body = await response.read()
+            await backend_response.read()
 
         return Response[aiohttp.ClientResponse](
             method=request.method,
             url=request.url,
             status=response.status,
-            headers=response.headers.copy(),
-            backend_response=AiohttpResponseWrap(response, body=body),
+            backend_response=backend_response,
         )
@@ -0,0 +1,97 @@
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor
+from typing import Any, TypeVar
+
+from extapi.http._offload import DEFAULT_OFFLOAD_SIZE, run_decode
+from extapi.http.codecs.json import JsonCodec, get_default_json_codec
+from extapi.http.types import DEFAULT_JSON_DECODER, BackendResponseProtocol
+
+M = TypeVar("M")
+
+
+class BufferedResponseWrap(BackendResponseProtocol[Any]):
+    # A response with an already read body, e.g. served from a cache.
+    # `original` is the backend response it was made of, if there is one.
+    # The body may be a memoryview (e.g. of a memory-mapped file): it is
+    # copied into bytes only once read() is called, iter_chunks() does not
+    # copy it as a whole. `json_codec`, `decode_pool` and `offload_size` are
+    # the settings of the backend executor, see its buffered_response().
+
+    __slots__ = ("_body", "_original", "_json_codec", "_decode_pool", "_offload_size")
+
+    def __init__(
+        self,
+        body: bytes | memoryview,
+        *,
+        original: Any = None,
+        json_codec: JsonCodec | None = None,
+        decode_pool: Executor | None = None,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+    ):
+        self._body = body
+        self._original = original
+        self._json_codec = json_codec
+        self._decode_pool = decode_pool
+        self._offload_size = offload_size
+
+    def original(self) -> Any:
+        return self._original
+
+    async def close(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        if not isinstance(self._body, bytes):
+            self._body = bytes(self._body)
+        return self._body
+
+    async def json(
+        self,
+        *,
+        encoding: str | None,
+        loads: Callable[[str], Any] = DEFAULT_JSON_DECODER,
+        decode_pool: Executor | None = None,
+        offload_size: int | None = None,
+    ) -> Any:
+        if (
+            self._json_codec is None
+            or encoding is not None
+            or loads is not DEFAULT_JSON_DECODER
+        ):
+            return await super().json(
+                encoding=encoding,
+                loads=loads,
+                decode_pool=decode_pool,
+                offload_size=offload_size,
+            )
+
+        return await self.run_decode(
+            self._json_codec.decode,
+            await self.read(),
+            pool=decode_pool,
+            offload_size=offload_size,
+        )
+
+    def json_codec(self) -> JsonCodec:
+        return self._json_codec or get_default_json_codec()
+
+    async def run_decode(
+        self,
+        decode: Callable[[bytes], M],
+        data: bytes,
+        *,
+        pool: Executor | None = None,
+        offload_size: int | None = None,
+    ) -> M:
+        # per call settings take precedence over the executor ones
+        return await run_decode(
+            decode,
+            data,
+            pool=pool or self._decode_pool,
+            offload_size=self._offload_size if offload_size is None else offload_size,
+        )
+
+    async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        body = self._body
+        for offset in range(0, len(body), chunk_size):
+            yield bytes(body[offset : offset + chunk_size])
@@ -1,22 +1,68 @@
 import abc
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor
+from typing import Any, TypeVar
 
 import httpx
 from multidict import CIMultiDict
+from yarl import URL
 
+from extapi.http._offload import DEFAULT_OFFLOAD_SIZE, run_decode
 from extapi.http.abc import AbstractExecutor
+from extapi.http.backends.buffered import BufferedResponseWrap
+from extapi.http.bodies import ReplayableBody
+from extapi.http.codecs.json import (
+    JSON_CONTENT_TYPE,
+    JsonCodec,
+    get_default_json_codec,
+)
 from extapi.http.types import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_JSON_DECODER,
     BackendResponseProtocol,
+    BodyTooLargeError,
     RequestData,
     Response,
 )
 
+M = TypeVar("M")
+
+
+def _keep_body(response: httpx.Response, body: bytes) -> None:
+    # httpx.Response.aread() stores the body in a private attribute for its
+    # json() and text(), the only place the internals are touched
+    try:
+        response._content = body
+    except AttributeError:  # pragma: no cover
+        pass
+
 
 class HttpxResponseWrap(BackendResponseProtocol[httpx.Response]):
-    __slots__ = ("_original", "_body")
+    __slots__ = (
+        "_original",
+        "_body",
+        "_json_codec",
+        "_decode_pool",
+        "_offload_size",
+        "_max_body_size",
+    )
 
-    def __init__(self, response: httpx.Response, *, body: bytes | None = None):
+    def __init__(
+        self,
+        response: httpx.Response,
+        *,
+        body: bytes | None = None,
+        json_codec: JsonCodec | None = None,
+        decode_pool: Executor | None = None,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+        max_body_size: int | None = None,
+    ):
         self._original = response
         self._body = body
+        self._json_codec = json_codec
+        self._decode_pool = decode_pool
+        self._offload_size = offload_size
+        self._max_body_size = max_body_size
 
     def original(self) -> httpx.Response:
         return self._original
@@ -29,7 +75,82 @@ class HttpxResponseWrap(BackendResponseProtocol[httpx.Response]):
             return self._body
 
         # if body is not supplied - delegate to original
-        return await self._original.aread()
+        if self._max_body_size is None:
+            self._body = await self._original.aread()
+            return self._body
+
+        # the chunks are joined with a single copy
+        chunks = [chunk async for chunk in self.iter_chunks(DEFAULT_CHUNK_SIZE)]
+        self._body = b"".join(chunks)
+        _keep_body(self._original, self._body)
+        return self._body
+
+    async def json(
+        self,
+        *,
+        encoding: str | None,
+        loads: Callable[[str], Any] = DEFAULT_JSON_DECODER,
+        decode_pool: Executor | None = None,
+        offload_size: int | None = None,
+    ) -> Any:
+        if (
+            self._json_codec is None
+            or encoding is not None
+            or loads is not DEFAULT_JSON_DECODER
+        ):
+            return await super().json(
+                encoding=encoding,
+                loads=loads,
+                decode_pool=decode_pool,
+                offload_size=offload_size,
+            )
+
+        return await self.run_decode(
+            self._json_codec.decode,
+            await self.read(),
+            pool=decode_pool,
+            offload_size=offload_size,
+        )
+
+    def headers(self) -> CIMultiDict:
+        # multi_items() keeps repeated headers (e.g. Set-Cookie) apart
+        return CIMultiDict(self._original.headers.multi_items())
+
+    def json_codec(self) -> JsonCodec:
+        return self._json_codec or get_default_json_codec()
+
+    async def run_decode(
+        self,
+        decode: Callable[[bytes], M],
+        data: bytes,
+        *,
+        pool: Executor | None = None,
+        offload_size: int | None = None,
+    ) -> M:
+        # per call settings take precedence over the executor ones
+        return await run_decode(
+            decode,
+            data,
+            pool=pool or self._decode_pool,
+            offload_size=self._offload_size if offload_size is None else offload_size,
+        )
+
+    async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        if self._body is not None:
+            async for chunk in super().iter_chunks(chunk_size):
+                yield chunk
+            return
+
+        received = 0
+        async for chunk in self._original.aiter_bytes(chunk_size):
+            received += len(chunk)
+            if self._max_body_size is not None and received > self._max_body_size:
+                # the rest of the body is not read, the connection is dropped
+                await self._original.aclose()
+                raise BodyTooLargeError(
+                    URL(str(self._original.url)), self._max_body_size
+                )
+            yield chunk
 
 
 _httpx_extra_kwargs = [
@@ -46,6 +167,10 @@ class HttpxExecutor(AbstractExecutor[httpx.Response], metaclass=abc.ABCMeta):
     __slots__ = (
         "_client",
         "_default_timeout",
+        "_json_codec",
+        "_decode_pool",
+        "_offload_size",
+        "_max_body_size",
     )
 
     def __init__(
@@ -55,6 +180,10 @@ class HttpxExecutor(AbstractExecutor[httpx.Response], metaclass=abc.ABCMeta):
         default_timeout: float = 10.0,
         follow_redirects: bool = True,
         auto_read_body: bool = True,
+        json_codec: JsonCodec | None = None,
+        decode_pool: Executor | None = None,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+        max_body_size: int | None = None,
         **kwargs,
     ):
         super().__init__()
@@ -66,19 +195,56 @@ class HttpxExecutor(AbstractExecutor[httpx.Response], metaclass=abc.ABCMeta):
         )
         self._default_timeout = default_timeout
         self._auto_read_body = auto_read_body
+        # the stdlib json is used unless a codec is passed explicitly
+        self._json_codec = json_codec
+        self._decode_pool = decode_pool
+        self._offload_size = offload_size
+        self._max_body_size = max_body_size
 
     def _make_client(self, *args, **kwargs) -> httpx.AsyncClient:
         return httpx.AsyncClient(*args, **kwargs)
 
+    @property
+    def auto_read_body(self) -> bool:
+        return self._auto_read_body
+
+    @property
+    def json_codec(self) -> JsonCodec:
+        return self._json_codec or get_default_json_codec()
+
+    def buffered_response(
+        self,
+        request: RequestData,
+        *,
+        status: int,
+        headers: CIMultiDict,
+        body: bytes | memoryview,
+        original: Any = None,
+    ) -> Response[httpx.Response]:
+        return Response[httpx.Response](
+            method=request.method,
+            url=request.url,
+            status=status,
+            headers=headers,
+            backend_response=BufferedResponseWrap(
+                body,
+                original=original,
+                json_codec=self._json_codec,
+                decode_pool=self._decode_pool,
+                offload_size=self._offload_size,
+            ),
+        )
+
     async def close(self):
         await self._client.aclose()
 
     async def execute(self, request: RequestData) -> Response[httpx.Response]:
         timeout = request.timeout or self._default_timeout
-        auto_read_body = (
-            request.auto_read_body
-            if request.auto_read_body is not None
-            else self._auto_read_body
+        auto_read_body = self.reads_body(request)
+        max_body_size = (
+            request.max_body_size
+            if request.max_body_size is not None
+            else self._max_body_size
         )
 
         url = str(request.url)
@@ -97,25 +263,70 @@ class HttpxExecutor(AbstractExecutor[httpx.Response], metaclass=abc.ABCMeta):
             if key in request.kwargs
         }
 
+        json = request.json
+        if (
+            json is not None
+            and request.data is None
+            and self._json_codec is not None
+            and "content" not in httpx_kwargs
+        ):
+            # encoded once by our codec instead of on every attempt,
+            # otherwise httpx encodes it as usual
+            httpx_kwargs["content"] = request.encode_json(self._json_codec)
+            if request.headers is None or "Content-Type" not in request.headers:
+                httpx_headers.append(("Content-Type", JSON_CONTENT_TYPE))
+            json = None
+
+        data = request.data
+        if data is not None and isinstance(data, ReplayableBody):
+            # a fresh stream for every attempt
+            httpx_kwargs["content"] = data.chunks()
+            if request.headers is None or "Content-Type" not in request.headers:
+                httpx_headers.append(("Content-Type", data.content_type))
+            if data.size is not None and (
+                request.headers is None or "Content-Length" not in request.headers
+            ):
+                httpx_headers.append(("Content-Length", str(data.size)))
+            data = None
+
         response = await self._client.stream(
             method=request.method,
             url=url,
             params=request.params,
-            json=request.json,
-            data=request.data,
+            json=json,
+            data=data,
             headers=httpx_headers,
             timeout=timeout,
             **httpx_kwargs,
         ).__aenter__()
 
-        body: bytes | None = None
+        if max_body_size is not None and request.method != "HEAD":
+            content_length = _content_length(response)
+            if content_length is not None and content_length > max_body_size:
+                # refused before reading anything
+                await response.aclose()
+                raise BodyTooLargeError(request.url, max_body_size, content_length)
+
+        backend_response = HttpxResponseWrap(
+            response,
+            json_codec=self._json_codec,
+            decode_pool=self._decode_pool,
+            offload_size=self._offload_size,
+            max_body_size=max_body_size,
+        )
         if auto_read_body:
-            body = await response.aread()
+            await backend_response.read()
 
         return Response[httpx.Response](
             method=request.method,
             url=request.url,
             status=response.status_code,
-            headers=CIMultiDict(response.headers),
-            backend_response=HttpxResponseWrap(response, body=body),
+            backend_response=backend_response,
         )
+
+
+def _content_length(response: httpx.Response) -> int | None:
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,62 @@
+import random
+from typing import Literal, Protocol, runtime_checkable
+
+Jitter = Literal["none", "full", "equal"]
+
+
+@runtime_checkable
+class BackoffPolicy(Protocol):
+    # `attempt` is 0 for the delay before the first retry,
+    # `previous` is the previous delay returned by the policy (0 initially)
+    def delay(self, attempt: int, previous: float) -> float: ...
+
+
+class ConstantBackoff(BackoffPolicy):
+    __slots__ = ("_delay",)
+
+    def __init__(self, delay: float):
+        self._delay = delay
+
+    def delay(self, attempt: int, previous: float) -> float:
+        return self._delay
+
+
+class ExponentialBackoff(BackoffPolicy):
+    __slots__ = ("_base", "_factor", "_max_delay", "_jitter")
+
+    def __init__(
+        self,
+        *,
+        base: float = 0.1,
+        factor: float = 2.0,
+        max_delay: float = 30.0,
+        jitter: Jitter = "full",
+    ):
+        self._base = base
+        self._factor = factor
+        self._max_delay = max_delay
+        self._jitter = jitter
+
+    def delay(self, attempt: int, previous: float) -> float:
+        # exponent is capped so that huge attempt numbers do not overflow
+        delay = min(self._max_delay, self._base * self._factor ** min(attempt, 64))
+
+        if self._jitter == "full":
+            return random.uniform(0, delay)
+
+        if self._jitter == "equal":
+            return delay / 2 + random.uniform(0, delay / 2)
+
+        return delay
+
+
+class DecorrelatedJitterBackoff(BackoffPolicy):
+    __slots__ = ("_base", "_max_delay")
+
+    def __init__(self, *, base: float = 0.1, max_delay: float = 30.0):
+        self._base = base
+        self._max_delay = max_delay
+
+    def delay(self, attempt: int, previous: float) -> float:
+        upper = max(self._base, previous * 3)
+        return min(self._max_delay, random.uniform(self._base, upper))
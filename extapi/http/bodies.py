@@ -0,0 +1,111 @@
+import asyncio
+import mmap
+import os
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import Protocol, runtime_checkable
+
+DEFAULT_BODY_CHUNK_SIZE = 256 * 1024
+OCTET_STREAM_CONTENT_TYPE = "application/octet-stream"
+
+
+@runtime_checkable
+class ReplayableBody(Protocol):
+    # A request body (RequestData.data) streamed by the backends in chunks.
+    # Every chunks() call starts from the beginning, so the body is sent again
+    # on retries. `size` is sent as Content-Length, an unknown size (None)
+    # makes the request chunked.
+
+    content_type: str
+    size: int | None
+
+    def chunks(self) -> AsyncIterator[bytes | memoryview]: ...
+
+
+class FileBody:
+    # A file read in a thread pool chunk by chunk
+
+    __slots__ = ("_path", "_chunk_size", "content_type", "size")
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        chunk_size: int = DEFAULT_BODY_CHUNK_SIZE,
+        content_type: str = OCTET_STREAM_CONTENT_TYPE,
+    ):
+        self._path = path
+        self._chunk_size = chunk_size
+        self.content_type = content_type
+        self.size: int | None = os.stat(path).st_size
+
+    async def chunks(self) -> AsyncIterator[bytes | memoryview]:
+        file = await asyncio.to_thread(open, self._path, "rb")
+        try:
+            _check_size(self._path, file.fileno(), self.size)
+            while chunk := await asyncio.to_thread(file.read, self._chunk_size):
+                yield chunk
+        finally:
+            file.close()
+
+
+class MmapBody:
+    # A memory-mapped file sent without copying it into python objects.
+    # Pages are read from disk by the event loop thread as they are sent,
+    # so it suits files that are likely to be in the page cache.
+
+    __slots__ = ("_path", "_chunk_size", "content_type", "size")
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        chunk_size: int = DEFAULT_BODY_CHUNK_SIZE,
+        content_type: str = OCTET_STREAM_CONTENT_TYPE,
+    ):
+        self._path = path
+        self._chunk_size = chunk_size
+        self.content_type = content_type
+        self.size: int | None = os.stat(path).st_size
+
+    async def chunks(self) -> AsyncIterator[bytes | memoryview]:
+        with open(self._path, "rb") as file:
+            size = _check_size(self._path, file.fileno(), self.size)
+            if not size:
+                return
+            # unmapped once the last chunk is released
+            view = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+        for offset in range(0, size, self._chunk_size):
+            yield view[offset : offset + self._chunk_size]
+
+
+def _check_size(path: str | os.PathLike[str], fd: int, expected: int | None) -> int:
+    # the size is sent as Content-Length, and a mapping of a truncated file
+    # raises SIGBUS when read past its end
+    size = os.fstat(fd).st_size
+    if size != expected:
+        raise ValueError(
+            f"{os.fspath(path)} size changed from {expected} to {size} bytes"
+        )
+    return size
+
+
+class StreamBody:
+    # A body produced by `factory`, called again for every attempt
+
+    __slots__ = ("_factory", "content_type", "size")
+
+    def __init__(
+        self,
+        factory: Callable[[], AsyncIterable[bytes]],
+        *,
+        size: int | None = None,
+        content_type: str = OCTET_STREAM_CONTENT_TYPE,
+    ):
+        self._factory = factory
+        self.content_type = content_type
+        self.size = size
+
+    async def chunks(self) -> AsyncIterator[bytes | memoryview]:
+        async for chunk in self._factory():
+            yield chunk
@@ -0,0 +1,12 @@
+from typing import Protocol, runtime_checkable
+
+from .types import CacheEntry
+
+
+@runtime_checkable
+class CacheStore(Protocol):
+    async def get(self, key: str) -> CacheEntry | None: ...
+
+    async def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
@@ -0,0 +1,275 @@
+import asyncio
+import json
+import logging
+import mmap
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .abc import CacheStore
+from .types import CacheEntry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+# body files not referenced by the index for that long are left by a crash
+_GARBAGE_AGE = 3600.0
+
+
+class DiskCacheStore(CacheStore):
+    # Persists entries in a directory: the index is an sqlite database (WAL,
+    # so that worker processes on the host may share it) and every body is
+    # a separate file. A body is written to a temporary file, synced and
+    # renamed before the index points to it, so a crash never leaves a torn
+    # entry. Bodies are read by mapping the files into memory, the entries
+    # returned hold a memoryview of the mapping instead of a copy.
+    # Least recently used entries are evicted once the total size of bodies
+    # exceeds `max_size` bytes. A hit updates the access time of an entry
+    # only once per `touch_interval` seconds, so that reads from worker
+    # processes do not queue up for the write lock of the database: the LRU
+    # order is approximate within that interval. Blocking I/O runs in the
+    # default executor.
+
+    __slots__ = (
+        "_path",
+        "_bodies_path",
+        "_max_size",
+        "_touch_interval",
+        "_logger",
+        "_lock",
+        "_pid",
+        "_db",
+    )
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        max_size: int = 1024 * 1024 * 1024,
+        touch_interval: float = 60.0,
+    ):
+        assert max_size > 0
+        assert touch_interval >= 0
+
+        self._path = os.fspath(path)
+        self._bodies_path = os.path.join(self._path, "bodies")
+        self._max_size = max_size
+        self._touch_interval = touch_interval
+        self._logger = logging.getLogger("extapi.cache.disk")
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._db: sqlite3.Connection | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    async def get_size(self) -> int:
+        return await asyncio.to_thread(self._get_size)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            self._pid = None
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    def _connect(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._pid != pid:
+            # sqlite connections must not be used across fork
+            os.makedirs(self._bodies_path, exist_ok=True)
+            db = sqlite3.connect(
+                os.path.join(self._path, "index.sqlite"),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+            self._pid = pid
+            self._collect_garbage(db)
+
+        assert self._db is not None
+        return self._db
+
+    def _get_size(self) -> int:
+        with self._lock:
+            row = self._connect().execute("SELECT SUM(size) FROM entries").fetchone()
+        return row[0] or 0
+
+    def _get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT file, meta, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            file, meta, accessed_at = row
+            now = time.time()
+            if now - accessed_at >= self._touch_interval:
+                db.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+
+        try:
+            body = self._map_body(file)
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            return None
+
+        return _entry_from_meta(json.loads(meta), body)
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        size = len(entry.body)
+        if size > self._max_size:
+            self._delete(key)
+            return
+
+        file = self._write_body(entry.body)
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                garbage = [
+                    row[0]
+                    for row in db.execute(
+                        "SELECT file FROM entries WHERE key = ?", (key,)
+                    )
+                ]
+                db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (key, file, size, time.time(), json.dumps(_entry_meta(entry))),
+                )
+                garbage.extend(self._evict(db))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                self._unlink(file)
+                raise
+
+        for file in garbage:
+            self._unlink(file)
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT file FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+        if row is not None:
+            self._unlink(row[0])
+
+    def _evict(self, db: sqlite3.Connection) -> list[str]:
+        total = db.execute("SELECT SUM(size) FROM entries").fetchone()[0] or 0
+        if total <= self._max_size:
+            return []
+
+        evicted = []
+        for key, file, size in db.execute(
+            "SELECT key, file, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self._max_size:
+                break
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            evicted.append(file)
+            total -= size
+        return evicted
+
+    def _write_body(self, body: bytes | memoryview) -> str:
+        file = secrets.token_hex(16)
+        path = os.path.join(self._bodies_path, file)
+        tmp_path = path + ".tmp"
+        os.makedirs(self._bodies_path, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return file
+
+    def _map_body(self, file: str) -> bytes | memoryview:
+        with open(os.path.join(self._bodies_path, file), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            # the mapping outlives the file descriptor and even the file itself
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _unlink(self, file: str) -> None:
+        try:
+            os.unlink(os.path.join(self._bodies_path, file))
+        except FileNotFoundError:
+            pass
+        except OSError as e:  # pragma: no cover
+            # e.g. a mapped file on windows
+            self._logger.warning("failed to remove cached body %s: %s", file, e)
+
+    def _collect_garbage(self, db: sqlite3.Connection) -> None:
+        referenced = {row[0] for row in db.execute("SELECT file FROM entries")}
+        deadline = time.time() - _GARBAGE_AGE
+        with os.scandir(self._bodies_path) as it:
+            for item in it:
+                name = item.name.removesuffix(".tmp")
+                if name in referenced:
+                    continue
+                try:
+                    if item.stat().st_mtime < deadline:
+                        os.unlink(item.path)
+                except FileNotFoundError:
+                    pass
+
+
+def _entry_meta(entry: CacheEntry) -> dict[str, Any]:
+    return {
+        "status": entry.status,
+        "headers": entry.headers,
+        "stored_at": entry.stored_at,
+        "expires_at": entry.expires_at,
+        "vary": entry.vary,
+        "stale_while_revalidate": entry.stale_while_revalidate,
+        "stale_if_error": entry.stale_if_error,
+    }
+
+
+def _entry_from_meta(meta: dict[str, Any], body: bytes | memoryview) -> CacheEntry:
+    return CacheEntry(
+        status=meta["status"],
+        headers=[(k, v) for k, v in meta["headers"]],
+        body=body,
+        stored_at=meta["stored_at"],
+        expires_at=meta["expires_at"],
+        vary=tuple((k, v) for k, v in meta["vary"]),
+        stale_while_revalidate=meta["stale_while_revalidate"],
+        stale_if_error=meta["stale_if_error"],
+    )
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+from .abc import CacheStore
+from .types import CacheEntry
+
+
+class MemoryCacheStore(CacheStore):
+    # LRU evicting the least recently used entries
+    # once the total size of entries exceeds `max_size` bytes
+
+    __slots__ = ("_max_size", "_size", "_entries")
+
+    def __init__(self, *, max_size: int = 64 * 1024 * 1024):
+        assert max_size > 0
+
+        self._max_size = max_size
+        self._size = 0
+        self._entries: OrderedDict[str, tuple[CacheEntry, int]] = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+
+        self._entries.move_to_end(key)
+        return item[0]
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._pop(key)
+
+        size = len(key) + entry.size
+        if size > self._max_size:
+            return
+
+        self._entries[key] = (entry, size)
+        self._size += size
+        while self._size > self._max_size:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    async def delete(self, key: str) -> None:
+        self._pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _pop(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._size -= item[1]
@@ -0,0 +1,118 @@
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+
+from multidict import CIMultiDict
+
+from extapi.http.types import RequestData
+
+# statuses cacheable by default (RFC 9110, 15.1)
+CACHEABLE_STATUSES = frozenset((200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501))
+
+# headers of a 304 response that must not replace the stored ones
+_NOT_UPDATED_HEADERS = frozenset(("content-length", "content-encoding"))
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    if not value:
+        return directives
+
+    for part in value.split(","):
+        name, sep, arg = part.strip().partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = arg.strip().strip('"') if sep else None
+    return directives
+
+
+def make_key(request: RequestData) -> str:
+    key = f"{request.method.upper()} {request.url}"
+    if request.params:
+        key += "?" if not request.url.query_string else "&"
+        key += urlencode(sorted(request.params.items()), doseq=True)
+    return key
+
+
+def vary_values(
+    vary: str | None, request_headers: Mapping[str, str] | None
+) -> tuple[tuple[str, str], ...] | None:
+    # returns None if the response must not be served from a cache (Vary: *)
+    if not vary:
+        return ()
+
+    values = []
+    for name in vary.split(","):
+        name = name.strip().lower()
+        if name == "*":
+            return None
+        if name:
+            value = request_headers.get(name, "") if request_headers else ""
+            values.append((name, value))
+    return tuple(values)
+
+
+def parse_seconds(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return max(float(int(value)), 0.0)
+    except ValueError:
+        return None
+
+
+def _parse_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(
+    headers: CIMultiDict,
+    cache_control: dict[str, str | None],
+    *,
+    now: float | None = None,
+) -> float | None:
+    # returns None if the response does not define its freshness explicitly,
+    # Expires is relative to Date or to `now` (the receive time) without it
+    if "no-cache" in cache_control:
+        return 0.0
+
+    max_age = parse_seconds(cache_control.get("max-age"))
+    if max_age is not None:
+        return max_age
+
+    expires = headers.get("Expires")
+    if expires is None:
+        return None
+
+    expires_at = _parse_date(expires)
+    if expires_at is None:
+        # invalid dates (e.g. "0") mean already expired
+        return 0.0
+    date = _parse_date(headers.get("Date"))
+    if date is None:
+        date = time.time() if now is None else now
+    return max(expires_at - date, 0.0)
+
+
+def age(headers: CIMultiDict) -> float:
+    return parse_seconds(headers.get("Age")) or 0.0
+
+
+def has_validators(headers: Mapping[str, str]) -> bool:
+    return "ETag" in headers or "Last-Modified" in headers
+
+
+def merge_not_modified(
+    stored: list[tuple[str, str]], not_modified: CIMultiDict
+) -> list[tuple[str, str]]:
+    # headers of a 304 response replace the stored ones (RFC 9111, 3.2)
+    updated = {k.lower() for k in not_modified if k.lower() not in _NOT_UPDATED_HEADERS}
+    headers = [(k, v) for k, v in stored if k.lower() not in updated]
+    headers.extend((k, v) for k, v in not_modified.items() if k.lower() in updated)
+    return headers
@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, kw_only=True)
+class CacheEntry:
+    status: int
+    headers: list[tuple[str, str]]
+    # memoryview for stores that map bodies into memory
+    body: bytes | memoryview
+    # wall clock time, so that entries may outlive the process
+    stored_at: float
+    expires_at: float
+    # request header values the response varies on
+    vary: tuple[tuple[str, str], ...] = ()
+    # how long past expiration the entry may still be served
+    stale_while_revalidate: float = 0.0
+    stale_if_error: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def is_usable_while_revalidating(self, now: float) -> bool:
+        return now < self.expires_at + self.stale_while_revalidate
+
+    def is_usable_on_error(self, now: float) -> bool:
+        return now < self.expires_at + self.stale_if_error
+
+    def get_header(self, name: str) -> str | None:
+        name = name.lower()
+        for k, v in self.headers:
+            if k.lower() == name:
+                return v
+        return None
@@ -0,0 +1,52 @@
+import functools
+import json
+from collections.abc import Callable
+from typing import Any, Protocol, runtime_checkable
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+@runtime_checkable
+class JsonCodec(Protocol):
+    # Encodes request bodies and decodes response bodies,
+    # both directly to/from bytes
+
+    def encode(self, obj: Any) -> bytes: ...
+
+    def decode(self, data: bytes) -> Any: ...
+
+
+_shared_codecs: dict[tuple[Any, ...], JsonCodec] = {}
+
+
+def shared_codec(cls: Callable[..., JsonCodec], *args: Any) -> JsonCodec:
+    # Codecs are unpickled through this (e.g. in process pool workers): one
+    # instance per settings in a process, so that decoders cached per codec
+    # are built once there instead of once per call
+    key = (cls, *args)
+    codec = _shared_codecs.get(key)
+    if codec is None:
+        codec = _shared_codecs[key] = cls(*args)
+    return codec
+
+
+class StdlibJsonCodec:
+    __slots__ = ()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return shared_codec, (StdlibJsonCodec,)
+
+    def encode(self, obj: Any) -> bytes:
+        # the same bytes as json.dumps(obj), i.e. what the backends send
+        return json.dumps(obj).encode()
+
+    def decode(self, data: bytes) -> Any:
+        # json.loads() detects the encoding of bytes itself
+        return json.loads(data)
+
+
+@functools.cache
+def get_default_json_codec() -> JsonCodec:
+    # Always the stdlib one: orjson and msgspec differ from json (non-str
+    # keys, big ints, errors), so they are used only when passed explicitly
+    return StdlibJsonCodec()
@@ -0,0 +1,148 @@
+import dataclasses
+import functools
+import types
+import typing
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+from extapi._meta import has_msgspec
+
+from .json import JsonCodec
+
+if has_msgspec:
+    import msgspec
+
+M = TypeVar("M")
+
+# building a decoder is much slower than decoding, they are built once per
+# type; bounded, since every generic alias (list[Item], ...) is a new key
+_CACHE_SIZE = 256
+
+
+def model_decoder(type_: type[M], codec: JsonCodec) -> Callable[[bytes], M]:
+    # A function decoding JSON bytes into `type_` (a msgspec.Struct,
+    # a dataclass, a pydantic model, list[Model], dict[str, Model], ...),
+    # built once per type and codec
+    return _build_decoder(type_, codec)  # type: ignore[arg-type]
+
+
+class ModelDecoder(Generic[M]):
+    # model_decoder() as a picklable callable: only the type and the codec are
+    # sent to a process pool, the decoder is built and cached by the worker
+
+    __slots__ = ("_type", "_codec")
+
+    def __init__(self, type_: type[M], codec: JsonCodec):
+        self._type = type_
+        self._codec = codec
+
+    def __call__(self, data: bytes) -> M:
+        return model_decoder(self._type, self._codec)(data)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return ModelDecoder, (self._type, self._codec)
+
+
+def model_converter(type_: type[M]) -> Callable[[Any], M]:
+    # A function converting already decoded JSON (dicts, lists, ...) into `type_`
+    return _build_model_converter(type_)  # type: ignore[arg-type]
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _build_decoder(type_: Any, codec: JsonCodec) -> Callable[[bytes], Any]:
+    # The codec decides how strict decoding is, not the installed packages:
+    # a codec decoding into types itself (e.g. MsgspecJsonCodec) validates
+    # in one pass, otherwise the decoded values are converted as they are
+    validate_json = getattr(type_, "model_validate_json", None)
+    if validate_json is not None:
+        # pydantic
+        return validate_json
+
+    decoder = getattr(codec, "decoder", None)
+    if decoder is not None:
+        return decoder(type_)
+
+    convert = model_converter(type_)
+    decode = codec.decode
+
+    def decode_model(data: bytes) -> Any:
+        return convert(decode(data))
+
+    return decode_model
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _build_model_converter(type_: Any) -> Callable[[Any], Any]:
+    return _build_converter(type_)
+
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+def _build_converter(type_: Any) -> Callable[[Any], Any]:
+    # builds dataclasses, msgspec structs and containers of them,
+    # values of other types are taken as is
+    validate = getattr(type_, "model_validate", None)
+    if validate is not None:
+        # pydantic
+        return validate
+
+    if isinstance(type_, type) and dataclasses.is_dataclass(type_):
+        return _build_dataclass_converter(type_)
+
+    if has_msgspec and isinstance(type_, type) and issubclass(type_, msgspec.Struct):
+        return functools.partial(msgspec.convert, type=type_)
+
+    origin = typing.get_origin(type_)
+    args = typing.get_args(type_)
+
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        args = args[:1]
+    elif origin is tuple:
+        # fixed-size tuples are taken as is
+        args = ()
+
+    if origin in (list, tuple, set, frozenset) and args:
+        item = _build_converter(args[0])
+        if item is _identity:
+            return origin
+        return lambda obj: origin(item(x) for x in obj)
+
+    if origin is dict and len(args) == 2:
+        value = _build_converter(args[1])
+        if value is _identity:
+            return _identity
+        return lambda obj: {k: value(v) for k, v in obj.items()}
+
+    if origin in (typing.Union, types.UnionType):
+        non_null = [arg for arg in args if arg is not type(None)]
+        if len(non_null) == 1:
+            inner = _build_converter(non_null[0])
+            if inner is _identity:
+                return _identity
+            return lambda obj: None if obj is None else inner(obj)
+
+    return _identity
+
+
+def _build_dataclass_converter(type_: type) -> Callable[[Any], Any]:
+    # fields are resolved on the first call so that
+    # self-referencing dataclasses do not recurse forever
+    fields: list[tuple[str, Callable[[Any], Any]]] | None = None
+
+    def convert_dataclass(obj: Any) -> Any:
+        nonlocal fields
+        if fields is None:
+            hints = typing.get_type_hints(type_)
+            fields = [
+                (field.name, _build_converter(hints[field.name]))
+                for field in dataclasses.fields(type_)
+                if field.init
+            ]
+
+        return type_(
+            **{name: convert(obj[name]) for name, convert in fields if name in obj}
+        )
+
+    return convert_dataclass
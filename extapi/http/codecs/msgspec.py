@@ -0,0 +1,55 @@
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from extapi._meta import has_msgspec
+
+if not has_msgspec:
+    raise ImportError(  # pragma: no cover
+        "msgspec is not installed - run `pip install extapi[msgspec]`"
+    )
+
+import msgspec
+
+from .json import shared_codec
+
+T = TypeVar("T")
+
+
+class MsgspecJsonCodec:
+    __slots__ = ("_encoder", "_decoder", "_typed_decoders")
+
+    def __init__(self, *, enc_hook: Any = None, dec_hook: Any = None):
+        self._encoder = msgspec.json.Encoder(enc_hook=enc_hook)
+        self._decoder = msgspec.json.Decoder(dec_hook=dec_hook)
+        # a decoder per type, building one is much slower than decoding
+        self._typed_decoders: dict[Any, msgspec.json.Decoder] = {}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # the hooks have to be picklable as well
+        return shared_codec, (
+            _msgspec_codec,
+            self._encoder.enc_hook,
+            self._decoder.dec_hook,
+        )
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def decode(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+    def decoder(self, type_: type[T]) -> Callable[[bytes], T]:
+        # decodes (and validates) straight into msgspec.Struct,
+        # dataclasses, lists of them etc. without intermediate dicts
+        decoder = self._typed_decoders.get(type_)
+        if decoder is None:
+            decoder = msgspec.json.Decoder(type_, dec_hook=self._decoder.dec_hook)
+            self._typed_decoders[type_] = decoder
+        return decoder.decode
+
+    def decode_as(self, data: bytes, type_: type[T]) -> T:
+        return self.decoder(type_)(data)
+
+
+def _msgspec_codec(enc_hook: Any, dec_hook: Any) -> MsgspecJsonCodec:
+    return MsgspecJsonCodec(enc_hook=enc_hook, dec_hook=dec_hook)
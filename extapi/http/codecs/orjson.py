@@ -0,0 +1,33 @@
+from typing import Any
+
+from extapi._meta import has_orjson
+
+if not has_orjson:
+    raise ImportError(  # pragma: no cover
+        "orjson is not installed - run `pip install extapi[orjson]`"
+    )
+
+import orjson
+
+from .json import shared_codec
+
+
+class OrjsonCodec:
+    __slots__ = ("_option",)
+
+    def __init__(self, *, option: int | None = None):
+        # e.g. orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        self._option = option
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return shared_codec, (_orjson_codec, self._option)
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=self._option)
+
+    def decode(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def _orjson_codec(option: int | None) -> OrjsonCodec:
+    return OrjsonCodec(option=option)
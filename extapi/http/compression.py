@@ -0,0 +1,77 @@
+import zlib
+from collections.abc import Callable
+
+from extapi._meta import has_brotli, has_zstandard
+
+Buffer = bytes | bytearray | memoryview
+Compressor = Callable[[Buffer], bytes]
+
+
+def _gzip(level: int | None) -> Compressor:
+    if level is None:
+        level = 6
+
+    def compress(data: Buffer) -> bytes:
+        # wbits=31 writes the gzip header, faster than gzip.compress()
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    return compress
+
+
+def _deflate(level: int | None) -> Compressor:
+    if level is None:
+        level = 6
+
+    def compress(data: Buffer) -> bytes:
+        return zlib.compress(data, level)
+
+    return compress
+
+
+def _zstd(level: int | None) -> Compressor:
+    if not has_zstandard:
+        raise ImportError("zstandard is not installed - run `pip install extapi[zstd]`")
+
+    import zstandard
+
+    if level is None:
+        level = 3
+
+    def compress(data: Buffer) -> bytes:
+        # a compressor is not thread safe, one per call
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    return compress
+
+
+def _brotli(level: int | None) -> Compressor:
+    if not has_brotli:
+        raise ImportError("brotli is not installed - run `pip install extapi[brotli]`")
+
+    import brotli
+
+    if level is None:
+        # the default quality (11) is too slow for request bodies
+        level = 5
+
+    def compress(data: Buffer) -> bytes:
+        return brotli.compress(data, quality=level)
+
+    return compress
+
+
+_compressors: dict[str, Callable[[int | None], Compressor]] = {
+    "gzip": _gzip,
+    "deflate": _deflate,
+    "zstd": _zstd,
+    "br": _brotli,
+}
+
+
+def get_compressor(encoding: str, level: int | None = None) -> Compressor:
+    # `encoding` is a Content-Encoding: gzip, deflate, zstd or br
+    factory = _compressors.get(encoding)
+    if factory is None:
+        raise ValueError(f"unsupported content encoding: {encoding}")
+    return factory(level)
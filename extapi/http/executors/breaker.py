@@ -0,0 +1,244 @@
+import enum
+import logging
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.types import CircuitOpenError, RequestData, Response
+
+from .._window import RollingCounters
+from .wrapped import WrappedExecutor
+
+T = TypeVar("T", covariant=True)
+
+
+class CircuitState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def host_key(request: RequestData) -> Hashable:
+    return request.url.scheme, request.url.host, request.url.port
+
+
+def route_key(request: RequestData) -> Hashable:
+    # A circuit per `path_template` (e.g. "/items/{id}") of a host, requests
+    # without one share the circuit of the host: a circuit per path
+    # would be created for every item id
+    path_template = request.kwargs.get("path_template")
+    return request.url.scheme, request.url.host, request.url.port, path_template
+
+
+def _default_is_failure(response: Response[Any]) -> bool:
+    return response.status >= 500
+
+
+class _Circuit:
+    __slots__ = ("state", "window", "opened_at", "probes", "probe_successes")
+
+    def __init__(self, window: RollingCounters):
+        self.state = CircuitState.CLOSED
+        self.window = window
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitBreakerExecutor(WrappedExecutor[T], Generic[T]):
+    # Keeps a circuit per `key` (host by default). A closed circuit opens when
+    # within the rolling window the failure rate or the slow call rate reaches
+    # its threshold. An open circuit fails fast with CircuitOpenError for
+    # `open_seconds`, then lets `half_open_max_calls` probes through: if all
+    # of them succeed the circuit closes, otherwise it opens again.
+    # At most `max_circuits` are kept, least recently used closed ones
+    # are evicted first.
+
+    __slots__ = (
+        "_logger",
+        "_key",
+        "_failure_rate_threshold",
+        "_slow_call_rate_threshold",
+        "_slow_call_duration",
+        "_min_calls",
+        "_window_seconds",
+        "_window_buckets",
+        "_open_seconds",
+        "_half_open_max_calls",
+        "_is_failure",
+        "_max_circuits",
+        "_circuits",
+    )
+
+    def __init__(
+        self,
+        executor: AbstractExecutor[T],
+        *,
+        key: Callable[[RequestData], Hashable] = host_key,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 1.0,
+        slow_call_duration: float = 10.0,
+        min_calls: int = 20,
+        window_seconds: float = 10.0,
+        window_buckets: int = 10,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 5,
+        is_failure: Callable[[Response[T]], bool] = _default_is_failure,
+        max_circuits: int = 1024,
+    ):
+        assert 0 < failure_rate_threshold <= 1
+        assert 0 < slow_call_rate_threshold <= 1
+        assert min_calls > 0
+        assert half_open_max_calls > 0
+        assert max_circuits > 0
+
+        super().__init__(executor)
+        self._logger = logging.getLogger("extapi.executor.breaker")
+        self._key = key
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._slow_call_duration = slow_call_duration
+        self._min_calls = min_calls
+        self._window_seconds = window_seconds
+        self._window_buckets = window_buckets
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._is_failure = is_failure
+        self._max_circuits = max_circuits
+        # in the order of use, the most recently used last
+        self._circuits: dict[Hashable, _Circuit] = {}
+
+    def state(self, key: Hashable) -> CircuitState:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return CircuitState.CLOSED
+        return circuit.state
+
+    @property
+    def circuits(self) -> int:
+        return len(self._circuits)
+
+    def _get_circuit(self, key: Hashable) -> _Circuit:
+        circuit = self._circuits.pop(key, None)
+        if circuit is None:
+            if len(self._circuits) >= self._max_circuits:
+                self._evict()
+            # calls, failures and slow calls
+            circuit = _Circuit(
+                RollingCounters(
+                    3,
+                    window_seconds=self._window_seconds,
+                    buckets=self._window_buckets,
+                )
+            )
+        self._circuits[key] = circuit
+        return circuit
+
+    def _evict(self) -> None:
+        # the least recently used closed circuit, the oldest one if all are open
+        evicted = next(iter(self._circuits))
+        for key, circuit in self._circuits.items():
+            if circuit.state is CircuitState.CLOSED:
+                evicted = key
+                break
+        del self._circuits[evicted]
+
+    def _transition(
+        self, key: Hashable, circuit: _Circuit, state: CircuitState
+    ) -> None:
+        self._logger.warning(
+            "circuit %s: %s -> %s", key, circuit.state.value, state.value
+        )
+        circuit.state = state
+        circuit.probes = 0
+        circuit.probe_successes = 0
+        if state is CircuitState.OPEN:
+            circuit.opened_at = time.monotonic()
+        circuit.window.reset()
+
+    def _before_call(self, key: Hashable, circuit: _Circuit) -> bool:
+        # returns whether the call is a half-open probe
+        if circuit.state is CircuitState.CLOSED:
+            return False
+
+        if circuit.state is CircuitState.OPEN:
+            open_for = time.monotonic() - circuit.opened_at
+            if open_for < self._open_seconds:
+                raise CircuitOpenError(key, retry_after=self._open_seconds - open_for)
+            self._transition(key, circuit, CircuitState.HALF_OPEN)
+
+        if circuit.probes >= self._half_open_max_calls:
+            raise CircuitOpenError(key, retry_after=0.0)
+
+        circuit.probes += 1
+        return True
+
+    def _on_result(
+        self,
+        key: Hashable,
+        circuit: _Circuit,
+        *,
+        probe: bool,
+        failure: bool,
+        slow: bool,
+    ) -> None:
+        if probe:
+            if circuit.state is not CircuitState.HALF_OPEN:
+                return  # pragma: no cover
+
+            if failure or slow:
+                self._transition(key, circuit, CircuitState.OPEN)
+                return
+
+            circuit.probe_successes += 1
+            if circuit.probe_successes >= self._half_open_max_calls:
+                self._transition(key, circuit, CircuitState.CLOSED)
+            return
+
+        if circuit.state is not CircuitState.CLOSED:
+            # a call started before the circuit has opened
+            return
+
+        circuit.window.add(1, failure, slow)
+        calls, failures, slow_calls = circuit.window.totals
+        if calls < self._min_calls:
+            return
+
+        if (
+            failures / calls >= self._failure_rate_threshold
+            or slow_calls / calls >= self._slow_call_rate_threshold
+        ):
+            self._transition(key, circuit, CircuitState.OPEN)
+
+    async def execute(self, request: RequestData) -> Response[T]:
+        key = self._key(request)
+        circuit = self._get_circuit(key)
+        probe = self._before_call(key, circuit)
+
+        started_at = time.monotonic()
+        try:
+            response = await super().execute(request)
+        except Exception:
+            self._on_result(
+                key,
+                circuit,
+                probe=probe,
+                failure=True,
+                slow=time.monotonic() - started_at >= self._slow_call_duration,
+            )
+            raise
+        except BaseException:
+            # cancelled - the probe slot is given back without a verdict
+            if probe and circuit.state is CircuitState.HALF_OPEN:
+                circuit.probes -= 1
+            raise
+
+        self._on_result(
+            key,
+            circuit,
+            probe=probe,
+            failure=self._is_failure(response),
+            slow=time.monotonic() - started_at >= self._slow_call_duration,
+        )
+        return response
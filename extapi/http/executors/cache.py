@@ -0,0 +1,377 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from typing import Generic, TypeVar
+
+from multidict import CIMultiDict
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.types import RequestData, Response
+
+from ..cache.abc import CacheStore
+from ..cache.memory import MemoryCacheStore
+from ..cache.policy import (
+    CACHEABLE_STATUSES,
+    age,
+    freshness_lifetime,
+    has_validators,
+    make_key,
+    merge_not_modified,
+    parse_cache_control,
+    parse_seconds,
+    vary_values,
+)
+from ..cache.types import CacheEntry
+from .wrapped import WrappedExecutor
+
+T = TypeVar("T", covariant=True)
+
+DEFAULT_CACHED_METHODS = ("GET",)
+_SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+_CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since", "If-Match", "Range")
+# directives forbidding to serve a response without revalidation
+_NO_STALE_DIRECTIVES = ("must-revalidate", "no-cache", "no-store")
+# successful responses kept for the stale modes without any cache headers
+_STALE_FALLBACK_STATUSES = frozenset((200, 203, 204))
+
+
+class CachingExecutor(WrappedExecutor[T], Generic[T]):
+    # A private HTTP cache. Responses are stored if they are explicitly fresh
+    # (Cache-Control: max-age, Expires) or may be revalidated (ETag,
+    # Last-Modified). Stale entries are revalidated with a conditional request
+    # and a 304 is turned into the cached response. One variant per URL is
+    # kept: an entry is only used if the request headers listed in its Vary
+    # match. Unsafe requests invalidate the entry of their URL.
+    #
+    # Within `stale_while_revalidate` seconds past expiration a stale entry
+    # is served right away while it is refreshed in the background (at most
+    # `max_background_refreshes` at a time, one per entry). Within
+    # `stale_if_error` seconds it is served when the upstream fails with an
+    # exception or a 5xx. The response directives of the same names
+    # (RFC 5861) take precedence over the executor defaults.
+
+    __slots__ = (
+        "_logger",
+        "_store",
+        "_methods",
+        "_max_entry_size",
+        "_stale_while_revalidate",
+        "_stale_if_error",
+        "_refresh_semaphore",
+        "_refreshes",
+        "_hits",
+        "_stale_hits",
+        "_misses",
+        "_revalidations",
+    )
+
+    def __init__(
+        self,
+        executor: AbstractExecutor[T],
+        *,
+        store: CacheStore | None = None,
+        methods: Iterable[str] = DEFAULT_CACHED_METHODS,
+        max_entry_size: int = 1024 * 1024,
+        stale_while_revalidate: float = 0.0,
+        stale_if_error: float = 0.0,
+        max_background_refreshes: int = 10,
+    ):
+        assert max_background_refreshes > 0
+
+        super().__init__(executor)
+        self._logger = logging.getLogger("extapi.executor.cache")
+        self._store = store if store is not None else MemoryCacheStore()
+        self._methods = frozenset(method.upper() for method in methods)
+        self._max_entry_size = max_entry_size
+        self._stale_while_revalidate = stale_while_revalidate
+        self._stale_if_error = stale_if_error
+        self._refresh_semaphore = asyncio.Semaphore(max_background_refreshes)
+        self._refreshes: dict[str, asyncio.Task] = {}
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._revalidations = 0
+
+    @property
+    def store(self) -> CacheStore:
+        return self._store
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def stale_hits(self) -> int:
+        return self._stale_hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def revalidations(self) -> int:
+        return self._revalidations
+
+    @property
+    def background_refreshes(self) -> int:
+        return len(self._refreshes)
+
+    async def close(self) -> None:
+        refreshes = list(self._refreshes.values())
+        for task in refreshes:
+            task.cancel()
+        await asyncio.gather(*refreshes, return_exceptions=True)
+
+    async def execute(self, request: RequestData) -> Response[T]:
+        method = request.method.upper()
+        if method not in self._methods:
+            response = await super().execute(request)
+            if method not in _SAFE_METHODS and response.status < 400:
+                await self._invalidate(request)
+            return response
+
+        headers = request.headers
+        request_cache_control = parse_cache_control(
+            headers.get("Cache-Control") if headers is not None else None
+        )
+        if "no-store" in request_cache_control or (
+            headers is not None and any(h in headers for h in _CONDITIONAL_HEADERS)
+        ):
+            # the caller manages caching on its own
+            return await super().execute(request)
+
+        key = make_key(request)
+        entry = await self._store.get(key)
+        if (
+            entry is not None
+            and vary_values(entry.get_header("Vary"), headers) != entry.vary
+        ):
+            entry = None
+
+        if entry is None:
+            self._misses += 1
+            response = await super().execute(request)
+            return await self._store_response(key, request, response)
+
+        now = time.time()
+        if not _must_revalidate(request_cache_control):
+            if entry.is_fresh(now):
+                self._hits += 1
+                return self._make_response(request, entry)
+
+            if entry.is_usable_while_revalidating(now):
+                self._stale_hits += 1
+                self._refresh_in_background(key, request, entry)
+                return self._make_response(request, entry)
+
+        updated = await self._update(key, request, entry)
+        if updated is None:
+            self._stale_hits += 1
+            return self._make_response(request, entry)
+        return updated
+
+    async def _update(
+        self, key: str, request: RequestData, entry: CacheEntry
+    ) -> Response[T] | None:
+        # Revalidates or refetches the entry. Returns None if the upstream
+        # failed and the stale entry may be served instead.
+        upstream_request = request
+        if has_validators(CIMultiDict(entry.headers)):
+            upstream_request = _conditional_request(request, entry)
+
+        usable_on_error = entry.is_usable_on_error(time.time())
+        try:
+            response = await super().execute(upstream_request)
+        except Exception as e:
+            if not usable_on_error:
+                raise
+            self._logger.warning(
+                "serving stale response for %s %s: %s(%s)",
+                request.method,
+                str(request.url),
+                type(e).__name__,
+                e,
+            )
+            return None
+
+        if response.status >= 500 and usable_on_error:
+            self._logger.warning(
+                "serving stale response for %s %s: status %d",
+                request.method,
+                str(request.url),
+                response.status,
+            )
+            await response.backend_response.close()
+            return None
+
+        if response.status == 304 and upstream_request is not request:
+            await response.backend_response.close()
+            self._revalidations += 1
+            entry = self._revalidated_entry(entry, response.headers)
+            await self._store.set(key, entry)
+            return self._make_response(request, entry)
+
+        self._misses += 1
+        return await self._store_response(key, request, response)
+
+    def _make_response(self, request: RequestData, entry: CacheEntry) -> Response[T]:
+        # decoded like a response of the backend executor
+        return self.buffered_response(
+            request,
+            status=entry.status,
+            headers=CIMultiDict(entry.headers),
+            body=entry.body,
+        )
+
+    def _refresh_in_background(
+        self, key: str, request: RequestData, entry: CacheEntry
+    ) -> None:
+        if key in self._refreshes:
+            return
+
+        task = asyncio.create_task(self._refresh(key, request.copy(), entry))
+        self._refreshes[key] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+
+    async def _refresh(self, key: str, request: RequestData, entry: CacheEntry) -> None:
+        async with self._refresh_semaphore:
+            try:
+                response = await self._update(key, request, entry)
+                if response is not None:
+                    await response.backend_response.close()
+            except Exception as e:
+                self._logger.warning(
+                    "background refresh of %s %s failed: %s(%s)",
+                    request.method,
+                    str(request.url),
+                    type(e).__name__,
+                    e,
+                )
+
+    async def _store_response(
+        self, key: str, request: RequestData, response: Response[T]
+    ) -> Response[T]:
+        if not self.reads_body(request):
+            # streamed responses are passed through: buffering the body
+            # would defeat streaming and the memory bound of the caller
+            return response
+
+        entry = await self._make_entry(request, response)
+        if entry is not None:
+            await self._store.set(key, entry)
+        return response
+
+    async def _make_entry(
+        self, request: RequestData, response: Response[T]
+    ) -> CacheEntry | None:
+        if response.status not in CACHEABLE_STATUSES:
+            return None
+
+        cache_control = parse_cache_control(response.headers.get("Cache-Control"))
+        if "no-store" in cache_control:
+            return None
+
+        lifetime = freshness_lifetime(response.headers, cache_control)
+        stale_while_revalidate, stale_if_error = self._stale_windows(cache_control)
+        if (
+            not lifetime
+            and not has_validators(response.headers)
+            and (
+                not (stale_while_revalidate or stale_if_error)
+                # errors are not kept as the last good response
+                or response.status not in _STALE_FALLBACK_STATUSES
+            )
+        ):
+            # would never be served from the cache
+            return None
+
+        vary = vary_values(response.headers.get("Vary"), request.headers)
+        if vary is None:
+            return None
+
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self._max_entry_size:
+                return None
+
+        # already read by the backend, stays available to the caller
+        body = await response.read()
+        if len(body) > self._max_entry_size:
+            return None
+
+        now = time.time()
+        return CacheEntry(
+            status=response.status,
+            headers=list(response.headers.items()),
+            body=body,
+            stored_at=now,
+            expires_at=now - age(response.headers) + (lifetime or 0.0),
+            vary=vary,
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+        )
+
+    def _revalidated_entry(self, entry: CacheEntry, headers: CIMultiDict) -> CacheEntry:
+        merged = CIMultiDict(merge_not_modified(entry.headers, headers))
+        cache_control = parse_cache_control(merged.get("Cache-Control"))
+        lifetime = freshness_lifetime(merged, cache_control)
+        stale_while_revalidate, stale_if_error = self._stale_windows(cache_control)
+        now = time.time()
+        return CacheEntry(
+            status=entry.status,
+            headers=list(merged.items()),
+            body=entry.body,
+            stored_at=now,
+            expires_at=now - age(headers) + (lifetime or 0.0),
+            vary=entry.vary,
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+        )
+
+    def _stale_windows(
+        self, cache_control: dict[str, str | None]
+    ) -> tuple[float, float]:
+        if any(directive in cache_control for directive in _NO_STALE_DIRECTIVES):
+            return 0.0, 0.0
+
+        stale_while_revalidate = parse_seconds(
+            cache_control.get("stale-while-revalidate")
+        )
+        stale_if_error = parse_seconds(cache_control.get("stale-if-error"))
+        return (
+            stale_while_revalidate
+            if stale_while_revalidate is not None
+            else self._stale_while_revalidate,
+            stale_if_error if stale_if_error is not None else self._stale_if_error,
+        )
+
+    async def _invalidate(self, request: RequestData) -> None:
+        for method in self._methods:
+            await self._store.delete(make_key(_with_method(request, method)))
+
+
+def _must_revalidate(request_cache_control: dict[str, str | None]) -> bool:
+    return (
+        "no-cache" in request_cache_control
+        or request_cache_control.get("max-age") == "0"
+    )
+
+
+def _with_method(request: RequestData, method: str) -> RequestData:
+    return RequestData(method=method, url=request.url, params=request.params)
+
+
+def _conditional_request(request: RequestData, entry: CacheEntry) -> RequestData:
+    request = request.copy()
+    headers = request.mutable_headers()
+
+    etag = entry.get_header("ETag")
+    if etag is not None:
+        headers["If-None-Match"] = etag
+
+    last_modified = entry.get_header("Last-Modified")
+    if last_modified is not None:
+        headers["If-Modified-Since"] = last_modified
+
+    return request
@@ -0,0 +1,108 @@
+import asyncio
+import functools
+from collections.abc import Callable, Hashable, Iterable
+from typing import Generic, TypeVar
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.types import RequestData, Response
+
+from ..cache.policy import make_key
+from .wrapped import WrappedExecutor
+
+T = TypeVar("T", covariant=True)
+
+DEFAULT_COALESCED_METHODS = ("GET", "HEAD")
+
+
+def default_coalesce_key(request: RequestData) -> Hashable:
+    headers: tuple[tuple[str, str], ...] = ()
+    if request.headers is not None:
+        headers = tuple(sorted((k.lower(), str(v)) for k, v in request.headers.items()))
+    # a smaller body limit must not be satisfied by a larger shared body
+    return make_key(request), headers, request.max_body_size
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class CoalescingExecutor(WrappedExecutor[T], Generic[T]):
+    # Identical in-flight requests (by `key`) are executed once: the first
+    # one leads, the rest await its result. The body is read once and shared
+    # by all the responses, each of them gets its own copy of headers, and
+    # is decoded like a response of the backend executor (the same codec and
+    # decode pool). Requests that do not read the body (auto_read_body=False
+    # set on the request or by default of the backend executor) are not
+    # coalesced. The upstream request is cancelled once nobody awaits it.
+
+    __slots__ = ("_key", "_methods", "_flights", "_coalesced")
+
+    def __init__(
+        self,
+        executor: AbstractExecutor[T],
+        *,
+        key: Callable[[RequestData], Hashable] = default_coalesce_key,
+        methods: Iterable[str] = DEFAULT_COALESCED_METHODS,
+    ):
+        super().__init__(executor)
+        self._key = key
+        self._methods = frozenset(method.upper() for method in methods)
+        self._flights: dict[Hashable, _Flight] = {}
+        self._coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        return self._coalesced
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def _fetch(self, request: RequestData) -> tuple[Response[T], bytes]:
+        response = await super().execute(request)
+        try:
+            body = await response.read()
+        finally:
+            # everything is buffered, release the connection
+            await response.backend_response.close()
+        return response, body
+
+    def _forget(
+        self, key: Hashable, flight: _Flight, _: asyncio.Task | None = None
+    ) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def execute(self, request: RequestData) -> Response[T]:
+        if request.method.upper() not in self._methods or not self.reads_body(request):
+            return await super().execute(request)
+
+        key = self._key(request)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._fetch(request)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(functools.partial(self._forget, key, flight))
+        else:
+            self._coalesced += 1
+
+        flight.waiters += 1
+        try:
+            response, body = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self._forget(key, flight)
+                flight.task.cancel()
+
+        return self.buffered_response(
+            request,
+            status=response.status,
+            headers=response.headers.copy(),
+            body=body,
+            original=response.original,
+        )
@@ -0,0 +1,139 @@
+import asyncio
+import dataclasses
+import logging
+from concurrent.futures import Executor
+from typing import Generic, TypeVar
+
+from multidict import CIMultiDict
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.types import RequestData, Response
+
+from ..codecs.json import JSON_CONTENT_TYPE
+from ..compression import Buffer, get_compressor
+from .wrapped import WrappedExecutor
+
+T = TypeVar("T", covariant=True)
+
+
+class CompressionExecutor(WrappedExecutor[T], Generic[T]):
+    # Compresses request bodies (`json` and bytes/str `data`) of at least
+    # `min_size` bytes and sets Content-Encoding. Bodies of at least
+    # `offload_size` bytes are compressed in `thread_pool` (the default
+    # executor of the loop if None). `json` is encoded with the codec of the
+    # wrapped executor (i.e. of the backend). The compressed body is kept on
+    # the request, so retries and hedges reuse it wherever the executor is
+    # placed. Requests with Content-Encoding already set and streamed bodies
+    # are sent as is.
+
+    __slots__ = (
+        "_logger",
+        "_encoding",
+        "_compress",
+        "_min_size",
+        "_offload_size",
+        "_thread_pool",
+        "_compressed",
+    )
+
+    def __init__(
+        self,
+        executor: AbstractExecutor[T],
+        *,
+        encoding: str = "gzip",
+        level: int | None = None,
+        min_size: int = 1024,
+        offload_size: int | None = 1024 * 1024,
+        thread_pool: Executor | None = None,
+    ):
+        assert min_size >= 0
+
+        super().__init__(executor)
+        self._logger = logging.getLogger("extapi.executor.compression")
+        self._encoding = encoding
+        self._compress = get_compressor(encoding, level)
+        self._min_size = min_size
+        self._offload_size = offload_size
+        self._thread_pool = thread_pool
+        self._compressed = 0
+
+    @property
+    def compressed(self) -> int:
+        return self._compressed
+
+    async def execute(self, request: RequestData) -> Response[T]:
+        if request.headers is not None and "Content-Encoding" in request.headers:
+            return await super().execute(request)
+
+        content_type: str | None = None
+        source: object
+        if request.json is not None and request.data is None:
+            source = request.json
+            content_type = JSON_CONTENT_TYPE
+        elif isinstance(request.data, str | bytes | bytearray | memoryview):
+            source = request.data
+            if isinstance(source, str):
+                content_type = "text/plain; charset=utf-8"
+        else:
+            return await super().execute(request)
+
+        cached = request._compressed_body
+        if cached is not None and cached[0] is source and cached[1] == self._encoding:
+            compressed = cached[2]
+        else:
+            compressed = await self._compress_body(request, source)
+            request._compressed_body = (source, self._encoding, compressed)
+
+        if compressed is None:
+            return await super().execute(request)
+
+        headers = CIMultiDict(request.headers or ())
+        headers["Content-Encoding"] = self._encoding
+        if content_type is not None:
+            headers.setdefault("Content-Type", content_type)
+
+        return await super().execute(
+            dataclasses.replace(request, json=None, data=compressed, headers=headers)
+        )
+
+    async def _compress_body(
+        self, request: RequestData, source: object
+    ) -> bytes | None:
+        # None if the body is too small or incompressible
+        body: Buffer
+        if isinstance(source, str):
+            body = source.encode()
+        elif isinstance(source, memoryview):
+            # compressors take contiguous memory as is, without a copy
+            body = source if source.c_contiguous else source.tobytes()
+        elif isinstance(source, bytes | bytearray):
+            body = source
+        else:
+            body = request.encode_json(self.json_codec)
+
+        size = body.nbytes if isinstance(body, memoryview) else len(body)
+        if size < self._min_size:
+            return None
+
+        if self._offload_size is not None and size >= self._offload_size:
+            loop = asyncio.get_running_loop()
+            compressed = await loop.run_in_executor(
+                self._thread_pool, self._compress, body
+            )
+        else:
+            compressed = self._compress(body)
+
+        if len(compressed) >= size:
+            # incompressible (e.g. already compressed) data
+            return None
+
+        self._compressed += 1
+        self._logger.debug(
+            "compressed request body %s %s with %s: %d -> %d bytes",
+            request.method,
+            str(request.url),
+            self._encoding,
+            size,
+            len(compressed),
+        )
+        return compressed
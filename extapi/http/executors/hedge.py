@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, TypeVar
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.types import RequestData, Response
+
+from .wrapped import WrappedExecutor
+
+T = TypeVar("T", covariant=True)
+
+DEFAULT_HEDGED_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def _default_is_success(response: Response[Any]) -> bool:
+    return response.status < 500
+
+
+class HedgedExecutor(WrappedExecutor[T], Generic[T]):
+    # Sends up to `max_hedges` extra copies of a slow idempotent request and
+    # returns the first successful response, cancelling (and closing) the rest.
+    # The hedge delay is either fixed or the `percentile` of recently observed
+    # latencies. Put it outside of limiting executors so that hedges obey limits.
+    # The request passed in is left as is, every attempt is sent as a copy.
+
+    __slots__ = (
+        "_logger",
+        "_max_hedges",
+        "_delay",
+        "_percentile",
+        "_min_samples",
+        "_latencies",
+        "_latencies_added",
+        "_percentile_delay",
+        "_methods",
+        "_is_success",
+        "_hedges_sent",
+        "_hedges_won",
+    )
+
+    def __init__(
+        self,
+        executor: AbstractExecutor[T],
+        *,
+        max_hedges: int = 1,
+        delay: float | None = None,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window_size: int = 1000,
+        methods: Iterable[str] = DEFAULT_HEDGED_METHODS,
+        is_success: Callable[[Response[T]], bool] = _default_is_success,
+    ):
+        assert max_hedges > 0
+        assert 0 < percentile <= 100
+        assert 0 < min_samples <= window_size
+
+        super().__init__(executor)
+        self._logger = logging.getLogger("extapi.executor.hedge")
+        self._max_hedges = max_hedges
+        self._delay = delay
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._latencies_added = 0
+        self._percentile_delay: float | None = None
+        self._methods = frozenset(method.upper() for method in methods)
+        self._is_success = is_success
+        self._hedges_sent = 0
+        self._hedges_won = 0
+
+    @property
+    def hedges_sent(self) -> int:
+        return self._hedges_sent
+
+    @property
+    def hedges_won(self) -> int:
+        return self._hedges_won
+
+    @property
+    def hedge_delay(self) -> float | None:
+        if self._delay is not None:
+            return self._delay
+        return self._percentile_delay
+
+    def _observe(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._latencies_added += 1
+
+        # sorting the window on every request is too expensive,
+        # recalculate the percentile once in a while
+        if len(self._latencies) >= self._min_samples and (
+            self._percentile_delay is None
+            or self._latencies_added % max(1, self._min_samples // 2) == 0
+        ):
+            latencies = sorted(self._latencies)
+            index = math.ceil(len(latencies) * self._percentile / 100) - 1
+            self._percentile_delay = latencies[max(index, 0)]
+
+    async def execute(self, request: RequestData) -> Response[T]:
+        started_at = time.monotonic()
+        delay = self.hedge_delay
+        if delay is None or request.method.upper() not in self._methods:
+            response = await super().execute(request)
+            self._observe(time.monotonic() - started_at)
+            return response
+
+        # every attempt gets its own copy: executors down the chain (retries,
+        # addons) modify the request, a hedge must not copy a half-modified one
+        attempts = [asyncio.create_task(super().execute(request.copy()))]
+        pending = set(attempts)
+        winner: asyncio.Task | None = None
+        last_response: Response[T] | None = None
+        last_error: Exception | None = None
+
+        try:
+            while pending:
+                can_hedge = len(attempts) <= self._max_hedges
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    self._hedges_sent += 1
+                    self._logger.debug(
+                        "request %s %s is slower than %.3fs, sending hedge #%d",
+                        request.method,
+                        str(request.url),
+                        delay,
+                        len(attempts),
+                    )
+                    hedge = asyncio.create_task(super().execute(request.copy()))
+                    attempts.append(hedge)
+                    pending.add(hedge)
+                    continue
+
+                for task in done:
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+
+                    if self._is_success(response):
+                        winner = task
+                        # Measured from the start of the request: when a hedge
+                        # wins, this is the elapsed time of the cancelled first
+                        # attempt, a lower bound of its latency. Timing the
+                        # hedge alone would pull the percentile down and
+                        # trigger even more hedging.
+                        self._observe(time.monotonic() - started_at)
+                        if task is not attempts[0]:
+                            self._hedges_won += 1
+                        return response
+
+                    last_response = response
+
+            if last_response is not None:
+                return last_response
+
+            assert last_error is not None
+            raise last_error
+        finally:
+            # everything except the returned response is cancelled or closed
+            await _discard_attempts(
+                [task for task in attempts if task is not winner],
+                keep=last_response if winner is None else None,
+            )
+
+
+async def _discard_attempts(
+    tasks: list[asyncio.Task], *, keep: Response[Any] | None
+) -> None:
+    for task in tasks:
+        task.cancel()
+
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, Response) and result is not keep:
+            await result.backend_response.close()
@@ -1,8 +1,13 @@
+import time
+from collections.abc import Iterable
 from typing import TypeVar
 
 from extapi.http.abc import AbstractExecutor
 from extapi.http.types import RequestData, Response
-from extapi.limiters.concurrency.abc import ConcurrencyLimiter
+from extapi.limiters.concurrency.abc import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiter,
+)
 from extapi.limiters.rps.abc import RateLimiter
 
 from .wrapped import WrappedExecutor
@@ -11,20 +16,44 @@ T = TypeVar("T", covariant=True)
 
 
 class ConcurrencyLimitedExecutor(WrappedExecutor[T]):
-    __slots__ = ("_concurrency_limiter",)
+    __slots__ = ("_concurrency_limiter", "_adaptive_limiter", "_drop_statuses")
 
     def __init__(
         self,
         executor: AbstractExecutor[T],
         *,
         concurrency_limiter: ConcurrencyLimiter,
+        drop_statuses: Iterable[int] = (429, 503),
     ):
         super().__init__(executor)
         self._concurrency_limiter = concurrency_limiter
+        # adaptive limiters are fed with the outcome of every request
+        self._adaptive_limiter = (
+            concurrency_limiter
+            if isinstance(concurrency_limiter, AdaptiveConcurrencyLimiter)
+            else None
+        )
+        self._drop_statuses = frozenset(drop_statuses)
 
     async def execute(self, request: RequestData) -> Response[T]:
         async with self._concurrency_limiter.get_semaphore():
-            return await super().execute(request)
+            if self._adaptive_limiter is None:
+                return await super().execute(request)
+
+            started_at = time.monotonic()
+            try:
+                response = await super().execute(request)
+            except Exception:
+                self._adaptive_limiter.on_sample(
+                    latency=time.monotonic() - started_at, dropped=True
+                )
+                raise
+
+            self._adaptive_limiter.on_sample(
+                latency=time.monotonic() - started_at,
+                dropped=response.status in self._drop_statuses,
+            )
+            return response
 
 
 class RateLimitedExecutor(WrappedExecutor[T]):
@@ -32,7 +32,9 @@ class PrometheusMetricsExecutor(WrappedExecutor[T], Generic[T]):
         self._disable_warnings = disable_warnings
 
     async def execute(self, request: RequestData) -> Response[T]:
-        path_template = request.kwargs.pop("path_template", None)
+        # not popped: other executors (e.g. route_key of the circuit breaker)
+        # and the next attempts of the request read it as well
+        path_template = request.kwargs.get("path_template")
 
         if not self._disable_warnings and path_template is None:
             warnings.warn(
@@ -1,15 +1,26 @@
 import asyncio
+import io
 import itertools
 import logging
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
 from types import EllipsisType
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
 
+from extapi._helpers import is_async_callable
 from extapi.http.abc import AbstractExecutor, Addon, Retryable
-from extapi.http.types import ExecuteError, HttpExecuteError, RequestData, Response
-
+from extapi.http.types import (
+    BodyTooLargeError,
+    CircuitOpenError,
+    ExecuteError,
+    HttpExecuteError,
+    RequestData,
+    Response,
+)
+
+from .._window import RollingCounters
 from ..addons.log import LoggingAddon
 from ..addons.retry import Retry5xxAddon, Retry429Addon
+from ..backoff import BackoffPolicy, ConstantBackoff
 from .wrapped import WrappedExecutor
 
 T = TypeVar("T", covariant=True)
@@ -23,14 +34,93 @@ def get_default_addons() -> list[Addon[T] | Retryable[T]]:
     ]
 
 
+def _overrides(addon: object, name: str) -> bool:
+    # hooks inherited from the Addon protocol do nothing
+    return getattr(type(addon), name, None) is not getattr(Addon, name, None)
+
+
+def _compile_hooks(
+    addons: Iterable[object], name: str
+) -> list[tuple[Callable[..., Any], bool]]:
+    # Returns the bound hooks overriding the Addon defaults along with whether
+    # they have to be awaited, plain (sync) hooks are called without creating
+    # a coroutine.
+    return [
+        (hook, is_async_callable(hook))
+        for hook in (
+            getattr(addon, name) for addon in addons if _overrides(addon, name)
+        )
+    ]
+
+
+def _one_shot_body(data: Any) -> tuple[bool, int | None]:
+    # Whether the body can be sent only once and the position to rewind
+    # a seekable file to before sending it again.
+    # ReplayableBody is streamed from the beginning by the backends itself.
+    if isinstance(data, io.IOBase):
+        if data.seekable():
+            return False, data.tell()
+        return True, None
+
+    return isinstance(data, (Iterator, AsyncIterator)), None
+
+
+class RetryBudget:
+    # Allows retries to be at most `ratio` of requests made within the last
+    # `window_seconds` (plus `min_retries_per_second` to let low traffic retry),
+    # so that retries never multiply the load on a struggling upstream.
+    # May be shared between several executors.
+
+    __slots__ = ("_ratio", "_reserve", "_counters")
+
+    def __init__(
+        self,
+        *,
+        ratio: float = 0.1,
+        min_retries_per_second: float = 10.0,
+        window_seconds: float = 10.0,
+        buckets: int = 10,
+    ):
+        assert ratio >= 0
+
+        self._ratio = ratio
+        self._reserve = min_retries_per_second * window_seconds
+        # requests and retries
+        self._counters = RollingCounters(
+            2, window_seconds=window_seconds, buckets=buckets
+        )
+
+    @property
+    def balance(self) -> float:
+        requests, retries = self._counters.totals
+        return requests * self._ratio + self._reserve - retries
+
+    def deposit(self) -> None:
+        self._counters.add(1, 0)
+
+    def try_withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+
+        self._counters.add(0, 1)
+        return True
+
+
 class RetryableExecutor(WrappedExecutor[T], Generic[T]):
     __slots__ = (
         "_logger",
         "_max_retries",
         "_retry_sleep_timeout",
+        "_backoff",
+        "_retry_budget",
         "_log_retries",
         "_addons",
         "_retry_addons",
+        "_before_request_hooks",
+        "_process_response_hooks",
+        "_process_error_hooks",
+        "_need_retry_hooks",
+        "_share_headers",
     )
 
     def __init__(
@@ -39,6 +129,8 @@ class RetryableExecutor(WrappedExecutor[T], Generic[T]):
         *,
         max_retries: int = 3,
         retry_sleep_timeout: float = 3.0,
+        backoff: BackoffPolicy | None = None,
+        retry_budget: RetryBudget | None = None,
         log_retries: bool = True,
         addons: Iterable[Addon[T] | Retryable[T]] = (),
         default_addons: Iterable[Addon[T] | Retryable[T]] | EllipsisType = ...,
@@ -49,6 +141,8 @@ class RetryableExecutor(WrappedExecutor[T], Generic[T]):
         self._logger = logging.getLogger("extapi.executor.retry")
         self._max_retries = max_retries
         self._retry_sleep_timeout = retry_sleep_timeout
+        self._backoff = backoff or ConstantBackoff(retry_sleep_timeout)
+        self._retry_budget = retry_budget
         self._log_retries = log_retries
 
         if default_addons is ...:
@@ -67,24 +161,51 @@ class RetryableExecutor(WrappedExecutor[T], Generic[T]):
             if isinstance(addon, Retryable)
         ]
 
+        # hooks are resolved once, the ones left as Addon defaults are skipped
+        self._before_request_hooks = _compile_hooks(self._addons, "before_request")
+        self._process_response_hooks = _compile_hooks(self._addons, "process_response")
+        self._process_error_hooks = _compile_hooks(self._addons, "process_error")
+        self._need_retry_hooks = _compile_hooks(self._retry_addons, "need_retry")
+
+        # Every attempt starts with the original headers. They are shared with
+        # the attempt as a read-only view and copied only once modified through
+        # request.mutable_headers(), unless some addon may modify them in place.
+        self._share_headers = all(
+            addon.copy_on_write_headers
+            for addon in self._addons
+            if _overrides(addon, "before_request")
+        )
+
     async def _before_request(self, request: RequestData):
-        for addon in self._addons:
-            await addon.before_request(request)
+        for hook, is_async in self._before_request_hooks:
+            if is_async:
+                await hook(request)
+            else:
+                hook(request)
 
     async def _process_response(
         self, request: RequestData, response: Response[T]
     ) -> Response[T]:
-        for addon in self._addons:
-            response = await addon.process_response(request, response)
+        for hook, is_async in self._process_response_hooks:
+            if is_async:
+                response = await hook(request, response)
+            else:
+                response = hook(request, response)
         return response
 
     async def _process_error(self, request: RequestData, error: Exception) -> None:
-        for addon in self._addons:
-            await addon.process_error(request, error)
+        for hook, is_async in self._process_error_hooks:
+            if is_async:
+                await hook(request, error)
+            else:
+                hook(request, error)
 
     async def _need_retry(self, response: Response[T]) -> tuple[bool, float | None]:
-        for addon in self._retry_addons:
-            need_retry, timeout = await addon.need_retry(response)
+        for hook, is_async in self._need_retry_hooks:
+            if is_async:
+                need_retry, timeout = await hook(response)
+            else:
+                need_retry, timeout = hook(response)
             if need_retry:
                 return need_retry, timeout
         return False, None
@@ -92,16 +213,39 @@ class RetryableExecutor(WrappedExecutor[T], Generic[T]):
     async def execute(self, request: RequestData) -> Response[T]:
         last_exc: Exception | None = None
         response: Response | None = None
-
+        budget_exhausted = False
+        previous_sleep_timeout = 0.0
+
+        if self._retry_budget is not None:
+            self._retry_budget.deposit()
+
+        max_retries = self._max_retries
+        rewind_to: int | None = None
+        if request.data is not None:
+            one_shot, rewind_to = _one_shot_body(request.data)
+            if one_shot:
+                # resending an exhausted iterator would send an empty body
+                max_retries = 1
+
+        # The caller's headers are never modified: the attempts get either
+        # a read-only view of them or a copy.
         original_headers = request.headers
-        for retry in range(self._max_retries):
-            request.headers = (
-                original_headers.copy() if original_headers is not None else None
-            )
+
+        for retry in range(max_retries):
+            if rewind_to is not None and retry > 0:
+                request.data.seek(rewind_to)
+
+            if self._share_headers:
+                request.share_headers(original_headers)
+            else:
+                request.headers = (
+                    original_headers.copy() if original_headers is not None else None
+                )
 
             await self._before_request(request)
 
-            retry_sleep_timeout = self._retry_sleep_timeout
+            # set when the delay is dictated by an addon or an error
+            retry_sleep_timeout: float | None = None
             need_retry = False
 
             try:
@@ -109,7 +253,7 @@ class RetryableExecutor(WrappedExecutor[T], Generic[T]):
                     self._logger.warning(
                         "retry #%d/%d of request %s %s",
                         retry + 1,
-                        self._max_retries,
+                        max_retries,
                         request.method,
                         str(request.url),
                     )
@@ -131,6 +275,15 @@ class RetryableExecutor(WrappedExecutor[T], Generic[T]):
                 await self._process_error(request, e)
                 raise e
 
+            except CircuitOpenError as e:
+                # the upstream is known to be failing - fail fast
+                await self._process_error(request, e)
+                raise
+
+            except BodyTooLargeError:
+                # the same body would be refused again
+                raise
+
             except Exception as e:
                 need_retry = True
                 last_exc = e
@@ -150,18 +303,41 @@ class RetryableExecutor(WrappedExecutor[T], Generic[T]):
                         e,
                     )
 
-            if retry >= self._max_retries - 1:
+            if retry >= max_retries - 1:
                 break
 
+            if self._retry_budget is not None and not self._retry_budget.try_withdraw():
+                budget_exhausted = True
+                self._logger.warning(
+                    "retry budget exhausted, not retrying request %s %s",
+                    request.method,
+                    str(request.url),
+                )
+                break
+
+            if response is not None:
+                # release the discarded response so that an unread (streamed)
+                # body does not hold the connection while we retry
+                await response.backend_response.close()
+
+            if retry_sleep_timeout is None:
+                retry_sleep_timeout = self._backoff.delay(retry, previous_sleep_timeout)
+            previous_sleep_timeout = retry_sleep_timeout
+
             if retry_sleep_timeout > 0:
                 await asyncio.sleep(retry_sleep_timeout)
 
         if response is not None:
             return response
 
+        if last_exc is not None and budget_exhausted:
+            raise ExecuteError(
+                f"request failed, retry budget exhausted: {type(last_exc).__name__}({str(last_exc)})"
+            ) from last_exc
+
         if last_exc is not None:
             raise ExecuteError(
-                f"request failed after {self._max_retries} retries: {type(last_exc).__name__}({str(last_exc)})"
+                f"request failed after {max_retries} retries: {type(last_exc).__name__}({str(last_exc)})"
             ) from last_exc
         else:  # pragma: no cover
-            raise ExecuteError(f"request failed after {self._max_retries} retries")
+            raise ExecuteError(f"request failed after {max_retries} retries")
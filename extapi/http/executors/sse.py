@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from typing import Generic, TypeVar
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.sse import (
+    EVENT_STREAM_CONTENT_TYPE,
+    EventStreamState,
+    ServerSentEvent,
+)
+from extapi.http.types import (
+    DEFAULT_CHUNK_SIZE,
+    CircuitOpenError,
+    ExecuteError,
+    HttpExecuteError,
+    RequestData,
+)
+
+from .wrapped import WrappedExecutor
+
+T = TypeVar("T", covariant=True)
+
+
+class EventStreamExecutor(WrappedExecutor[T], Generic[T]):
+    # Subscribes to text/event-stream endpoints with events(). Like
+    # EventSource it reconnects when the stream ends or the connection fails,
+    # sending the last received id in `Last-Event-ID` and waiting for the
+    # `retry` the server asked for. Non-200 responses are not reconnected
+    # (204 ends the stream). Plain execute() is passed through.
+
+    __slots__ = (
+        "_logger",
+        "_retry_delay",
+        "_max_reconnects",
+        "_chunk_size",
+        "_reconnects",
+    )
+
+    def __init__(
+        self,
+        executor: AbstractExecutor[T],
+        *,
+        retry_delay: float = 3.0,
+        max_reconnects: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        assert retry_delay >= 0
+        assert max_reconnects is None or max_reconnects >= 0
+
+        super().__init__(executor)
+        self._logger = logging.getLogger("extapi.executor.sse")
+        self._retry_delay = retry_delay
+        # consecutive reconnects without receiving an event
+        self._max_reconnects = max_reconnects
+        self._chunk_size = chunk_size
+        self._reconnects = 0
+
+    @property
+    def reconnects(self) -> int:
+        return self._reconnects
+
+    async def events(
+        self,
+        request: RequestData,
+        *,
+        last_event_id: str | None = None,
+    ) -> AsyncIterator[ServerSentEvent]:
+        retry_delay = self._retry_delay
+        failed_reconnects = 0
+        state = EventStreamState(last_id=last_event_id)
+
+        while True:
+            attempt = request.copy()
+            attempt.auto_read_body = False
+            headers = attempt.mutable_headers()
+            headers.setdefault("Accept", EVENT_STREAM_CONTENT_TYPE)
+            headers.setdefault("Cache-Control", "no-cache")
+            if state.last_id:
+                headers["Last-Event-ID"] = state.last_id
+
+            try:
+                async with await self.execute(attempt) as response:
+                    if response.status == 204:
+                        return
+                    if response.status != 200:
+                        raise HttpExecuteError(response)
+
+                    async for event in response.iter_sse(self._chunk_size, state=state):
+                        failed_reconnects = 0
+                        yield event
+
+                self._logger.debug("event stream %s ended", str(request.url))
+
+            except (HttpExecuteError, CircuitOpenError):
+                raise
+
+            except Exception as e:
+                self._logger.warning(
+                    "event stream %s failed: %s(%s)",
+                    str(request.url),
+                    type(e).__name__,
+                    e,
+                )
+
+            if self._max_reconnects is not None:
+                if failed_reconnects >= self._max_reconnects:
+                    raise ExecuteError(
+                        f"event stream {request.url} failed after {failed_reconnects} reconnects"
+                    )
+                failed_reconnects += 1
+
+            self._reconnects += 1
+            if state.retry is not None:
+                retry_delay = state.retry / 1000
+            if retry_delay > 0:
+                await asyncio.sleep(retry_delay)
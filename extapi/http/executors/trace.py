@@ -7,7 +7,6 @@ if not has_open_telemetry:
 
 from typing import Generic, TypeVar
 
-from multidict import CIMultiDict
 from opentelemetry import trace
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
@@ -50,10 +49,7 @@ class OpenTelemetryExecutor(WrappedExecutor[T], Generic[T]):
     async def execute(self, request: RequestData) -> Response[T]:
         with self._tracer.start_as_current_span(self._span_name) as span:
             if self._inject_tracing_headers:
-                if request.headers is None:
-                    request.headers = CIMultiDict()
-
-                self._trace_context_propagator.inject(request.headers)
+                self._trace_context_propagator.inject(request.mutable_headers())
 
             span.set_attribute(SpanAttributes.HTTP_REQUEST_METHOD, request.method)
 
@@ -1,6 +1,9 @@
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
+
+from multidict import CIMultiDict
 
 from extapi.http.abc import AbstractExecutor
+from extapi.http.codecs.json import JsonCodec
 from extapi.http.types import RequestData, Response
 
 T = TypeVar("T", covariant=True)
@@ -12,6 +15,27 @@ class WrappedExecutor(AbstractExecutor[T], Generic[T]):
     def __init__(self, executor: AbstractExecutor[T]):
         self._executor = executor
 
+    @property
+    def auto_read_body(self) -> bool:
+        return self._executor.auto_read_body
+
+    @property
+    def json_codec(self) -> JsonCodec:
+        return self._executor.json_codec
+
+    def buffered_response(
+        self,
+        request: RequestData,
+        *,
+        status: int,
+        headers: CIMultiDict,
+        body: bytes | memoryview,
+        original: Any = None,
+    ) -> Response[T]:
+        return self._executor.buffered_response(
+            request, status=status, headers=headers, body=body, original=original
+        )
+
     async def execute(self, request: RequestData) -> Response[T]:
         return await self._executor.execute(request)
 
@@ -0,0 +1,84 @@
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any
+
+EVENT_STREAM_CONTENT_TYPE = "text/event-stream"
+
+
+@dataclass(slots=True, kw_only=True)
+class ServerSentEvent:
+    event: str = "message"
+    data: str = ""
+    # the last event id received so far
+    id: str | None = None
+    # reconnection time in milliseconds, if the server sent one
+    retry: int | None = None
+
+    def json(self, *, loads: Callable[[str], Any] = json.loads) -> Any:
+        return loads(self.data)
+
+
+@dataclass(slots=True, kw_only=True)
+class EventStreamState:
+    # What a reconnect needs, updated by iter_sse() even for blocks that
+    # dispatch no event (e.g. only `id:` or `retry:`), as EventSource does
+    last_id: str | None = None
+    retry: int | None = None
+
+
+async def iter_sse(
+    lines: AsyncIterable[bytes], *, state: EventStreamState | None = None
+) -> AsyncIterator[ServerSentEvent]:
+    # Parses text/event-stream lines as described in
+    # https://html.spec.whatwg.org/multipage/server-sent-events.html
+    event = ""
+    data: list[str] = []
+    last_id: str | None = None
+    retry: int | None = None
+    first = True
+
+    async for raw in lines:
+        if not raw:
+            # a blank line dispatches the event,
+            # the last id applies even if there is none
+            if state is not None and last_id is not None:
+                state.last_id = last_id
+            if data:
+                yield ServerSentEvent(
+                    event=event or "message",
+                    data="\n".join(data),
+                    id=last_id,
+                    retry=retry,
+                )
+                retry = None
+            event = ""
+            data = []
+            continue
+
+        line = raw.decode("utf-8", errors="replace")
+        if first:
+            line = line.removeprefix("\ufeff")  # BOM
+            first = False
+
+        if line.startswith(":"):
+            # a comment, e.g. a keep-alive
+            continue
+
+        name, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+
+        if name == "data":
+            data.append(value)
+        elif name == "event":
+            event = value
+        elif name == "id":
+            if "\0" not in value:
+                last_id = value
+        elif name == "retry":
+            if value.isascii() and value.isdigit():
+                retry = int(value)
+                if state is not None:
+                    state.retry = retry
+
+    # an event not terminated by a blank line is discarded
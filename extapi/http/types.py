@@ -1,5 +1,8 @@
+import functools
 import json
-from dataclasses import dataclass, field
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import Executor
+from dataclasses import dataclass, field, replace
 from typing import (
     Any,
     Callable,
@@ -7,14 +10,21 @@ from typing import (
     Literal,
     Protocol,
     TypeVar,
+    overload,
     runtime_checkable,
 )
 
-from multidict import CIMultiDict
+from multidict import CIMultiDict, CIMultiDictProxy
 from yarl import URL
 
 from extapi._meta import PY311
 
+from ._offload import DEFAULT_OFFLOAD_SIZE, loads_str, run_decode
+from ._streams import iter_json_items, iter_lines, iter_ndjson
+from .codecs.json import JsonCodec, get_default_json_codec
+from .codecs.models import ModelDecoder, model_decoder
+from .sse import EventStreamState, ServerSentEvent, iter_sse
+
 if PY311:
     from typing import Self  # type: ignore[attr-defined]
 else:
@@ -24,6 +34,7 @@ HttpMethod = Literal["GET", "POST", "PUT", "PATCH", "DELETE"] | str
 StrOrURL = str | URL
 
 DEFAULT_JSON_DECODER = json.loads
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 @dataclass(slots=True, kw_only=True)
@@ -33,13 +44,64 @@ class RequestData:
     params: dict[str, Any] | None = None
     json: Any = None
     data: Any = None
-    headers: CIMultiDict | None = None
+    # a read-only CIMultiDictProxy while shared, see mutable_headers()
+    headers: CIMultiDict | CIMultiDictProxy | None = None
     timeout: Any | float | None = None
     auto_read_body: bool | None = None
+    # overrides the executor max_body_size
+    max_body_size: int | None = None
     kwargs: dict[str, Any] = field(default_factory=dict)
+    # `json` encoded by a codec: (json, codec, body)
+    _json_body: tuple[Any, JsonCodec, bytes] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # the body compressed by CompressionExecutor: (source, encoding, body),
+    # the body is None for incompressible data
+    _compressed_body: tuple[Any, str, bytes | None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def share_headers(self, headers: CIMultiDict | CIMultiDictProxy | None) -> None:
+        # uses a read-only view of the headers instead of copying them,
+        # they are copied by mutable_headers() once needed
+        self.headers = CIMultiDictProxy(headers) if headers is not None else None
+
+    def mutable_headers(self) -> CIMultiDict:
+        # headers that may be modified in place
+        headers = self.headers
+        if headers is None:
+            headers = CIMultiDict()
+        elif isinstance(headers, CIMultiDictProxy):
+            headers = headers.copy()
+        self.headers = headers
+        return headers
+
+    def copy(self) -> "RequestData":
+        # headers and kwargs of the copy may be modified
+        # (e.g. by executors down the chain) without affecting this request
+        request = replace(
+            self,
+            headers=self.headers.copy() if self.headers is not None else None,
+            kwargs=dict(self.kwargs),
+        )
+        request._json_body = self._json_body
+        request._compressed_body = self._compressed_body
+        return request
+
+    def encode_json(self, codec: JsonCodec) -> bytes:
+        # Encoded once and reused by the following attempts (e.g. retries)
+        # until `json` is replaced. bytes are considered already encoded.
+        cached = self._json_body
+        if cached is not None and cached[0] is self.json and cached[1] is codec:
+            return cached[2]
+
+        body = self.json if isinstance(self.json, bytes) else codec.encode(self.json)
+        self._json_body = (self.json, codec, body)
+        return body
 
 
 T = TypeVar("T", covariant=True)
+M = TypeVar("M")
 
 
 @runtime_checkable
@@ -55,23 +117,82 @@ class BackendResponseProtocol(Protocol[T]):
         *,
         encoding: str | None,
         loads: Callable[[str], Any] = DEFAULT_JSON_DECODER,
+        decode_pool: Executor | None = None,
+        offload_size: int | None = None,
     ) -> Any:
         data = await self.read()
-        if encoding is None:
-            s = data.decode()
-        else:
-            s = data.decode(encoding=encoding)
-        return loads(s)
+        return await self.run_decode(
+            functools.partial(loads_str, loads, encoding),
+            data,
+            pool=decode_pool,
+            offload_size=offload_size,
+        )
 
+    async def decode(self, type_: type[M]) -> M:
+        return await self.run_decode(
+            ModelDecoder(type_, self.json_codec()), await self.read()
+        )
 
-@dataclass(kw_only=True)
+    async def run_decode(
+        self,
+        decode: Callable[[bytes], M],
+        data: bytes,
+        *,
+        pool: Executor | None = None,
+        offload_size: int | None = None,
+    ) -> M:
+        # Backends may offload decoding of large bodies to their pool,
+        # `pool` and `offload_size` are per call settings
+        if pool is None:
+            return decode(data)
+        return await run_decode(
+            decode,
+            data,
+            pool=pool,
+            offload_size=DEFAULT_OFFLOAD_SIZE if offload_size is None else offload_size,
+        )
+
+    async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        data = await self.read()
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset : offset + chunk_size]
+
+    def headers(self) -> CIMultiDict:
+        return CIMultiDict()
+
+    def json_codec(self) -> JsonCodec:
+        return get_default_json_codec()
+
+
+@dataclass(kw_only=True, init=False)
 class Response(Generic[T]):
     method: str
     url: URL
     status: int
-    headers: CIMultiDict = field(default_factory=lambda: CIMultiDict())
     backend_response: BackendResponseProtocol[T]
 
+    def __init__(
+        self,
+        *,
+        method: str,
+        url: URL,
+        status: int,
+        headers: CIMultiDict | None = None,
+        backend_response: BackendResponseProtocol[T],
+    ):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.backend_response = backend_response
+        if headers is not None:
+            self.headers = headers
+
+    @functools.cached_property
+    def headers(self) -> CIMultiDict:
+        # taken from the backend response on first access: many callers never
+        # look at them and converting them is not free (e.g. for httpx)
+        return self.backend_response.headers()
+
     @property
     def original(self) -> T:
         return self.backend_response.original()
@@ -84,8 +205,97 @@ class Response(Generic[T]):
         *,
         encoding: str | None = None,
         loads: Callable[[str], Any] = DEFAULT_JSON_DECODER,
+        decode_pool: Executor | None = None,
+        offload_size: int | None = None,
     ) -> Any:
-        return await self.backend_response.json(encoding=encoding, loads=loads)
+        if decode_pool is None:
+            return await self.backend_response.json(encoding=encoding, loads=loads)
+
+        # decoded by the backend (with its checks) in `decode_pool` if large
+        return await self.backend_response.json(
+            encoding=encoding,
+            loads=loads,
+            decode_pool=decode_pool,
+            offload_size=offload_size,
+        )
+
+    async def decode(self, type_: type[M]) -> M:
+        # decodes the body straight into a model, e.g. list[Item]
+        return await self.backend_response.decode(type_)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        return self.backend_response.iter_chunks(chunk_size)
+
+    def iter_lines(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE, *, keepends: bool = False
+    ) -> AsyncIterator[bytes]:
+        return iter_lines(self.iter_chunks(chunk_size), keepends=keepends)
+
+    @overload
+    def iter_ndjson(
+        self, *, type_: None = ..., chunk_size: int = ...
+    ) -> AsyncIterator[Any]: ...
+
+    @overload
+    def iter_ndjson(
+        self, *, type_: type[M], chunk_size: int = ...
+    ) -> AsyncIterator[M]: ...
+
+    def iter_ndjson(
+        self,
+        *,
+        type_: type[M] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[Any]:
+        # a value per line (application/x-ndjson, JSON lines)
+        codec = self.backend_response.json_codec()
+        return iter_ndjson(
+            self.iter_lines(chunk_size),
+            decode=codec.decode if type_ is None else model_decoder(type_, codec),
+        )
+
+    def iter_sse(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        *,
+        state: EventStreamState | None = None,
+    ) -> AsyncIterator[ServerSentEvent]:
+        # events of a text/event-stream, `state` keeps the last id and retry
+        # for reconnects, see EventStreamExecutor
+        return iter_sse(self.iter_lines(chunk_size), state=state)
+
+    @overload
+    def iter_json_items(
+        self,
+        path: str | Sequence[str] = ...,
+        *,
+        type_: None = ...,
+        chunk_size: int = ...,
+    ) -> AsyncIterator[Any]: ...
+
+    @overload
+    def iter_json_items(
+        self,
+        path: str | Sequence[str] = ...,
+        *,
+        type_: type[M],
+        chunk_size: int = ...,
+    ) -> AsyncIterator[M]: ...
+
+    def iter_json_items(
+        self,
+        path: str | Sequence[str] = (),
+        *,
+        type_: type[M] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[Any]:
+        # items of a (possibly huge) JSON array, see _streams.iter_json_items
+        codec = self.backend_response.json_codec()
+        return iter_json_items(
+            self.iter_chunks(chunk_size),
+            path,
+            decode=codec.decode if type_ is None else model_decoder(type_, codec),
+        )
 
     async def __aenter__(self) -> Self:
         return self
@@ -106,3 +316,27 @@ class HttpExecuteError(ExecuteError):
         return (
             f"HTTPExecuteError(url={self.response.url}, status={self.response.status})"
         )
+
+
+class BodyTooLargeError(ExecuteError):
+    def __init__(self, url: URL, max_body_size: int, size: int | None = None):
+        self.url = url
+        self.max_body_size = max_body_size
+        # declared by Content-Length, None if exceeded while reading
+        self.size = size
+
+    def __str__(self):
+        size = f"={self.size}" if self.size is not None else f">{self.max_body_size}"
+        return (
+            f"BodyTooLargeError(url={self.url}, size{size}, "
+            f"max_body_size={self.max_body_size})"
+        )
+
+
+class CircuitOpenError(ExecuteError):
+    def __init__(self, key: Any, retry_after: float):
+        self.key = key
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return f"CircuitOpenError(key={self.key}, retry_after={self.retry_after:.2f})"
@@ -0,0 +1,13 @@
+import os
+import tempfile
+
+
+def default_shared_dir() -> str:
+    # tmpfs on linux - lives in memory and is wiped on reboot
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def shared_path(kind: str, name: str) -> str:
+    return os.path.join(default_shared_dir(), f"extapi-{kind}-{name}")
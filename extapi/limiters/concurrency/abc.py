@@ -1,5 +1,5 @@
 import abc
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 from extapi._meta import PY311
 
@@ -40,3 +40,11 @@ DummySemaphore = _DummySemaphore()
 
 class ConcurrencyLimiter(Protocol):
     def get_semaphore(self) -> AbstractSemaphore: ...
+
+
+@runtime_checkable
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter, Protocol):
+    @property
+    def limit(self) -> int: ...
+
+    def on_sample(self, *, latency: float, dropped: bool) -> None: ...
@@ -0,0 +1,218 @@
+import abc
+import asyncio
+import logging
+import math
+from collections import deque
+
+from .abc import AbstractSemaphore, AdaptiveConcurrencyLimiter
+
+
+class _AdaptiveSemaphore(AbstractSemaphore):
+    __slots__ = ("_limiter",)
+
+    def __init__(self, limiter: "_BaseAdaptiveLimiter"):
+        self._limiter = limiter
+
+    async def acquire(self) -> None:
+        await self._limiter._acquire()
+
+    async def release(self) -> None:
+        self._limiter._release()
+
+
+class _BaseAdaptiveLimiter(AdaptiveConcurrencyLimiter, metaclass=abc.ABCMeta):
+    __slots__ = (
+        "_limit",
+        "_min_limit",
+        "_max_limit",
+        "_inflight",
+        "_waiters",
+        "_logger",
+    )
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+    ) -> None:
+        assert 0 < min_limit <= initial_limit <= max_limit
+
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._inflight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._logger = logging.getLogger("extapi.concurrency_limiter.adaptive")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def get_semaphore(self) -> AbstractSemaphore:
+        return _AdaptiveSemaphore(self)
+
+    def on_sample(self, *, latency: float, dropped: bool) -> None:
+        old_limit = self.limit
+        self._limit = min(
+            max(self._update(latency, dropped), self._min_limit), self._max_limit
+        )
+
+        if self.limit != old_limit:
+            self._logger.debug("concurrency limit %d -> %d", old_limit, self.limit)
+            self._wakeup()
+
+    @abc.abstractmethod
+    def _update(self, latency: float, dropped: bool) -> float:
+        raise NotImplementedError  # pragma: no cover
+
+    async def _acquire(self) -> None:
+        if not self._waiters and self._inflight < self.limit:
+            self._inflight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # the permit is taken on our behalf by the one who wakes us up
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._inflight -= 1
+        self._wakeup()
+
+    def _wakeup(self) -> None:
+        while self._waiters and self._inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():  # cancelled
+                continue
+
+            self._inflight += 1
+            waiter.set_result(None)
+
+
+class AIMDConcurrencyLimiter(_BaseAdaptiveLimiter):
+    # Additive increase while the limit is utilized,
+    # multiplicative decrease on drops (errors, 429, timeouts).
+
+    __slots__ = ("_increase_by", "_backoff_ratio", "_timeout")
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        increase_by: float = 1.0,
+        backoff_ratio: float = 0.9,
+        timeout: float | None = None,
+    ) -> None:
+        assert 0.5 <= backoff_ratio < 1
+        super().__init__(
+            initial_limit=initial_limit, min_limit=min_limit, max_limit=max_limit
+        )
+        self._increase_by = increase_by
+        self._backoff_ratio = backoff_ratio
+        # latency above timeout is treated as a drop
+        self._timeout = timeout
+
+    def _update(self, latency: float, dropped: bool) -> float:
+        if dropped or (self._timeout is not None and latency > self._timeout):
+            return self._limit * self._backoff_ratio
+
+        # do not grow the limit when it is not even used
+        if self._inflight * 2 >= self._limit:
+            return self._limit + self._increase_by
+
+        return self._limit
+
+
+class GradientConcurrencyLimiter(_BaseAdaptiveLimiter):
+    # Compares short-term latency against the long-term baseline:
+    # when latency grows, requests are queueing upstream and the limit shrinks
+    # proportionally; `sqrt(limit)` of headroom lets it probe for more.
+
+    __slots__ = (
+        "_smoothing",
+        "_tolerance",
+        "_backoff_ratio",
+        "_long_window",
+        "_short_window",
+        "_long_latency",
+        "_short_latency",
+    )
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        backoff_ratio: float = 0.9,
+        long_window: int = 600,
+        short_window: int = 10,
+    ) -> None:
+        assert 0 < smoothing <= 1
+        assert tolerance >= 1
+        assert 0.5 <= backoff_ratio < 1
+        super().__init__(
+            initial_limit=initial_limit, min_limit=min_limit, max_limit=max_limit
+        )
+        self._smoothing = smoothing
+        self._tolerance = tolerance
+        self._backoff_ratio = backoff_ratio
+        self._long_window = long_window
+        self._short_window = short_window
+        self._long_latency: float | None = None
+        self._short_latency: float | None = None
+
+    @property
+    def long_latency(self) -> float | None:
+        return self._long_latency
+
+    @property
+    def short_latency(self) -> float | None:
+        return self._short_latency
+
+    def _update(self, latency: float, dropped: bool) -> float:
+        if dropped:
+            return self._limit * self._backoff_ratio
+
+        if self._long_latency is None or self._short_latency is None:
+            self._long_latency = self._short_latency = latency
+            return self._limit
+
+        self._short_latency = _ema(self._short_latency, latency, self._short_window)
+        self._long_latency = _ema(self._long_latency, latency, self._long_window)
+
+        # do not grow the limit when it is not even used
+        if self._short_latency <= 0 or self._inflight * 2 < self._limit:
+            return self._limit
+
+        # the baseline drifted far above the current latency (e.g. after
+        # an upstream incident) - let it recover faster
+        if self._long_latency / self._short_latency > 2:
+            self._long_latency *= 0.95
+
+        gradient = max(
+            0.5,
+            min(1.0, self._tolerance * self._long_latency / self._short_latency),
+        )
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        return self._limit * (1 - self._smoothing) + new_limit * self._smoothing
+
+
+def _ema(value: float, sample: float, window: int) -> float:
+    factor = 2 / (window + 1)
+    return value * (1 - factor) + sample * factor
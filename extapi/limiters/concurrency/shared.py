@@ -0,0 +1,185 @@
+import sys
+
+from extapi._meta import has_fcntl
+
+# the platform check is also seen by type checkers
+if sys.platform == "win32" or not has_fcntl:
+    raise ImportError(  # pragma: no cover
+        "shared limiters require fcntl and are available on POSIX platforms only"
+    )
+
+import asyncio
+import fcntl
+import os
+from collections import deque
+
+from .._shared import shared_path
+from .abc import AbstractSemaphore, ConcurrencyLimiter
+
+
+class _SlotFile:
+    # Every permit is an exclusive record lock on a single byte of the file.
+    # Record locks are owned by the process and released by the kernel
+    # when it dies, so permits of a crashed worker are reclaimed automatically.
+    # They are also shared by everything within a process (and dropped when any
+    # descriptor of the file is closed), so there must be exactly one _SlotFile
+    # per path per process, tracking which slots this process holds.
+
+    __slots__ = ("_fd", "_size", "_held", "_next", "_waiters")
+
+    def __init__(self, path: str, size: int):
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._size = size
+        self._held: set[int] = set()
+        self._next = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def held(self) -> int:
+        return len(self._held)
+
+    def try_acquire(self) -> int | None:
+        for i in range(self._size):
+            slot = (self._next + i) % self._size
+            if slot in self._held:
+                continue
+
+            try:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, slot)
+            except OSError:  # EAGAIN/EACCES - held by another process
+                continue
+
+            self._held.add(slot)
+            self._next = slot + 1
+            return slot
+
+        return None
+
+    async def acquire(self, poll_interval: float) -> int:
+        while True:
+            slot = self.try_acquire()
+            if slot is not None:
+                return slot
+
+            # releases within this process wake waiters up immediately,
+            # releases of other processes are noticed by polling
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            timer = loop.call_later(poll_interval, _wake_up, waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # woken up and then cancelled, the wakeup is passed on
+                    self._wake_next()
+                raise
+            finally:
+                timer.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self, slot: int) -> None:
+        self._held.discard(slot)
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, slot)
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    def close(self) -> None:
+        # drops every lock this process holds on the file
+        os.close(self._fd)
+        self._held.clear()
+
+
+def _wake_up(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_slot_files: dict[tuple[int, str], _SlotFile] = {}
+
+
+def _get_slot_file(path: str, size: int) -> _SlotFile:
+    key = (os.getpid(), os.path.realpath(path))
+    slot_file = _slot_files.get(key)
+    if slot_file is None:
+        slot_file = _slot_files[key] = _SlotFile(path, size)
+    elif slot_file.size != size:
+        raise ValueError(
+            f"{path} is already used with max_concurrency={slot_file.size}, got {size}"
+        )
+    return slot_file
+
+
+class _SharedSemaphore(AbstractSemaphore):
+    __slots__ = ("_limiter", "_slot")
+
+    def __init__(self, limiter: "SharedConcurrencyLimiter"):
+        self._limiter = limiter
+        self._slot: int | None = None
+
+    async def acquire(self) -> None:
+        self._slot = await self._limiter._slot_file().acquire(
+            self._limiter._poll_interval
+        )
+
+    async def release(self) -> None:
+        if self._slot is not None:
+            self._limiter._slot_file().release(self._slot)
+            self._slot = None
+
+
+class SharedConcurrencyLimiter(ConcurrencyLimiter):
+    __slots__ = ("_path", "_max_concurrency", "_poll_interval")
+
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        path: str | os.PathLike[str] | None = None,
+        max_concurrency: int,
+        poll_interval: float = 0.05,
+    ) -> None:
+        if path is None:
+            if name is None:
+                raise ValueError("either name or path must be provided")
+            path = shared_path("concurrency", name)
+
+        assert max_concurrency > 0
+
+        self._path = os.fspath(path)
+        self._max_concurrency = max_concurrency
+        self._poll_interval = poll_interval
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def held(self) -> int:
+        # permits held by the current process
+        return self._slot_file().held
+
+    def close(self) -> None:
+        # releases every permit of the current process held on this path
+        slot_file = _slot_files.pop((os.getpid(), os.path.realpath(self._path)), None)
+        if slot_file is not None:
+            slot_file.close()
+
+    def _slot_file(self) -> _SlotFile:
+        return _get_slot_file(self._path, self._max_concurrency)
+
+    def get_semaphore(self) -> AbstractSemaphore:
+        return _SharedSemaphore(self)
@@ -12,6 +12,9 @@ class LocalRateLimiter(RateLimiter):
         "_rate_limit_window_seconds",
         "_logger",
         "_deque",
+        "_fair",
+        "_waiters",
+        "_timer",
     )
 
     def __init__(
@@ -19,12 +22,19 @@ class LocalRateLimiter(RateLimiter):
         *,
         rate_limit: int = 0,
         rate_limit_window_seconds: int = 1,
+        fair: bool = False,
     ) -> None:
         self._rate_limit = rate_limit
         self._rate_limit_window_seconds = rate_limit_window_seconds
         self._logger = logging.getLogger("extapi.rate_limiter.local")
         self._deque: deque[float] = deque(maxlen=rate_limit)
 
+        # fair mode: waiters are queued and woken up one by one
+        # by a single timer, each exactly at its own time slot
+        self._fair = fair
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._timer: asyncio.TimerHandle | None = None
+
     async def rate_limit(self):
         if self._rate_limit <= 0:
             return
@@ -32,6 +42,9 @@ class LocalRateLimiter(RateLimiter):
         if not self._deque.maxlen:
             return
 
+        if self._fair:
+            return await self._rate_limit_fair()
+
         now = time.monotonic()
 
         if len(self._deque) < self._deque.maxlen:
@@ -53,3 +66,179 @@ class LocalRateLimiter(RateLimiter):
             await asyncio.sleep(sleep_seconds)
         else:
             self._deque.append(now)
+
+    async def _rate_limit_fair(self) -> None:
+        # newcomers must not overtake already queued waiters
+        if not self._waiters and self._try_acquire(time.monotonic()):
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._schedule_wakeup()
+        await waiter
+
+    def _try_acquire(self, now: float) -> bool:
+        if len(self._deque) < self._rate_limit:
+            self._deque.append(now)
+            return True
+
+        if now - self._deque[0] >= self._rate_limit_window_seconds:
+            self._deque.popleft()
+            self._deque.append(now)
+            return True
+
+        return False
+
+    def _schedule_wakeup(self) -> None:
+        if self._timer is not None:
+            return
+
+        if len(self._deque) < self._rate_limit:
+            delay = 0.0
+        else:
+            delay = self._deque[0] + self._rate_limit_window_seconds - time.monotonic()
+
+        self._logger.debug(
+            "%d waiters queued, next slot in %.2fs to satisfy rate limit %d within %d seconds",
+            len(self._waiters),
+            delay,
+            self._rate_limit,
+            self._rate_limit_window_seconds,
+        )
+        self._timer = asyncio.get_running_loop().call_later(
+            max(delay, 0.0), self._wakeup
+        )
+
+    def _wakeup(self) -> None:
+        self._timer = None
+
+        now = time.monotonic()
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.done():  # cancelled
+                self._waiters.popleft()
+                continue
+
+            if not self._try_acquire(now):
+                break
+
+            self._waiters.popleft()
+            waiter.set_result(None)
+
+        if self._waiters:
+            self._schedule_wakeup()
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    __slots__ = (
+        "_rate_limit",
+        "_rate_limit_window_seconds",
+        "_burst",
+        "_rate",
+        "_tokens",
+        "_updated_at",
+        "_logger",
+    )
+
+    def __init__(
+        self,
+        *,
+        rate_limit: int = 0,
+        rate_limit_window_seconds: float = 1,
+        burst: int | None = None,
+    ) -> None:
+        self._rate_limit = rate_limit
+        self._rate_limit_window_seconds = rate_limit_window_seconds
+        self._burst = burst if burst is not None else rate_limit
+        assert rate_limit <= 0 or self._burst >= 1
+
+        self._rate = rate_limit / rate_limit_window_seconds
+        self._tokens = float(self._burst)
+        self._updated_at = time.monotonic()
+        self._logger = logging.getLogger("extapi.rate_limiter.local")
+
+    async def rate_limit(self):
+        if self._rate_limit <= 0:
+            return
+
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+
+        # tokens may go negative - every waiter reserves its token up front
+        # and sleeps exactly until the bucket has refilled enough to cover it
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+
+        sleep_seconds = -self._tokens / self._rate
+        self._logger.debug(
+            "sleeping for %.2fs in order to satisfy rate limit %d within %s seconds",
+            sleep_seconds,
+            self._rate_limit,
+            self._rate_limit_window_seconds,
+        )
+        await asyncio.sleep(sleep_seconds)
+
+
+class GCRARateLimiter(RateLimiter):
+    __slots__ = (
+        "_rate_limit",
+        "_rate_limit_window_seconds",
+        "_emission_interval",
+        "_burst_tolerance",
+        "_tat",
+        "_logger",
+    )
+
+    def __init__(
+        self,
+        *,
+        rate_limit: int = 0,
+        rate_limit_window_seconds: float = 1,
+        burst: int | None = None,
+    ) -> None:
+        self._rate_limit = rate_limit
+        self._rate_limit_window_seconds = rate_limit_window_seconds
+        burst = burst if burst is not None else rate_limit
+        assert rate_limit <= 0 or burst >= 1
+
+        self._emission_interval = (
+            rate_limit_window_seconds / rate_limit if rate_limit > 0 else 0.0
+        )
+        self._burst_tolerance = self._emission_interval * (burst - 1)
+        # theoretical arrival time of the next request
+        self._tat = 0.0
+        self._logger = logging.getLogger("extapi.rate_limiter.local")
+
+    async def rate_limit(self):
+        if self._rate_limit <= 0:
+            return
+
+        now = time.monotonic()
+        self._tat, sleep_seconds = _gcra_reserve(
+            self._tat,
+            now,
+            emission_interval=self._emission_interval,
+            burst_tolerance=self._burst_tolerance,
+        )
+
+        if sleep_seconds > 0:
+            self._logger.debug(
+                "sleeping for %.2fs in order to satisfy rate limit %d within %s seconds",
+                sleep_seconds,
+                self._rate_limit,
+                self._rate_limit_window_seconds,
+            )
+            await asyncio.sleep(sleep_seconds)
+
+
+def _gcra_reserve(
+    tat: float, now: float, *, emission_interval: float, burst_tolerance: float
+) -> tuple[float, float]:
+    # reserves a slot for a request arriving at `now` and returns
+    # the new theoretical arrival time and the delay until that slot
+    tat = max(tat, now)
+    return tat + emission_interval, tat - burst_tolerance - now
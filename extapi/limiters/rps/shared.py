@@ -0,0 +1,147 @@
+import sys
+
+from extapi._meta import has_fcntl
+
+# the platform check is also seen by type checkers
+if sys.platform == "win32" or not has_fcntl:
+    raise ImportError(  # pragma: no cover
+        "shared limiters require fcntl and are available on POSIX platforms only"
+    )
+
+import asyncio
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import time
+
+from .._shared import shared_path
+from .abc import RateLimiter
+from .local import _gcra_reserve
+
+# theoretical arrival time (monotonic) and wall-clock offset of the monotonic clock
+_STATE = struct.Struct("<dd")
+
+# monotonic clock restarts on reboot - if the offset has drifted more than that,
+# the stored state belongs to another boot and is discarded
+_CLOCK_OFFSET_TOLERANCE = 1.0
+
+
+class SharedRateLimiter(RateLimiter):
+    __slots__ = (
+        "_path",
+        "_rate_limit",
+        "_rate_limit_window_seconds",
+        "_emission_interval",
+        "_burst_tolerance",
+        "_logger",
+        "_pid",
+        "_fd",
+        "_mmap",
+    )
+
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        path: str | os.PathLike[str] | None = None,
+        rate_limit: int = 0,
+        rate_limit_window_seconds: float = 1,
+        burst: int | None = None,
+    ) -> None:
+        if path is None:
+            if name is None:
+                raise ValueError("either name or path must be provided")
+            path = shared_path("rps", name)
+
+        self._path = os.fspath(path)
+        self._rate_limit = rate_limit
+        self._rate_limit_window_seconds = rate_limit_window_seconds
+        burst = burst if burst is not None else rate_limit
+        assert rate_limit <= 0 or burst >= 1
+
+        self._emission_interval = (
+            rate_limit_window_seconds / rate_limit if rate_limit > 0 else 0.0
+        )
+        self._burst_tolerance = self._emission_interval * (burst - 1)
+        self._logger = logging.getLogger("extapi.rate_limiter.shared")
+
+        self._pid: int | None = None
+        self._fd: int | None = None
+        self._mmap: mmap.mmap | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._pid = None
+
+    def _open(self) -> tuple[int, mmap.mmap]:
+        pid = os.getpid()
+        if self._pid != pid:
+            # flock is bound to the open file description, so a descriptor
+            # inherited through fork would not exclude the parent process
+            self.close()
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(fd).st_size < _STATE.size:
+                        os.ftruncate(fd, _STATE.size)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                self._mmap = mmap.mmap(fd, _STATE.size)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._fd = fd
+            self._pid = pid
+
+        assert self._fd is not None and self._mmap is not None
+        return self._fd, self._mmap
+
+    def _reserve(self) -> float:
+        fd, buf = self._open()
+
+        # the critical section never awaits, so it is held for microseconds
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            now = time.monotonic()
+            clock_offset = time.time() - now
+            tat, stored_offset = _STATE.unpack_from(buf)
+            if abs(stored_offset - clock_offset) > _CLOCK_OFFSET_TOLERANCE:
+                tat = 0.0
+
+            tat, sleep_seconds = _gcra_reserve(
+                tat,
+                now,
+                emission_interval=self._emission_interval,
+                burst_tolerance=self._burst_tolerance,
+            )
+            _STATE.pack_into(buf, 0, tat, clock_offset)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+        return sleep_seconds
+
+    async def rate_limit(self):
+        if self._rate_limit <= 0:
+            return
+
+        sleep_seconds = self._reserve()
+        if sleep_seconds > 0:
+            self._logger.debug(
+                "sleeping for %.2fs in order to satisfy shared rate limit %d within %s seconds",
+                sleep_seconds,
+                self._rate_limit,
+                self._rate_limit_window_seconds,
+            )
+            await asyncio.sleep(sleep_seconds)
@@ -51,7 +51,81 @@ async def dummy_server(
     async def get(request):
         return web.json_response({"status": "ok"}, headers=request.headers)
 
+    async def stream(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for i in range(3):
+            await response.write(f"line-{i}\n".encode())
+        await response.write_eof()
+        return response
+
+    async def echo(request):
+        return web.json_response(
+            {"content_type": request.content_type, "body": await request.json()}
+        )
+
+    async def ndjson(request):
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for i in range(3):
+            await response.write(f'{{"id": {i}}}\n'.encode())
+        await response.write_eof()
+        return response
+
+    async def events(request):
+        # one event per connection, resumed from Last-Event-ID, then 204
+        last_id = int(request.headers.get("Last-Event-ID", "0"))
+        if last_id >= 3:
+            return web.Response(status=204)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(
+            f"retry: 0\n: keep-alive\n\nid: {last_id + 1}\ndata: event {last_id + 1}\n\n".encode()
+        )
+        await response.write_eof()
+        return response
+
+    async def upload(request):
+        body = await request.read()
+        return web.json_response(
+            {
+                "body": body.decode(),
+                "content_type": request.content_type,
+                "content_length": request.content_length,
+                "chunked": request.headers.get("Transfer-Encoding") == "chunked",
+            }
+        )
+
+    async def payload(request):
+        # `size` bytes, sent chunked without Content-Length if `chunked` is set
+        size = int(request.query["size"])
+        if "chunked" not in request.query:
+            return web.Response(body=b"x" * size)
+
+        response = web.StreamResponse()
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        for offset in range(0, size, 1024):
+            await response.write(b"x" * min(1024, size - offset))
+        await response.write_eof()
+        return response
+
+    async def latin1(request):
+        return web.Response(
+            body='{"name": "café"}'.encode("latin-1"),
+            content_type="application/json",
+            charset="latin-1",
+        )
+
     app.router.add_get("/get", get)
+    app.router.add_get("/latin1", latin1)
+    app.router.add_get("/payload", payload)
+    app.router.add_post("/upload", upload)
+    app.router.add_get("/ndjson", ndjson)
+    app.router.add_get("/events", events)
+    app.router.add_post("/echo", echo)
+    app.router.add_get("/stream", stream)
 
     server = await aiohttp_server(app, port=unused_tcp_port_factory())
     yield server
@@ -1,16 +1,58 @@
-from base64 import b64encode
+import asyncio
+import json
+import time
+from base64 import b64encode, urlsafe_b64encode
 from functools import partial
 from typing import Any
 
+import pytest
+from multidict import CIMultiDict
+from pytest_mock.plugin import MockerFixture
+
+from extapi.http.abc import AbstractExecutor
 from extapi.http.addons.auth import (
     BearerAuthAddon,
+    CachingTokenProvider,
     StaticBasicAuthAddon,
     StaticBearerAuthAddon,
+    TokenFetchResult,
 )
+from extapi.http.executors.retry import RetryableExecutor
 from extapi.http.types import RequestData, Response
 from tests.exthttp._helpers import DummyBackendResponse
 
 
+@pytest.fixture
+def clock(mocker: MockerFixture) -> list[float]:
+    offset = [0.0]
+    monotonic = time.monotonic
+    mocker.patch("time.monotonic", side_effect=lambda: monotonic() + offset[0])
+    return offset
+
+
+def _jwt(exp: float) -> str:
+    def _encode(data: dict[str, Any]) -> str:
+        return urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    return f"{_encode({'alg': 'none'})}.{_encode({'exp': exp})}.sig"
+
+
+class _Fetcher:
+    def __init__(self, expires_in: float | None = 3600, delay: float = 0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.error: Exception | None = None
+        self.calls = 0
+
+    async def __call__(self) -> TokenFetchResult:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"access_token": f"token-{self.calls}", "expires_in": self.expires_in}
+
+
 class TestBearerAuthAddon:
     async def test_sync_partial(self, request_simple: RequestData):
         def getter(arg: str) -> str:
@@ -160,3 +202,152 @@ class TestStaticBasicAuthAddon:
 
         assert need_retry is False
         assert timeout is None
+
+
+class TestCachingTokenProvider:
+    async def test_cached(self, clock: list[float]):
+        fetcher = _Fetcher()
+        provider = CachingTokenProvider(fetcher)
+
+        assert await provider() == "token-1"
+        assert await provider() == "token-1"
+        assert fetcher.calls == 1
+
+    async def test_single_flight(self):
+        fetcher = _Fetcher(delay=0.01)
+        provider = CachingTokenProvider(fetcher)
+
+        tokens = await asyncio.gather(*(provider() for _ in range(50)))
+
+        assert set(tokens) == {"token-1"}
+        assert fetcher.calls == 1
+
+    async def test_refresh_ahead(self, clock: list[float]):
+        fetcher = _Fetcher(expires_in=3600, delay=0.01)
+        provider = CachingTokenProvider(fetcher, refresh_ahead=60)
+        await provider()
+
+        clock[0] += 3550
+        # the still valid token is returned while refreshing in the background
+        assert await provider() == "token-1"
+        assert await provider() == "token-1"
+        await asyncio.sleep(0.05)
+        assert await provider() == "token-2"
+        assert fetcher.calls == 2
+
+    async def test_expired(self, clock: list[float]):
+        fetcher = _Fetcher(expires_in=10)
+        provider = CachingTokenProvider(fetcher, refresh_ahead=60)
+        await provider()
+
+        clock[0] += 11
+        assert await provider() == "token-2"
+
+    async def test_short_lived_refreshed_at_half(self, clock: list[float]):
+        fetcher = _Fetcher(expires_in=10)
+        provider = CachingTokenProvider(fetcher, refresh_ahead=60)
+        await provider()
+
+        clock[0] += 4
+        await provider()
+        assert fetcher.calls == 1
+        clock[0] += 2
+        await provider()
+        await asyncio.sleep(0)
+        assert fetcher.calls == 2
+
+    async def test_jwt_exp(self, clock: list[float]):
+        tokens = [_jwt(time.time() + 100), _jwt(time.time() + 1000)]
+        provider = CachingTokenProvider(lambda: tokens.pop(0))
+
+        first = await provider()
+        clock[0] += 101
+        assert await provider() != first
+        assert tokens == []
+
+    async def test_default_ttl(self, clock: list[float]):
+        fetcher = _Fetcher(expires_in=None)
+        provider = CachingTokenProvider(fetcher, default_ttl=100)
+        await provider()
+
+        clock[0] += 101
+        assert await provider() == "token-2"
+
+    async def test_no_expiration(self, clock: list[float]):
+        provider = CachingTokenProvider(lambda: "opaque")
+        await provider()
+
+        clock[0] += 10**6
+        assert await provider() == "opaque"
+
+    async def test_invalidate_once(self):
+        fetcher = _Fetcher()
+        provider = CachingTokenProvider(fetcher)
+        await provider()
+
+        provider.invalidate("token-1")
+        assert await provider() == "token-2"
+        # late 401s with the old token do not drop the new one
+        provider.invalidate("token-1")
+        assert await provider() == "token-2"
+        assert fetcher.calls == 2
+
+    async def test_background_failure(self, clock: list[float]):
+        fetcher = _Fetcher(expires_in=3600)
+        provider = CachingTokenProvider(fetcher, refresh_ahead=60)
+        await provider()
+
+        clock[0] += 3550
+        fetcher.error = ConnectionError("down")
+        assert await provider() == "token-1"
+        await asyncio.sleep(0)
+        assert await provider() == "token-1"
+        assert fetcher.calls == 2
+
+    async def test_foreground_failure(self):
+        fetcher = _Fetcher()
+        fetcher.error = ConnectionError("down")
+        provider = CachingTokenProvider(fetcher)
+
+        with pytest.raises(ConnectionError):
+            await provider()
+
+        fetcher.error = None
+        assert await provider() == "token-2"
+
+
+class _AuthServer(AbstractExecutor[Any]):
+    # accepts only the latest token of the fetcher
+    def __init__(self, fetcher: _Fetcher):
+        self.fetcher = fetcher
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        assert request.headers is not None
+        expected = f"Bearer token-{self.fetcher.calls}"
+        await asyncio.sleep(0.01)
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=200 if request.headers["Authorization"] == expected else 401,
+            backend_response=DummyBackendResponse(),
+        )
+
+
+async def test_401_wave_refreshes_once():
+    fetcher = _Fetcher()
+    provider = CachingTokenProvider(fetcher)
+    executor = RetryableExecutor(
+        _AuthServer(fetcher),
+        retry_sleep_timeout=0,
+        addons=[BearerAuthAddon(provider)],
+    )
+    await provider()
+    # the server has rotated the token
+    fetcher.calls += 1
+
+    responses = await asyncio.gather(
+        *(executor.get("https://example.com", headers=CIMultiDict()) for _ in range(20))
+    )
+
+    assert [response.status for response in responses] == [200] * 20
+    assert fetcher.calls == 3
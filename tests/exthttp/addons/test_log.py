@@ -0,0 +1,41 @@
+import logging
+
+import pytest
+
+from extapi.http.addons.log import LoggingAddon, VerboseLoggingAddon
+from extapi.http.types import RequestData, Response
+
+
+@pytest.mark.parametrize("addon_cls", [LoggingAddon, VerboseLoggingAddon])
+async def test_logged(
+    addon_cls: type[LoggingAddon],
+    request_simple: RequestData,
+    response_simple: Response,
+    caplog: pytest.LogCaptureFixture,
+):
+    addon = addon_cls()
+    with caplog.at_level(logging.DEBUG, logger="extapi.http.addons.log"):
+        await addon.before_request(request_simple)
+        await addon.process_response(request_simple, response_simple)
+
+    assert [record.levelno for record in caplog.records] == [logging.DEBUG] * 2
+    assert "executing request GET https://example.com" in caplog.records[0].message
+    assert "status=200" in caplog.records[1].message
+
+
+@pytest.mark.parametrize("addon_cls", [LoggingAddon, VerboseLoggingAddon])
+async def test_disabled(
+    addon_cls: type[LoggingAddon],
+    request_simple: RequestData,
+    response_simple: Response,
+    caplog: pytest.LogCaptureFixture,
+):
+    addon = addon_cls()
+    with caplog.at_level(logging.INFO, logger="extapi.http.addons.log"):
+        await addon.before_request(request_simple)
+        await addon.process_response(request_simple, response_simple)
+
+        response_simple.status = 500
+        await addon.process_response(request_simple, response_simple)
+
+    assert [record.levelno for record in caplog.records] == [logging.ERROR]
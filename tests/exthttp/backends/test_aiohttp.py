@@ -1,9 +1,19 @@
+import json
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import aiohttp
+import pytest
 from aiohttp.test_utils import TestServer
 from multidict import CIMultiDict
 from yarl import URL
 
 from extapi.http.backends.aiohttp import AiohttpExecutor
-from extapi.http.types import RequestData
+from extapi.http.bodies import FileBody, MmapBody, StreamBody
+from extapi.http.codecs.json import StdlibJsonCodec
+from extapi.http.sse import ServerSentEvent
+from extapi.http.types import BodyTooLargeError, RequestData
 
 
 class TestAiohttpBackend:
@@ -105,3 +115,351 @@ class TestAiohttpBackend:
             async with response:
                 assert response.headers["X-Test-Header-1"] == "one"
                 assert response.headers["X-Test-Header-2"] == "two"
+
+    async def test_repeated_headers(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/get"),
+                headers=CIMultiDict([("X-Multi", "one"), ("X-Multi", "two")]),
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert response.headers.getall("X-Multi") == ["one", "two"]
+                # converted once, on first access
+                assert response.headers is response.headers
+
+    async def test_iter_chunks(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/stream"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                chunks = [chunk async for chunk in response.iter_chunks(4)]
+                assert b"".join(chunks) == b"line-0\nline-1\nline-2\n"
+                assert all(len(chunk) <= 4 for chunk in chunks)
+
+    async def test_iter_chunks_supplied(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/stream"),
+                auto_read_body=True,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                chunks = [chunk async for chunk in response.iter_chunks(4)]
+                assert b"".join(chunks) == b"line-0\nline-1\nline-2\n"
+
+    async def test_iter_lines(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/stream"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                lines = [line async for line in response.iter_lines()]
+                assert lines == [b"line-0", b"line-1", b"line-2"]
+
+    async def test_json_codec(self, dummy_server: TestServer, mocker):
+        codec = StdlibJsonCodec()
+        encode = mocker.spy(StdlibJsonCodec, "encode")
+        decode = mocker.spy(StdlibJsonCodec, "decode")
+
+        async with AiohttpExecutor(json_codec=codec) as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/echo"),
+                json={"key": "значение"},
+            )
+
+            for _ in range(2):
+                response = await executor.execute(request)
+                async with response:
+                    assert await response.json() == {
+                        "content_type": "application/json",
+                        "body": {"key": "значение"},
+                    }
+
+        # the request body is encoded once for both attempts
+        assert encode.call_count == 1
+        assert decode.call_count == 2
+
+    async def test_buffered_response(self, mocker):
+        decode = mocker.spy(StdlibJsonCodec, "decode")
+        request = RequestData(method="GET", url=URL("https://example.com/items"))
+
+        async with AiohttpExecutor(json_codec=StdlibJsonCodec()) as executor:
+            response = executor.buffered_response(
+                request,
+                status=200,
+                headers=CIMultiDict({"Content-Type": "application/json"}),
+                body=memoryview(b'{"key": "value"}'),
+            )
+            assert await response.json() == {"key": "value"}
+            assert await response.decode(dict[str, str]) == {"key": "value"}
+            assert decode.call_count == 2
+            assert response.headers["Content-Type"] == "application/json"
+
+            response = executor.buffered_response(
+                request,
+                status=200,
+                headers=CIMultiDict(
+                    {"Content-Type": "application/json; charset=cp1251"}
+                ),
+                body='["значение"]'.encode("cp1251"),
+            )
+            assert await response.json(loads=lambda s: json.loads(s)) == ["значение"]
+
+            response = executor.buffered_response(
+                request, status=200, headers=CIMultiDict(), body=b"[]"
+            )
+            with pytest.raises(aiohttp.ContentTypeError) as e:
+                await response.json()
+            assert e.value.request_info.url == request.url
+
+    async def test_json_codec_keeps_content_type(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/echo"),
+                headers=CIMultiDict({"Content-Type": "application/vnd.api+json"}),
+                json=[1, 2],
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert await response.json() == {
+                    "content_type": "application/vnd.api+json",
+                    "body": [1, 2],
+                }
+
+    async def test_json_unexpected_content_type(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/stream"),
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                with pytest.raises(aiohttp.ContentTypeError):
+                    await response.json()
+
+    async def test_decode(self, dummy_server: TestServer):
+        async with AiohttpExecutor(json_codec=StdlibJsonCodec()) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/get"),
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert await response.decode(dict[str, str]) == {"status": "ok"}
+
+    async def test_iter_ndjson(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/ndjson"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                items = [item async for item in response.iter_ndjson()]
+                assert items == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+    async def test_iter_sse(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/events"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                events = [event async for event in response.iter_sse()]
+                assert events == [ServerSentEvent(data="event 1", id="1", retry=0)]
+
+    @pytest.mark.parametrize("body_type", [FileBody, MmapBody])
+    async def test_replayable_body(
+        self,
+        dummy_server: TestServer,
+        tmp_path,
+        body_type: type[FileBody | MmapBody],
+    ):
+        path = tmp_path / "upload.txt"
+        path.write_bytes(b"x" * 1000)
+
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/upload"),
+                data=body_type(path, chunk_size=300, content_type="text/plain"),
+            )
+
+            for _ in range(2):
+                response = await executor.execute(request)
+                async with response:
+                    assert await response.json() == {
+                        "body": "x" * 1000,
+                        "content_type": "text/plain",
+                        "content_length": 1000,
+                        "chunked": False,
+                    }
+
+    async def test_replayable_body_unknown_size(self, dummy_server: TestServer):
+        async def chunks() -> AsyncIterator[bytes]:
+            yield b"one,"
+            yield b"two"
+
+        async with AiohttpExecutor() as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/upload"),
+                data=StreamBody(chunks),
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert await response.json() == {
+                    "body": "one,two",
+                    "content_type": "application/octet-stream",
+                    "content_length": None,
+                    "chunked": True,
+                }
+
+    async def test_decode_pool(self, dummy_server: TestServer, mocker):
+        with ThreadPoolExecutor(1) as pool:
+            submit = mocker.spy(pool, "submit")
+            async with AiohttpExecutor(decode_pool=pool, offload_size=10) as executor:
+                request = RequestData(
+                    method="GET",
+                    url=URL(f"http://localhost:{dummy_server.port}/get"),
+                )
+
+                response = await executor.execute(request)
+                async with response:
+                    assert await response.json() == {"status": "ok"}
+                    assert await response.decode(dict[str, str]) == {"status": "ok"}
+
+        assert submit.call_count == 2
+
+    async def test_max_body_size(self, dummy_server: TestServer):
+        async with AiohttpExecutor(max_body_size=1000) as executor:
+            for query in ("size=1000", "size=1000&chunked=1"):
+                response = await executor.execute(
+                    RequestData(
+                        method="GET",
+                        url=URL(
+                            f"http://localhost:{dummy_server.port}/payload?{query}"
+                        ),
+                    )
+                )
+                async with response:
+                    assert await response.read() == b"x" * 1000
+                    assert await response.original.read() == b"x" * 1000
+
+    async def test_max_body_size_content_length(self, dummy_server: TestServer):
+        async with AiohttpExecutor(max_body_size=1000) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/payload?size=1001"),
+            )
+
+            with pytest.raises(BodyTooLargeError) as e:
+                await executor.execute(request)
+            assert e.value.size == 1001
+            assert e.value.max_body_size == 1000
+            assert e.value.url == request.url
+
+    async def test_max_body_size_chunked(self, dummy_server: TestServer):
+        async with AiohttpExecutor(max_body_size=1000) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(
+                    f"http://localhost:{dummy_server.port}/payload?size=5000&chunked=1"
+                ),
+            )
+
+            with pytest.raises(BodyTooLargeError) as e:
+                await executor.execute(request)
+            assert e.value.size is None
+            assert e.value.max_body_size == 1000
+
+    async def test_max_body_size_request(self, dummy_server: TestServer):
+        url = URL(f"http://localhost:{dummy_server.port}/payload?size=5000&chunked=1")
+        async with AiohttpExecutor(max_body_size=1000) as executor:
+            response = await executor.execute(
+                RequestData(method="GET", url=url, max_body_size=5000)
+            )
+            async with response:
+                assert len(await response.read()) == 5000
+
+        async with AiohttpExecutor() as executor:
+            with pytest.raises(BodyTooLargeError):
+                await executor.get(url, max_body_size=4999)
+
+    async def test_max_body_size_streamed(self, dummy_server: TestServer):
+        async with AiohttpExecutor(max_body_size=3000) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(
+                    f"http://localhost:{dummy_server.port}/payload?size=5000&chunked=1"
+                ),
+                auto_read_body=False,
+            )
+
+            received = 0
+            async with await executor.execute(request) as response:
+                with pytest.raises(BodyTooLargeError):
+                    async for chunk in response.iter_chunks(1000):
+                        received += len(chunk)
+            assert received == 3000
+
+    async def test_default_json_codec(self, dummy_server: TestServer):
+        # stdlib json unless a codec is passed: non-str keys and big ints work
+        async with AiohttpExecutor() as executor:
+            response = await executor.post(
+                f"http://localhost:{dummy_server.port}/echo",
+                json={1: "a", "id": 2**70},
+            )
+            async with response:
+                assert await response.json() == {
+                    "content_type": "application/json",
+                    "body": {"1": "a", "id": 2**70},
+                }
+
+    async def test_session_json_serialize(self, dummy_server: TestServer):
+        # without a codec the session encodes request json
+        def serialize(obj: Any) -> str:
+            return json.dumps({**obj, "serialized": True})
+
+        async with AiohttpExecutor(json_serialize=serialize) as executor:
+            response = await executor.post(
+                f"http://localhost:{dummy_server.port}/echo", json={"id": 1}
+            )
+            async with response:
+                assert await response.json() == {
+                    "content_type": "application/json",
+                    "body": {"id": 1, "serialized": True},
+                }
+
+    async def test_json_charset(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as executor:
+            response = await executor.get(
+                f"http://localhost:{dummy_server.port}/latin1"
+            )
+            async with response:
+                assert await response.json() == {"name": "café"}
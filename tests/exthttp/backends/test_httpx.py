@@ -1,9 +1,16 @@
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 from aiohttp.test_utils import TestServer
 from multidict import CIMultiDict
 from yarl import URL
 
 from extapi.http.backends.httpx import HttpxExecutor
-from extapi.http.types import RequestData
+from extapi.http.bodies import FileBody, MmapBody, StreamBody
+from extapi.http.codecs.json import StdlibJsonCodec
+from extapi.http.sse import ServerSentEvent
+from extapi.http.types import BodyTooLargeError, RequestData
 
 
 class TestHttpxBackend:
@@ -76,3 +83,304 @@ class TestHttpxBackend:
             async with response:
                 assert response.headers["X-Test-Header-1"] == "one"
                 assert response.headers["X-Test-Header-2"] == "two"
+
+    async def test_repeated_headers(self, dummy_server: TestServer):
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/get"),
+                headers=CIMultiDict([("X-Multi", "one"), ("X-Multi", "two")]),
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert response.headers.getall("X-Multi") == ["one", "two"]
+                # converted once, on first access
+                assert response.headers is response.headers
+
+    async def test_iter_chunks(self, dummy_server: TestServer):
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/stream"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                chunks = [chunk async for chunk in response.iter_chunks(4)]
+                assert b"".join(chunks) == b"line-0\nline-1\nline-2\n"
+                assert all(len(chunk) <= 4 for chunk in chunks)
+
+    async def test_iter_chunks_supplied(self, dummy_server: TestServer):
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/stream"),
+                auto_read_body=True,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                chunks = [chunk async for chunk in response.iter_chunks(4)]
+                assert b"".join(chunks) == b"line-0\nline-1\nline-2\n"
+
+    async def test_iter_lines(self, dummy_server: TestServer):
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/stream"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                lines = [line async for line in response.iter_lines()]
+                assert lines == [b"line-0", b"line-1", b"line-2"]
+
+    async def test_json_codec(self, dummy_server: TestServer, mocker):
+        codec = StdlibJsonCodec()
+        encode = mocker.spy(StdlibJsonCodec, "encode")
+        decode = mocker.spy(StdlibJsonCodec, "decode")
+
+        async with HttpxExecutor(json_codec=codec) as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/echo"),
+                json={"key": "значение"},
+            )
+
+            for _ in range(2):
+                response = await executor.execute(request)
+                async with response:
+                    assert await response.json() == {
+                        "content_type": "application/json",
+                        "body": {"key": "значение"},
+                    }
+
+        # the request body is encoded once for both attempts
+        assert encode.call_count == 1
+        assert decode.call_count == 2
+
+    async def test_json_codec_keeps_content_type(self, dummy_server: TestServer):
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/echo"),
+                headers=CIMultiDict({"Content-Type": "application/vnd.api+json"}),
+                json=[1, 2],
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert await response.json() == {
+                    "content_type": "application/vnd.api+json",
+                    "body": [1, 2],
+                }
+
+    async def test_decode(self, dummy_server: TestServer):
+        async with HttpxExecutor(json_codec=StdlibJsonCodec()) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/get"),
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert await response.decode(dict[str, str]) == {"status": "ok"}
+
+    async def test_iter_ndjson(self, dummy_server: TestServer):
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/ndjson"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                items = [item async for item in response.iter_ndjson()]
+                assert items == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+    async def test_iter_sse(self, dummy_server: TestServer):
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/events"),
+                auto_read_body=False,
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                events = [event async for event in response.iter_sse()]
+                assert events == [ServerSentEvent(data="event 1", id="1", retry=0)]
+
+    @pytest.mark.parametrize("body_type", [FileBody, MmapBody])
+    async def test_replayable_body(
+        self,
+        dummy_server: TestServer,
+        tmp_path,
+        body_type: type[FileBody | MmapBody],
+    ):
+        path = tmp_path / "upload.txt"
+        path.write_bytes(b"x" * 1000)
+
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/upload"),
+                data=body_type(path, chunk_size=300, content_type="text/plain"),
+            )
+
+            for _ in range(2):
+                response = await executor.execute(request)
+                async with response:
+                    assert await response.json() == {
+                        "body": "x" * 1000,
+                        "content_type": "text/plain",
+                        "content_length": 1000,
+                        "chunked": False,
+                    }
+
+    async def test_replayable_body_unknown_size(self, dummy_server: TestServer):
+        async def chunks() -> AsyncIterator[bytes]:
+            yield b"one,"
+            yield b"two"
+
+        async with HttpxExecutor() as executor:
+            request = RequestData(
+                method="POST",
+                url=URL(f"http://localhost:{dummy_server.port}/upload"),
+                data=StreamBody(chunks),
+            )
+
+            response = await executor.execute(request)
+            async with response:
+                assert await response.json() == {
+                    "body": "one,two",
+                    "content_type": "application/octet-stream",
+                    "content_length": None,
+                    "chunked": True,
+                }
+
+    async def test_decode_pool(self, dummy_server: TestServer, mocker):
+        with ThreadPoolExecutor(1) as pool:
+            submit = mocker.spy(pool, "submit")
+            async with HttpxExecutor(decode_pool=pool, offload_size=10) as executor:
+                request = RequestData(
+                    method="GET",
+                    url=URL(f"http://localhost:{dummy_server.port}/get"),
+                )
+
+                response = await executor.execute(request)
+                async with response:
+                    assert await response.json() == {"status": "ok"}
+                    assert await response.decode(dict[str, str]) == {"status": "ok"}
+
+        assert submit.call_count == 2
+
+    async def test_buffered_response(self, mocker):
+        decode = mocker.spy(StdlibJsonCodec, "decode")
+        request = RequestData(method="GET", url=URL("https://example.com/items"))
+
+        with ThreadPoolExecutor(1) as pool:
+            submit = mocker.spy(pool, "submit")
+            async with HttpxExecutor(
+                json_codec=StdlibJsonCodec(), decode_pool=pool, offload_size=10
+            ) as executor:
+                response = executor.buffered_response(
+                    request,
+                    status=200,
+                    headers=CIMultiDict({"Content-Type": "application/json"}),
+                    body=b'{"status": "ok"}',
+                )
+                assert await response.json() == {"status": "ok"}
+                assert await response.decode(dict[str, str]) == {"status": "ok"}
+
+        assert decode.call_count == 2
+        assert submit.call_count == 2
+
+    async def test_max_body_size(self, dummy_server: TestServer):
+        async with HttpxExecutor(max_body_size=1000) as executor:
+            for query in ("size=1000", "size=1000&chunked=1"):
+                response = await executor.execute(
+                    RequestData(
+                        method="GET",
+                        url=URL(
+                            f"http://localhost:{dummy_server.port}/payload?{query}"
+                        ),
+                    )
+                )
+                async with response:
+                    assert await response.read() == b"x" * 1000
+                    assert response.original.content == b"x" * 1000
+
+    async def test_max_body_size_content_length(self, dummy_server: TestServer):
+        async with HttpxExecutor(max_body_size=1000) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/payload?size=1001"),
+            )
+
+            with pytest.raises(BodyTooLargeError) as e:
+                await executor.execute(request)
+            assert e.value.size == 1001
+            assert e.value.max_body_size == 1000
+            assert e.value.url == request.url
+
+    async def test_max_body_size_chunked(self, dummy_server: TestServer):
+        async with HttpxExecutor(max_body_size=1000) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(
+                    f"http://localhost:{dummy_server.port}/payload?size=5000&chunked=1"
+                ),
+            )
+
+            with pytest.raises(BodyTooLargeError) as e:
+                await executor.execute(request)
+            assert e.value.size is None
+            assert e.value.max_body_size == 1000
+
+    async def test_max_body_size_request(self, dummy_server: TestServer):
+        url = URL(f"http://localhost:{dummy_server.port}/payload?size=5000&chunked=1")
+        async with HttpxExecutor(max_body_size=1000) as executor:
+            response = await executor.execute(
+                RequestData(method="GET", url=url, max_body_size=5000)
+            )
+            async with response:
+                assert len(await response.read()) == 5000
+
+        async with HttpxExecutor() as executor:
+            with pytest.raises(BodyTooLargeError):
+                await executor.get(url, max_body_size=4999)
+
+    async def test_max_body_size_streamed(self, dummy_server: TestServer):
+        async with HttpxExecutor(max_body_size=3000) as executor:
+            request = RequestData(
+                method="GET",
+                url=URL(
+                    f"http://localhost:{dummy_server.port}/payload?size=5000&chunked=1"
+                ),
+                auto_read_body=False,
+            )
+
+            received = 0
+            async with await executor.execute(request) as response:
+                with pytest.raises(BodyTooLargeError):
+                    async for chunk in response.iter_chunks(1000):
+                        received += len(chunk)
+            assert received == 3000
+
+    async def test_default_json_codec(self, dummy_server: TestServer):
+        # stdlib json unless a codec is passed: non-str keys and big ints work
+        async with HttpxExecutor() as executor:
+            response = await executor.post(
+                f"http://localhost:{dummy_server.port}/echo",
+                json={1: "a", "id": 2**70},
+            )
+            async with response:
+                assert await response.json() == {
+                    "content_type": "application/json",
+                    "body": {"1": "a", "id": 2**70},
+                }
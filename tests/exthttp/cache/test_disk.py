@@ -0,0 +1,203 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from multidict import CIMultiDict
+from pytest_mock.plugin import MockerFixture
+from yarl import URL
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.cache.disk import DiskCacheStore
+from extapi.http.cache.types import CacheEntry
+from extapi.http.executors.cache import CachingExecutor
+from extapi.http.types import RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+def _entry(body: bytes = b"body") -> CacheEntry:
+    return CacheEntry(
+        status=200,
+        headers=[("Content-Type", "application/json"), ("X-Multi", "1")],
+        body=body,
+        stored_at=1.0,
+        expires_at=2.0,
+        vary=(("accept", "*/*"),),
+        stale_while_revalidate=3.0,
+        stale_if_error=4.0,
+    )
+
+
+def _bodies(path: Path) -> list[str]:
+    return sorted(os.listdir(path / "bodies"))
+
+
+def _accessed_at(path: Path, key: str) -> float:
+    with closing(sqlite3.connect(path / "index.sqlite")) as db:
+        row = db.execute(
+            "SELECT accessed_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+    return row[0]
+
+
+class TestDiskCacheStore:
+    async def test_get_set(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path)
+        assert await store.get("a") is None
+
+        await store.set("a", _entry())
+        entry = await store.get("a")
+
+        assert entry is not None
+        assert isinstance(entry.body, memoryview)
+        assert entry.body == b"body"
+        assert entry == _entry(bytes(entry.body))
+        assert await store.get_size() == 4
+
+    async def test_persistent_and_shared(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path)
+        await store.set("a", _entry())
+        store.close()
+
+        other = DiskCacheStore(tmp_path)
+        entry = await other.get("a")
+        assert entry is not None
+        assert entry.body == b"body"
+
+        await other.set("b", _entry(b"other"))
+        entry = await store.get("b")
+        assert entry is not None
+        assert entry.body == b"other"
+
+    async def test_reconnect_after_fork(self, tmp_path: Path, mocker: MockerFixture):
+        store = DiskCacheStore(tmp_path)
+        await store.set("a", _entry())
+        old_db = store._db
+
+        mocker.patch("extapi.http.cache.disk.os.getpid", return_value=-1)
+        assert await store.get("a") is not None
+        assert store._pid == -1
+        assert store._db is not old_db
+
+    async def test_empty_body(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path)
+        await store.set("a", _entry(b""))
+
+        entry = await store.get("a")
+        assert entry is not None
+        assert entry.body == b""
+
+    async def test_replace_and_delete(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path)
+        await store.set("a", _entry(b"one"))
+        entry = await store.get("a")
+        await store.set("a", _entry(b"two"))
+
+        assert len(_bodies(tmp_path)) == 1
+        # an already returned body stays valid
+        assert entry is not None
+        assert entry.body == b"one"
+        replaced = await store.get("a")
+        assert replaced is not None
+        assert replaced.body == b"two"
+
+        await store.delete("a")
+        assert await store.get("a") is None
+        assert _bodies(tmp_path) == []
+
+    async def test_evicts_least_recently_used(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path, max_size=25, touch_interval=0)
+        await store.set("a", _entry(b"x" * 10))
+        await store.set("b", _entry(b"x" * 10))
+        await store.get("a")
+
+        await store.set("c", _entry(b"x" * 10))
+
+        assert await store.get("b") is None
+        assert await store.get("a") is not None
+        assert await store.get("c") is not None
+        assert await store.get_size() == 20
+        assert len(_bodies(tmp_path)) == 2
+
+    async def test_touch_interval(self, tmp_path: Path, mocker: MockerFixture):
+        store = DiskCacheStore(tmp_path, touch_interval=60)
+        await store.set("a", _entry())
+        stored_at = _accessed_at(tmp_path, "a")
+
+        now = time.time()
+        mocker.patch("extapi.http.cache.disk.time.time", return_value=now + 30)
+        assert await store.get("a") is not None
+        assert _accessed_at(tmp_path, "a") == stored_at
+
+        mocker.patch("extapi.http.cache.disk.time.time", return_value=now + 61)
+        assert await store.get("a") is not None
+        assert _accessed_at(tmp_path, "a") == now + 61
+
+    async def test_too_large_not_stored(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path, max_size=10)
+        await store.set("a", _entry(b"x" * 5))
+        await store.set("a", _entry(b"x" * 100))
+
+        assert await store.get("a") is None
+        assert _bodies(tmp_path) == []
+
+    async def test_missing_body_is_miss(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path)
+        await store.set("a", _entry())
+        for name in _bodies(tmp_path):
+            os.unlink(tmp_path / "bodies" / name)
+
+        assert await store.get("a") is None
+
+    async def test_garbage_collected(self, tmp_path: Path):
+        store = DiskCacheStore(tmp_path)
+        await store.set("a", _entry())
+        store.close()
+
+        # left by a crash before the index was updated
+        old = time.time() - 7200
+        for name in ("orphan", "torn.tmp", "fresh.tmp"):
+            (tmp_path / "bodies" / name).write_bytes(b"x")
+            if name != "fresh.tmp":
+                os.utime(tmp_path / "bodies" / name, (old, old))
+
+        store = DiskCacheStore(tmp_path)
+        assert await store.get("a") is not None
+        assert len(_bodies(tmp_path)) == 2
+        assert "fresh.tmp" in _bodies(tmp_path)
+
+
+class _Origin(AbstractExecutor[Any]):
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        self.calls += 1
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=200,
+            headers=CIMultiDict({"Cache-Control": "max-age=60"}),
+            backend_response=DummyBackendResponse(b'{"items": [1, 2, 3]}'),
+        )
+
+
+async def test_caching_executor_survives_restart(tmp_path: Path):
+    url = URL("https://example.com/catalog")
+    origin = _Origin()
+
+    executor = CachingExecutor(origin, store=DiskCacheStore(tmp_path))
+    await executor.get(url)
+
+    executor = CachingExecutor(origin, store=DiskCacheStore(tmp_path))
+    response = await executor.get(url)
+
+    assert origin.calls == 1
+    assert [chunk async for chunk in response.iter_chunks(8)] == [
+        b'{"items"',
+        b": [1, 2,",
+        b" 3]}",
+    ]
+    assert await response.json() == {"items": [1, 2, 3]}
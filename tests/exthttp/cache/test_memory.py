@@ -0,0 +1,53 @@
+from extapi.http.cache.memory import MemoryCacheStore
+from extapi.http.cache.types import CacheEntry
+
+
+def _entry(size: int) -> CacheEntry:
+    return CacheEntry(
+        status=200, headers=[], body=b"x" * size, stored_at=0, expires_at=0
+    )
+
+
+class TestMemoryCacheStore:
+    async def test_get_set_delete(self):
+        store = MemoryCacheStore()
+        entry = _entry(10)
+
+        assert await store.get("a") is None
+        await store.set("a", entry)
+        assert await store.get("a") is entry
+        assert store.size == 11
+
+        await store.delete("a")
+        assert await store.get("a") is None
+        assert store.size == 0
+
+    async def test_replace(self):
+        store = MemoryCacheStore()
+        await store.set("a", _entry(10))
+        await store.set("a", _entry(20))
+
+        assert len(store) == 1
+        assert store.size == 21
+
+    async def test_evicts_least_recently_used(self):
+        store = MemoryCacheStore(max_size=35)
+        await store.set("a", _entry(10))
+        await store.set("b", _entry(10))
+        await store.set("c", _entry(10))
+        await store.get("a")
+
+        await store.set("d", _entry(10))
+
+        assert await store.get("b") is None
+        assert await store.get("a") is not None
+        assert await store.get("c") is not None
+        assert await store.get("d") is not None
+        assert store.size == 33
+
+    async def test_too_large_not_stored(self):
+        store = MemoryCacheStore(max_size=10)
+        await store.set("a", _entry(100))
+
+        assert await store.get("a") is None
+        assert store.size == 0
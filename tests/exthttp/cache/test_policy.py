@@ -0,0 +1,84 @@
+import pytest
+from multidict import CIMultiDict
+from yarl import URL
+
+from extapi.http.cache.policy import (
+    freshness_lifetime,
+    make_key,
+    merge_not_modified,
+    parse_cache_control,
+    vary_values,
+)
+from extapi.http.types import RequestData
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('public, Max-Age=60, no-cache="Set-Cookie"') == {
+        "public": None,
+        "max-age": "60",
+        "no-cache": "Set-Cookie",
+    }
+    assert parse_cache_control(None) == {}
+
+
+def test_make_key():
+    request = RequestData(
+        method="get",
+        url=URL("https://example.com/items?a=1"),
+        params={"c": 3, "b": [1, 2]},
+    )
+    assert make_key(request) == "GET https://example.com/items?a=1&b=1&b=2&c=3"
+
+
+def test_vary_values():
+    headers = CIMultiDict({"Accept-Language": "en"})
+    assert vary_values(None, headers) == ()
+    assert vary_values("Accept-Language, Accept", headers) == (
+        ("accept-language", "en"),
+        ("accept", ""),
+    )
+    assert vary_values("*", headers) is None
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({}, None),
+        ({"Cache-Control": "max-age=60"}, 60),
+        ({"Cache-Control": "no-cache, max-age=60"}, 0),
+        (
+            {
+                "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+                "Expires": "Mon, 01 Jan 2024 00:02:00 GMT",
+            },
+            120,
+        ),
+        ({"Expires": "0"}, 0),
+        # relative to the receive time without a valid Date
+        ({"Expires": "Mon, 01 Jan 2024 00:02:00 GMT"}, 60),
+        (
+            {"Date": "invalid", "Expires": "Mon, 01 Jan 2024 00:02:00 GMT"},
+            60,
+        ),
+    ],
+)
+def test_freshness_lifetime(headers: dict[str, str], expected: float | None):
+    headers_ = CIMultiDict(headers)
+    cache_control = parse_cache_control(headers_.get("Cache-Control"))
+    now = 1704067260.0  # Mon, 01 Jan 2024 00:01:00 GMT
+    assert freshness_lifetime(headers_, cache_control, now=now) == expected
+
+
+def test_freshness_lifetime_without_date():
+    headers = CIMultiDict({"Expires": "Thu, 01 Jan 2099 00:00:00 GMT"})
+    lifetime = freshness_lifetime(headers, {})
+    assert lifetime is not None
+    assert lifetime > 365 * 24 * 3600
+
+
+def test_merge_not_modified():
+    stored = [("ETag", '"1"'), ("Content-Length", "10"), ("X-Other", "a")]
+    merged = merge_not_modified(
+        stored, CIMultiDict({"etag": '"2"', "Content-Length": "0"})
+    )
+    assert merged == [("Content-Length", "10"), ("X-Other", "a"), ("etag", '"2"')]
@@ -0,0 +1,96 @@
+import dataclasses
+import json
+import pickle
+from typing import Any
+
+import pytest
+
+from extapi._meta import has_msgspec, has_orjson
+from extapi.http.codecs.json import (
+    JsonCodec,
+    StdlibJsonCodec,
+    get_default_json_codec,
+)
+
+
+def _codecs() -> list[JsonCodec]:
+    codecs: list[JsonCodec] = [StdlibJsonCodec()]
+    if has_orjson:
+        from extapi.http.codecs.orjson import OrjsonCodec
+
+        codecs.append(OrjsonCodec())
+    if has_msgspec:
+        from extapi.http.codecs.msgspec import MsgspecJsonCodec
+
+        codecs.append(MsgspecJsonCodec())
+    return codecs
+
+
+@dataclasses.dataclass
+class Item:
+    id: int
+    name: str
+
+
+class TestJsonCodecs:
+    @pytest.mark.parametrize("codec", _codecs(), ids=lambda c: type(c).__name__)
+    def test_roundtrip(self, codec: JsonCodec):
+        obj = {"key": "значение", "items": [1, 2.5, None, True]}
+
+        data = codec.encode(obj)
+        assert isinstance(data, bytes)
+        assert codec.decode(data) == obj
+        assert isinstance(codec, JsonCodec)
+
+    @pytest.mark.parametrize("codec", _codecs(), ids=lambda c: type(c).__name__)
+    def test_pickle(self, codec: JsonCodec):
+        # one instance per settings in a process (e.g. a process pool worker)
+        restored = pickle.loads(pickle.dumps(codec))
+        assert type(restored) is type(codec)
+        assert restored is pickle.loads(pickle.dumps(codec))
+        assert restored.decode(codec.encode({"a": 1})) == {"a": 1}
+
+    @pytest.mark.parametrize("obj", [{"a": [1, 2]}, {"a": "\u00e9"}, "\ud800"])
+    def test_stdlib_as_json_dumps(self, obj: Any):
+        assert StdlibJsonCodec().encode(obj) == json.dumps(obj).encode()
+
+    def test_default_codec(self):
+        # faster codecs are opt-in even when installed
+        codec = get_default_json_codec()
+        assert codec is get_default_json_codec()
+        assert isinstance(codec, StdlibJsonCodec)
+        assert codec.encode({1: "a"}) == b'{"1": "a"}'
+        assert codec.decode(b"1180591620717411303424") == 2**70
+
+    @pytest.mark.skipif(not has_orjson, reason="orjson is not installed")
+    def test_orjson_option(self):
+        import orjson
+
+        from extapi.http.codecs.orjson import OrjsonCodec
+
+        codec = OrjsonCodec(option=orjson.OPT_NON_STR_KEYS)
+        assert codec.encode({1: "one"}) == b'{"1":"one"}'
+
+    @pytest.mark.skipif(not has_msgspec, reason="msgspec is not installed")
+    def test_msgspec_decode_as(self):
+        import msgspec
+
+        from extapi.http.codecs.msgspec import MsgspecJsonCodec
+
+        class Struct(msgspec.Struct):
+            id: int
+            tags: list[str]
+
+        codec = MsgspecJsonCodec()
+
+        assert codec.decode_as(b'{"id": 1, "tags": ["a"]}', Struct) == Struct(
+            id=1, tags=["a"]
+        )
+        assert codec.decode_as(b'[{"id": 1, "name": "one"}]', list[Item]) == [
+            Item(id=1, name="one")
+        ]
+        # decoders are built once per type
+        assert set(codec._typed_decoders) == {Struct, list[Item]}
+
+        with pytest.raises(msgspec.ValidationError):
+            codec.decode_as(b'{"id": "1", "tags": []}', Struct)
@@ -0,0 +1,162 @@
+import dataclasses
+from typing import Any, Optional
+
+import pytest
+
+from extapi._meta import has_msgspec
+from extapi.http.codecs.json import StdlibJsonCodec
+from extapi.http.codecs.models import (
+    _CACHE_SIZE,
+    _build_converter,
+    _build_decoder,
+    _build_model_converter,
+    model_converter,
+    model_decoder,
+)
+
+
+@dataclasses.dataclass
+class Item:
+    id: int
+    name: str
+    tags: list[str] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class Node:
+    item: Item
+    parent: Optional["Node"] = None
+    children: list["Node"] = dataclasses.field(default_factory=list)
+    extra: dict[str, Item] = dataclasses.field(default_factory=dict)
+
+
+class PydanticLike:
+    def __init__(self, value: Any):
+        self.value = value
+
+    @classmethod
+    def model_validate(cls, obj: Any) -> "PydanticLike":
+        return cls(obj)
+
+    @classmethod
+    def model_validate_json(cls, data: bytes) -> "PydanticLike":
+        return cls(data)
+
+
+NODE_JSON = (
+    b'{"item": {"id": 1, "name": "root"}, "children": ['
+    b'{"item": {"id": 2, "name": "child", "tags": ["a"]}, '
+    b'"parent": {"item": {"id": 1, "name": "root"}}, '
+    b'"extra": {"x": {"id": 3, "name": "extra"}}}]}'
+)
+NODE = Node(
+    item=Item(id=1, name="root"),
+    children=[
+        Node(
+            item=Item(id=2, name="child", tags=["a"]),
+            parent=Node(item=Item(id=1, name="root")),
+            extra={"x": Item(id=3, name="extra")},
+        )
+    ],
+)
+
+
+class TestModelDecoder:
+    def test_decode(self):
+        codec = StdlibJsonCodec()
+        decoder = model_decoder(Node, codec)
+
+        assert decoder(NODE_JSON) == NODE
+        assert model_decoder(Node, codec) is decoder
+
+    def test_decode_list(self):
+        decoder = model_decoder(list[Item], StdlibJsonCodec())
+        assert decoder(b'[{"id": 1, "name": "one"}]') == [Item(id=1, name="one")]
+
+    def test_pydantic(self):
+        decoder = model_decoder(PydanticLike, StdlibJsonCodec())
+        assert decoder(b"[1]").value == b"[1]"
+        assert model_converter(PydanticLike)([1]).value == [1]
+
+    @pytest.mark.skipif(not has_msgspec, reason="msgspec is not installed")
+    def test_msgspec_codec(self):
+        import msgspec
+
+        from extapi.http.codecs.msgspec import MsgspecJsonCodec
+
+        class Struct(msgspec.Struct):
+            id: int
+
+        codec = MsgspecJsonCodec()
+        assert model_decoder(list[Struct], codec)(b'[{"id": 1}]') == [Struct(id=1)]
+        assert list(codec._typed_decoders) == [list[Struct]]
+
+    @pytest.mark.parametrize("msgspec_installed", [False, has_msgspec])
+    def test_codec_decides_validation(self, mocker, msgspec_installed: bool):
+        mocker.patch("extapi.http.codecs.models.has_msgspec", msgspec_installed)
+        _build_decoder.cache_clear()
+        _build_model_converter.cache_clear()
+
+        decoder = model_decoder(Node, StdlibJsonCodec())
+        assert decoder(NODE_JSON) == NODE
+        # values are taken as is whether msgspec is installed or not
+        assert decoder(b'{"item": {"id": "1", "name": 2}}') == Node(
+            item=Item(id="1", name=2)  # type: ignore[arg-type]
+        )
+
+    @pytest.mark.skipif(not has_msgspec, reason="msgspec is not installed")
+    def test_msgspec_codec_validates(self):
+        import msgspec
+
+        from extapi.http.codecs.msgspec import MsgspecJsonCodec
+
+        decoder = model_decoder(Node, MsgspecJsonCodec())
+        assert decoder(NODE_JSON) == NODE
+        with pytest.raises(msgspec.ValidationError):
+            decoder(b'{"item": {"id": "1", "name": 2}}')
+
+    def test_cache_bounded(self):
+        _build_decoder.cache_clear()
+        codec = StdlibJsonCodec()
+        for i in range(_CACHE_SIZE * 2):
+            model_decoder(type(f"Model{i}", (), {}), codec)
+
+        assert _build_decoder.cache_info().currsize == _CACHE_SIZE
+
+
+class TestConverter:
+    def test_model_converter(self):
+        converter = model_converter(list[Item])
+
+        assert converter([{"id": 1, "name": "one"}]) == [Item(id=1, name="one")]
+        assert model_converter(list[Item]) is converter
+
+    @pytest.mark.parametrize(
+        "type_, obj, expected",
+        [
+            (Node, {"item": {"id": 1, "name": "x"}}, Node(item=Item(id=1, name="x"))),
+            (list[int], [1, 2], [1, 2]),
+            (tuple[Item, ...], [{"id": 1, "name": "x"}], (Item(id=1, name="x"),)),
+            (tuple[int, str], [1, "a"], [1, "a"]),
+            (dict[str, int], {"a": 1}, {"a": 1}),
+            (Item | None, None, None),
+            (Optional[int], 1, 1),
+            (int | str, 1, 1),
+            (str, "s", "s"),
+        ],
+    )
+    def test_fallback(self, type_: Any, obj: Any, expected: Any):
+        assert _build_converter(type_)(obj) == expected
+
+    @pytest.mark.skipif(not has_msgspec, reason="msgspec is not installed")
+    def test_struct(self):
+        import msgspec
+
+        class Struct(msgspec.Struct):
+            id: int
+
+        converter = _build_converter(list[Struct])
+        assert converter([{"id": 1}]) == [Struct(id=1)]
+
+    def test_fallback_pydantic(self):
+        assert _build_converter(PydanticLike)(1).value == 1
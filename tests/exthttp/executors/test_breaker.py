@@ -0,0 +1,272 @@
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+from yarl import URL
+
+from extapi._meta import has_prometheus
+from extapi.http.abc import AbstractExecutor, Addon
+from extapi.http.executors.breaker import (
+    CircuitBreakerExecutor,
+    CircuitState,
+    host_key,
+    route_key,
+)
+from extapi.http.executors.retry import RetryableExecutor
+from extapi.http.types import CircuitOpenError, RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+class _SwitchExecutor(AbstractExecutor[Any]):
+    def __init__(self, result: int | Exception = 200, delay: float = 0):
+        self.result = result
+        self.delay = delay
+        self.call_count = 0
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        self.call_count += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=self.result,
+            backend_response=DummyBackendResponse(),
+        )
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture) -> list[float]:
+    # time.monotonic is patched globally, so it keeps running for the event loop
+    offset = [0.0]
+    monotonic = time.monotonic
+    mocker.patch("time.monotonic", side_effect=lambda: monotonic() + offset[0])
+    return offset
+
+
+async def _call(executor: AbstractExecutor[Any], request: RequestData) -> Any:
+    try:
+        return await executor.execute(request)
+    except Exception as e:
+        return e
+
+
+class TestCircuitBreakerExecutor:
+    async def test_closed(self, request_simple: RequestData):
+        base = _SwitchExecutor(200)
+        executor = CircuitBreakerExecutor(base, min_calls=2)
+
+        for _ in range(10):
+            response = await executor.execute(request_simple)
+            assert response.status == 200
+
+        assert executor.state(host_key(request_simple)) is CircuitState.CLOSED
+
+    async def test_opens_on_failure_rate(self, request_simple: RequestData, clock):
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(base, min_calls=4, failure_rate_threshold=0.5)
+
+        for _ in range(4):
+            response = await executor.execute(request_simple)
+            assert response.status == 500
+
+        assert executor.state(host_key(request_simple)) is CircuitState.OPEN
+
+        with pytest.raises(CircuitOpenError) as err:
+            await executor.execute(request_simple)
+
+        assert err.value.retry_after == pytest.approx(30, abs=0.1)
+        assert base.call_count == 4
+
+    async def test_opens_on_errors(self, request_simple: RequestData, clock):
+        base = _SwitchExecutor(ConnectionError())
+        executor = CircuitBreakerExecutor(base, min_calls=2)
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await executor.execute(request_simple)
+
+        with pytest.raises(CircuitOpenError):
+            await executor.execute(request_simple)
+
+    async def test_opens_on_slow_calls(self, request_simple: RequestData):
+        base = _SwitchExecutor(200, delay=0.02)
+        executor = CircuitBreakerExecutor(
+            base, min_calls=2, slow_call_duration=0.01, slow_call_rate_threshold=1.0
+        )
+
+        await executor.execute(request_simple)
+        await executor.execute(request_simple)
+
+        assert executor.state(host_key(request_simple)) is CircuitState.OPEN
+
+    async def test_failures_expire(self, request_simple: RequestData, clock):
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(base, min_calls=2, window_seconds=10)
+
+        await executor.execute(request_simple)
+        clock[0] += 11
+        await executor.execute(request_simple)
+
+        assert executor.state(host_key(request_simple)) is CircuitState.CLOSED
+
+    async def test_half_open_closes(self, request_simple: RequestData, clock):
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(
+            base, min_calls=1, open_seconds=5, half_open_max_calls=2
+        )
+        key = host_key(request_simple)
+
+        await executor.execute(request_simple)
+        assert executor.state(key) is CircuitState.OPEN
+
+        clock[0] += 5
+        base.result = 200
+        await executor.execute(request_simple)
+        assert executor.state(key) is CircuitState.HALF_OPEN
+
+        await executor.execute(request_simple)
+        assert executor.state(key) is CircuitState.CLOSED
+
+    async def test_half_open_reopens(self, request_simple: RequestData, clock):
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(base, min_calls=1, open_seconds=5)
+        key = host_key(request_simple)
+
+        await executor.execute(request_simple)
+        clock[0] += 5
+        await executor.execute(request_simple)
+
+        assert executor.state(key) is CircuitState.OPEN
+        assert isinstance(await _call(executor, request_simple), CircuitOpenError)
+
+    async def test_half_open_limits_probes(self, request_simple: RequestData, clock):
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(
+            base, min_calls=1, open_seconds=5, half_open_max_calls=1
+        )
+
+        await executor.execute(request_simple)
+        clock[0] += 5
+
+        base.result = 200
+        base.delay = 0.01
+        results = await asyncio.gather(
+            _call(executor, request_simple), _call(executor, request_simple)
+        )
+
+        assert isinstance(results[0], Response)
+        assert isinstance(results[1], CircuitOpenError)
+        assert executor.state(host_key(request_simple)) is CircuitState.CLOSED
+
+    async def test_keys(self, clock):
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(base, min_calls=1, key=route_key)
+
+        failing = RequestData(method="GET", url=URL("https://example.com/a"))
+        other = RequestData(
+            method="GET",
+            url=URL("https://example.com/b/1"),
+            kwargs={"path_template": "/b/<id>"},
+        )
+
+        await executor.execute(failing)
+        assert executor.state(route_key(failing)) is CircuitState.OPEN
+        assert executor.state(route_key(other)) is CircuitState.CLOSED
+        assert route_key(other) == ("https", "example.com", 443, "/b/<id>")
+
+        # no circuit per resource id without a template
+        by_id = RequestData(method="GET", url=URL("https://example.com/a/2"))
+        assert route_key(by_id) == route_key(failing)
+        assert route_key(by_id) == ("https", "example.com", 443, None)
+
+    @pytest.mark.skipif(not has_prometheus, reason="prometheus is not installed")
+    async def test_keys_with_metrics(self, clock):
+        from prometheus_client import CollectorRegistry
+
+        from extapi.http.executors.metrics import PrometheusMetricsExecutor
+        from extapi.http.metrics.container import MetricsContainer
+
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(
+            PrometheusMetricsExecutor(
+                base,
+                metrics_container=MetricsContainer(
+                    metrics_prefix="breaker_test",
+                    metrics_registry=CollectorRegistry(),
+                ),
+            ),
+            min_calls=2,
+            key=route_key,
+        )
+        request = RequestData(
+            method="GET",
+            url=URL("https://example.com/b/1"),
+            kwargs={"path_template": "/b/<id>"},
+        )
+
+        await executor.execute(request)
+        await executor.execute(request)
+
+        # the template is left for the next attempts
+        assert request.kwargs == {"path_template": "/b/<id>"}
+        assert executor.state(route_key(request)) is CircuitState.OPEN
+        assert executor.circuits == 1
+
+    async def test_max_circuits(self, clock):
+        base = _SwitchExecutor(500)
+        executor = CircuitBreakerExecutor(base, min_calls=1, max_circuits=2)
+
+        def request(host: str) -> RequestData:
+            return RequestData(method="GET", url=URL(f"https://{host}/"))
+
+        await executor.execute(request("open.example.com"))
+        base.result = 200
+        await executor.execute(request("a.example.com"))
+        await executor.execute(request("b.example.com"))
+
+        # the closed circuit is evicted, the open one is kept
+        assert executor.circuits == 2
+        assert (
+            executor.state(host_key(request("open.example.com"))) is CircuitState.OPEN
+        )
+        assert host_key(request("a.example.com")) not in executor._circuits
+
+        await executor.execute(request("c.example.com"))
+        assert executor.circuits == 2
+        assert (
+            executor.state(host_key(request("open.example.com"))) is CircuitState.OPEN
+        )
+
+    async def test_not_retried(self, request_simple: RequestData, clock):
+        base = _SwitchExecutor(500)
+        breaker = CircuitBreakerExecutor(base, min_calls=1)
+        executor = RetryableExecutor(breaker, max_retries=3, retry_sleep_timeout=0)
+
+        with pytest.raises(CircuitOpenError):
+            await executor.execute(request_simple)
+
+        assert base.call_count == 1
+
+    async def test_retry_process_error(self, request_simple: RequestData, clock):
+        errors: list[Exception] = []
+
+        class _Addon(Addon[Any]):
+            async def process_error(
+                self, request: RequestData, error: Exception
+            ) -> None:
+                errors.append(error)
+
+        breaker = CircuitBreakerExecutor(_SwitchExecutor(500), min_calls=1)
+        executor = RetryableExecutor(
+            breaker, retry_sleep_timeout=0, addons=[_Addon()], default_addons=()
+        )
+        await executor.execute(request_simple)
+
+        with pytest.raises(CircuitOpenError) as err:
+            await executor.execute(request_simple)
+        assert errors == [err.value]
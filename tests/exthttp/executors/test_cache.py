@@ -0,0 +1,489 @@
+import asyncio
+import time
+from email.utils import formatdate
+from typing import Any
+
+import pytest
+from multidict import CIMultiDict
+from pytest_mock.plugin import MockerFixture
+from yarl import URL
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.executors.cache import CachingExecutor
+from extapi.http.executors.retry import RetryableExecutor
+from extapi.http.types import ExecuteError, RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+class _OriginExecutor(AbstractExecutor[Any]):
+    # serves `body` with `headers`, answers 304 when the ETag matches
+    def __init__(
+        self,
+        headers: dict[str, str],
+        body: bytes = b'{"v": 1}',
+        auto_read_body: bool = True,
+    ):
+        self.headers = headers
+        self.body = body
+        self.status = 200
+        self.error: Exception | None = None
+        self.delay = 0.0
+        self.requests: list[RequestData] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._auto_read_body = auto_read_body
+
+    @property
+    def auto_read_body(self) -> bool:
+        return self._auto_read_body
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        self.requests.append(request)
+        if self.delay:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+            finally:
+                self.in_flight -= 1
+
+        if self.error is not None:
+            raise self.error
+        etag = self.headers.get("ETag")
+        if (
+            request.method == "GET"
+            and etag is not None
+            and request.headers is not None
+            and request.headers.get("If-None-Match") == etag
+        ):
+            return Response(
+                method=request.method,
+                url=request.url,
+                status=304,
+                headers=CIMultiDict({"ETag": etag, "Cache-Control": "max-age=60"}),
+                backend_response=DummyBackendResponse(),
+            )
+
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=self.status,
+            headers=CIMultiDict(self.headers),
+            backend_response=DummyBackendResponse(self.body),
+        )
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture) -> list[float]:
+    offset = [0.0]
+    now = time.time
+    mocker.patch("time.time", side_effect=lambda: now() + offset[0])
+    return offset
+
+
+def _request(**kwargs) -> RequestData:
+    return RequestData(method="GET", url=URL("https://example.com/catalog"), **kwargs)
+
+
+class TestCachingExecutor:
+    async def test_fresh_hit(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"})
+        executor = CachingExecutor(origin)
+
+        first = await executor.execute(_request())
+        second = await executor.execute(_request())
+
+        assert len(origin.requests) == 1
+        assert executor.hits == 1
+        assert executor.misses == 1
+        assert await first.json() == {"v": 1}
+        assert second.status == 200
+        assert second.headers["Cache-Control"] == "max-age=60"
+        assert await second.read() == b'{"v": 1}'
+        assert await second.json() == {"v": 1}
+
+        clock[0] += 61
+        await executor.execute(_request())
+        assert len(origin.requests) == 2
+
+    async def test_hit_made_by_backend(self, mocker: MockerFixture):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"})
+        buffered_response = mocker.spy(origin, "buffered_response")
+        executor = CachingExecutor(RetryableExecutor(origin))
+
+        await executor.execute(_request())
+        hit = await executor.execute(_request())
+
+        # decoded with the settings of the backend, e.g. its json codec
+        assert buffered_response.call_count == 1
+        assert hit is buffered_response.spy_return
+        assert await hit.json() == {"v": 1}
+
+    async def test_expires_without_date(self, clock: list[float]):
+        expires = formatdate(time.time() + 60, usegmt=True)
+        origin = _OriginExecutor({"Expires": expires})
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request())
+        await executor.execute(_request())
+        assert len(origin.requests) == 1
+
+        clock[0] += 61
+        await executor.execute(_request())
+        assert len(origin.requests) == 2
+
+    async def test_no_store(self):
+        origin = _OriginExecutor({"Cache-Control": "no-store, max-age=60"})
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request())
+        await executor.execute(_request())
+
+        assert len(origin.requests) == 2
+
+    async def test_request_no_store(self):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"})
+        executor = CachingExecutor(origin)
+
+        for _ in range(2):
+            await executor.execute(
+                _request(headers=CIMultiDict({"Cache-Control": "no-store"}))
+            )
+
+        assert len(origin.requests) == 2
+
+    async def test_params_in_key(self):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"})
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request(params={"page": 1}))
+        await executor.execute(_request(params={"page": 2}))
+        await executor.execute(_request(params={"page": 1}))
+
+        assert len(origin.requests) == 2
+
+    async def test_revalidate_etag(self, clock: list[float]):
+        origin = _OriginExecutor({"ETag": '"v1"', "Cache-Control": "no-cache"})
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request())
+        response = await executor.execute(_request())
+
+        assert len(origin.requests) == 2
+        assert origin.requests[1].headers is not None
+        assert origin.requests[1].headers["If-None-Match"] == '"v1"'
+        assert executor.revalidations == 1
+        assert response.status == 200
+        assert await response.json() == {"v": 1}
+
+        # 304 made the entry fresh for max-age=60
+        await executor.execute(_request())
+        assert len(origin.requests) == 2
+        clock[0] += 61
+        await executor.execute(_request())
+        assert len(origin.requests) == 3
+
+    async def test_revalidate_changed(self):
+        origin = _OriginExecutor({"ETag": '"v1"'})
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request())
+        origin.headers = {"ETag": '"v2"'}
+        origin.body = b'{"v": 2}'
+        response = await executor.execute(_request())
+
+        assert await response.json() == {"v": 2}
+        assert executor.revalidations == 0
+        response = await executor.execute(_request())
+        assert await response.json() == {"v": 2}
+        assert executor.revalidations == 1
+
+    async def test_revalidate_last_modified(self):
+        last_modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+        origin = _OriginExecutor({"Last-Modified": last_modified})
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request())
+        await executor.execute(_request())
+
+        assert origin.requests[1].headers is not None
+        assert origin.requests[1].headers["If-Modified-Since"] == last_modified
+
+    async def test_request_headers_not_modified(self):
+        origin = _OriginExecutor({"ETag": '"v1"'})
+        executor = CachingExecutor(origin)
+        request = _request()
+
+        await executor.execute(request)
+        await executor.execute(request)
+
+        assert request.headers is None
+
+    async def test_vary(self):
+        origin = _OriginExecutor(
+            {"Cache-Control": "max-age=60", "Vary": "Accept-Language"}
+        )
+        executor = CachingExecutor(origin)
+
+        def _lang(value: str) -> RequestData:
+            return _request(headers=CIMultiDict({"Accept-Language": value}))
+
+        await executor.execute(_lang("en"))
+        await executor.execute(_lang("en"))
+        assert len(origin.requests) == 1
+
+        await executor.execute(_lang("de"))
+        assert len(origin.requests) == 2
+
+    async def test_uncacheable_status(self):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"})
+        executor = CachingExecutor(origin)
+
+        async def _execute(request: RequestData) -> Response[Any]:
+            origin.requests.append(request)
+            return Response(
+                method=request.method,
+                url=request.url,
+                status=500,
+                headers=CIMultiDict({"Cache-Control": "max-age=60"}),
+                backend_response=DummyBackendResponse(),
+            )
+
+        origin.execute = _execute  # type: ignore[method-assign]
+        await executor.execute(_request())
+        await executor.execute(_request())
+
+        assert len(origin.requests) == 2
+
+    async def test_max_entry_size(self):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"}, body=b"x" * 100)
+        executor = CachingExecutor(origin, max_entry_size=10)
+
+        response = await executor.execute(_request())
+        await executor.execute(_request())
+
+        assert len(origin.requests) == 2
+        assert await response.read() == b"x" * 100
+
+    async def test_streamed_not_cached(self, mocker: MockerFixture):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"})
+        read = mocker.spy(DummyBackendResponse, "read")
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request(auto_read_body=False))
+        await executor.execute(_request(auto_read_body=False))
+        assert len(origin.requests) == 2
+        assert read.call_count == 0
+
+        # the effective setting of the backend counts as well
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"}, auto_read_body=False)
+        executor = CachingExecutor(RetryableExecutor(origin))
+        await executor.execute(_request())
+        await executor.execute(_request())
+        assert len(origin.requests) == 2
+        assert read.call_count == 0
+
+        await executor.execute(_request(auto_read_body=True))
+        await executor.execute(_request())
+        assert len(origin.requests) == 3
+        assert read.call_count == 1
+
+    async def test_unsafe_method_invalidates(self):
+        origin = _OriginExecutor({"Cache-Control": "max-age=60"})
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request())
+        await executor.post(URL("https://example.com/catalog"))
+        await executor.execute(_request())
+
+        assert [r.method for r in origin.requests] == ["GET", "POST", "GET"]
+
+
+async def _wait_refreshes(executor: CachingExecutor) -> None:
+    while executor.background_refreshes:
+        await asyncio.sleep(0.001)
+
+
+class TestStaleModes:
+    async def test_stale_while_revalidate(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10"})
+        executor = CachingExecutor(origin, stale_while_revalidate=60)
+
+        await executor.execute(_request())
+        clock[0] += 11
+        origin.body = b'{"v": 2}'
+
+        response = await executor.execute(_request())
+        assert await response.json() == {"v": 1}
+        assert executor.stale_hits == 1
+        assert executor.background_refreshes == 1
+
+        await _wait_refreshes(executor)
+        response = await executor.execute(_request())
+        assert await response.json() == {"v": 2}
+        assert len(origin.requests) == 2
+        assert executor.hits == 1
+
+        # past the stale window the caller waits for the upstream
+        clock[0] += 100
+        origin.body = b'{"v": 3}'
+        response = await executor.execute(_request())
+        assert await response.json() == {"v": 3}
+
+    async def test_response_directive(self, clock: list[float]):
+        origin = _OriginExecutor(
+            {"Cache-Control": "max-age=10, stale-while-revalidate=30"}
+        )
+        executor = CachingExecutor(origin)
+
+        await executor.execute(_request())
+        clock[0] += 20
+        await executor.execute(_request())
+
+        assert executor.stale_hits == 1
+        await _wait_refreshes(executor)
+
+    async def test_must_revalidate(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10, must-revalidate"})
+        executor = CachingExecutor(origin, stale_while_revalidate=60)
+
+        await executor.execute(_request())
+        clock[0] += 20
+        await executor.execute(_request())
+
+        assert executor.stale_hits == 0
+        assert len(origin.requests) == 2
+
+    async def test_no_cache(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "no-cache", "ETag": '"v1"'})
+        executor = CachingExecutor(origin, stale_while_revalidate=60, stale_if_error=60)
+
+        await executor.execute(_request())
+
+        # not served stale on errors
+        origin.error = ConnectionError()
+        with pytest.raises(ConnectionError):
+            await executor.execute(_request())
+
+        # nor while revalidating
+        origin.error = None
+        response = await executor.execute(_request())
+        assert executor.stale_hits == 0
+        assert executor.revalidations == 1
+        assert await response.json() == {"v": 1}
+
+    async def test_without_cache_headers_errors_not_kept(self, clock: list[float]):
+        origin = _OriginExecutor({})
+        origin.status = 404
+        executor = CachingExecutor(origin, stale_while_revalidate=60, stale_if_error=60)
+
+        await executor.execute(_request())
+        origin.status = 200
+        response = await executor.execute(_request())
+
+        assert response.status == 200
+        assert executor.stale_hits == 0
+        assert len(origin.requests) == 2
+
+    async def test_without_cache_headers(self, clock: list[float]):
+        origin = _OriginExecutor({})
+        executor = CachingExecutor(origin, stale_while_revalidate=60)
+
+        await executor.execute(_request())
+        await executor.execute(_request())
+
+        assert executor.stale_hits == 1
+        await _wait_refreshes(executor)
+        assert len(origin.requests) == 2
+
+    async def test_refresh_deduplicated(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10"})
+        executor = CachingExecutor(origin, stale_while_revalidate=60)
+
+        await executor.execute(_request())
+        clock[0] += 11
+        origin.delay = 0.01
+        for _ in range(5):
+            await executor.execute(_request())
+
+        assert executor.background_refreshes == 1
+        await _wait_refreshes(executor)
+        assert len(origin.requests) == 2
+
+    async def test_refresh_concurrency_bounded(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10"})
+        executor = CachingExecutor(
+            origin, stale_while_revalidate=60, max_background_refreshes=2
+        )
+
+        for page in range(5):
+            await executor.execute(_request(params={"page": page}))
+        clock[0] += 11
+        origin.delay = 0.01
+        for page in range(5):
+            await executor.execute(_request(params={"page": page}))
+
+        assert executor.background_refreshes == 5
+        await _wait_refreshes(executor)
+        assert origin.max_in_flight == 2
+        assert len(origin.requests) == 10
+
+    async def test_close_cancels_refreshes(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10"})
+        executor = CachingExecutor(origin, stale_while_revalidate=60)
+
+        await executor.execute(_request())
+        clock[0] += 11
+        origin.delay = 10
+        await executor.execute(_request())
+        await asyncio.sleep(0)
+
+        await executor.close()
+        assert executor.background_refreshes == 0
+
+    async def test_stale_if_error_exception(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10"})
+        executor = CachingExecutor(origin, stale_if_error=60)
+
+        await executor.execute(_request())
+        clock[0] += 11
+        origin.error = ValueError("boom")
+
+        response = await executor.execute(_request())
+        assert await response.json() == {"v": 1}
+        assert executor.stale_hits == 1
+
+        clock[0] += 60
+        with pytest.raises(ValueError):
+            await executor.execute(_request())
+
+    async def test_stale_if_error_5xx(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10"})
+        executor = CachingExecutor(origin, stale_if_error=60)
+
+        await executor.execute(_request())
+        clock[0] += 11
+        origin.status = 503
+
+        response = await executor.execute(_request())
+        assert response.status == 200
+        assert await response.json() == {"v": 1}
+
+    async def test_stale_if_error_after_retries(self, clock: list[float]):
+        origin = _OriginExecutor({"Cache-Control": "max-age=10"})
+        executor = CachingExecutor(
+            RetryableExecutor(origin, max_retries=2, retry_sleep_timeout=0),
+            stale_if_error=60,
+        )
+
+        await executor.execute(_request())
+        clock[0] += 11
+        origin.error = ConnectionError("down")
+
+        response = await executor.execute(_request())
+        assert await response.json() == {"v": 1}
+        assert len(origin.requests) == 3
+
+        clock[0] += 60
+        with pytest.raises(ExecuteError):
+            await executor.execute(_request())
@@ -0,0 +1,205 @@
+import asyncio
+from typing import Any
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+from multidict import CIMultiDict
+from yarl import URL
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.backends.aiohttp import AiohttpExecutor
+from extapi.http.codecs.json import StdlibJsonCodec
+from extapi.http.executors.coalesce import CoalescingExecutor
+from extapi.http.types import RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+class _SlowExecutor(AbstractExecutor[Any]):
+    def __init__(
+        self,
+        delay: float = 0.05,
+        error: Exception | None = None,
+        auto_read_body: bool = True,
+    ):
+        self.delay = delay
+        self.error = error
+        self._auto_read_body = auto_read_body
+        self.requests: list[RequestData] = []
+        self.cancelled = 0
+        self.closed = 0
+
+    @property
+    def auto_read_body(self) -> bool:
+        return self._auto_read_body
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        self.requests.append(request)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        if self.error is not None:
+            raise self.error
+
+        executor = self
+
+        class _Backend(DummyBackendResponse):
+            async def close(self) -> None:
+                executor.closed += 1
+
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=200,
+            headers=CIMultiDict({"X-Request": str(len(self.requests))}),
+            backend_response=_Backend(b'{"status": "ok"}'),
+        )
+
+
+def _request(method: str = "GET", **kwargs) -> RequestData:
+    return RequestData(method=method, url=URL("https://example.com/items"), **kwargs)
+
+
+class TestCoalescingExecutor:
+    async def test_coalesced(self):
+        upstream = _SlowExecutor()
+        executor = CoalescingExecutor(upstream)
+
+        responses = await asyncio.gather(
+            *(executor.execute(_request()) for _ in range(100))
+        )
+
+        assert len(upstream.requests) == 1
+        assert upstream.closed == 1
+        assert executor.coalesced == 99
+        assert executor.in_flight == 0
+
+        for response in responses:
+            assert response.status == 200
+            assert await response.json() == {"status": "ok"}
+        # one body buffer is shared, headers are not
+        assert (await responses[0].read()) is (await responses[1].read())
+        responses[0].headers["X-Other"] = "1"
+        assert "X-Other" not in responses[1].headers
+
+    async def test_sequential_not_coalesced(self):
+        upstream = _SlowExecutor(delay=0)
+        executor = CoalescingExecutor(upstream)
+
+        await executor.execute(_request())
+        await executor.execute(_request())
+
+        assert len(upstream.requests) == 2
+
+    @pytest.mark.parametrize(
+        "other",
+        [
+            _request(params={"page": 2}),
+            _request(headers=CIMultiDict({"Authorization": "other"})),
+            _request(method="POST"),
+            _request(auto_read_body=False),
+            _request(max_body_size=10),
+        ],
+    )
+    async def test_not_coalesced(self, other: RequestData):
+        upstream = _SlowExecutor()
+        executor = CoalescingExecutor(upstream)
+
+        await asyncio.gather(executor.execute(_request()), executor.execute(other))
+
+        assert len(upstream.requests) == 2
+
+    async def test_streaming_backend_not_coalesced(self):
+        upstream = _SlowExecutor(auto_read_body=False)
+        executor = CoalescingExecutor(upstream)
+
+        await asyncio.gather(executor.execute(_request()), executor.execute(_request()))
+        assert len(upstream.requests) == 2
+        assert upstream.closed == 0
+
+        # the request setting takes precedence
+        await asyncio.gather(
+            executor.execute(_request(auto_read_body=True)),
+            executor.execute(_request(auto_read_body=True)),
+        )
+        assert len(upstream.requests) == 3
+
+    async def test_backend_decoding(self, dummy_server: TestServer, mocker):
+        decode = mocker.spy(StdlibJsonCodec, "decode")
+        async with AiohttpExecutor(json_codec=StdlibJsonCodec()) as upstream:
+            executor = CoalescingExecutor(upstream)
+            url = URL(f"http://localhost:{dummy_server.port}")
+
+            responses = await asyncio.gather(
+                executor.execute(RequestData(method="GET", url=url / "get")),
+                executor.execute(RequestData(method="GET", url=url / "get")),
+            )
+            assert executor.coalesced == 1
+            for response in responses:
+                assert await response.json() == {"status": "ok"}
+            # the followers are decoded by the codec of the backend as well
+            assert decode.call_count == 2
+
+            responses = await asyncio.gather(
+                executor.execute(RequestData(method="GET", url=url / "stream")),
+                executor.execute(RequestData(method="GET", url=url / "stream")),
+            )
+            assert executor.coalesced == 2
+            for response in responses:
+                with pytest.raises(aiohttp.ContentTypeError):
+                    await response.json()
+
+    async def test_custom_key(self):
+        upstream = _SlowExecutor()
+        executor = CoalescingExecutor(upstream, key=lambda request: request.url.host)
+
+        await asyncio.gather(
+            executor.execute(_request(params={"page": 1})),
+            executor.execute(_request(params={"page": 2})),
+        )
+
+        assert len(upstream.requests) == 1
+
+    async def test_error_shared(self):
+        upstream = _SlowExecutor(error=ValueError("boom"))
+        executor = CoalescingExecutor(upstream)
+
+        results = await asyncio.gather(
+            *(executor.execute(_request()) for _ in range(3)), return_exceptions=True
+        )
+
+        assert len(upstream.requests) == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        assert executor.in_flight == 0
+
+    async def test_leader_cancelled(self):
+        upstream = _SlowExecutor()
+        executor = CoalescingExecutor(upstream)
+
+        leader = asyncio.create_task(executor.execute(_request()))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(executor.execute(_request()))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        response = await follower
+        assert response.status == 200
+        assert len(upstream.requests) == 1
+        assert upstream.cancelled == 0
+
+    async def test_all_cancelled(self):
+        upstream = _SlowExecutor()
+        executor = CoalescingExecutor(upstream)
+
+        tasks = [asyncio.create_task(executor.execute(_request())) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert upstream.cancelled == 1
+        assert executor.in_flight == 0
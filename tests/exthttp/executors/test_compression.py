@@ -0,0 +1,203 @@
+import gzip
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from multidict import CIMultiDict
+from yarl import URL
+
+from extapi._meta import has_brotli, has_zstandard
+from extapi.http.abc import AbstractExecutor
+from extapi.http.codecs.json import JsonCodec, StdlibJsonCodec
+from extapi.http.compression import get_compressor
+from extapi.http.executors.compression import CompressionExecutor
+from extapi.http.executors.retry import RetryableExecutor
+from extapi.http.types import RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+class _RecordingExecutor(AbstractExecutor[Any]):
+    def __init__(
+        self,
+        statuses: tuple[int, ...] = (200,),
+        json_codec: JsonCodec | None = None,
+    ):
+        self.statuses = list(statuses)
+        self.requests: list[RequestData] = []
+        self._json_codec = json_codec
+
+    @property
+    def json_codec(self) -> JsonCodec:
+        return self._json_codec or super().json_codec
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        self.requests.append(request)
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0],
+            backend_response=DummyBackendResponse(),
+        )
+
+
+def _request(**kwargs) -> RequestData:
+    return RequestData(method="POST", url=URL("https://example.com/bulk"), **kwargs)
+
+
+PAYLOAD = [{"id": i, "name": "item"} for i in range(100)]
+
+
+class TestCompressionExecutor:
+    async def test_json(self):
+        upstream = _RecordingExecutor()
+        executor = CompressionExecutor(upstream)
+        request = _request(json=PAYLOAD, headers=CIMultiDict({"X-Header": "1"}))
+
+        await executor.execute(request)
+
+        sent = upstream.requests[0]
+        assert sent.json is None
+        assert gzip.decompress(sent.data) == StdlibJsonCodec().encode(PAYLOAD)
+        assert sent.headers == {
+            "X-Header": "1",
+            "Content-Encoding": "gzip",
+            "Content-Type": "application/json",
+        }
+        assert executor.compressed == 1
+        # the original request is untouched
+        assert request.json is PAYLOAD
+        assert request.headers == {"X-Header": "1"}
+
+    @pytest.mark.parametrize(
+        "data, content_type",
+        [
+            ("text " * 500, "text/plain; charset=utf-8"),
+            (b"bytes " * 500, None),
+            (bytearray(b"bytes " * 500), None),
+            (memoryview(b"view " * 500), None),
+            (memoryview(b"view " * 500).cast("B", (50, 50)), None),
+        ],
+    )
+    async def test_data(self, data: Any, content_type: str | None):
+        upstream = _RecordingExecutor()
+        executor = CompressionExecutor(upstream, encoding="deflate")
+
+        await executor.execute(_request(data=data))
+
+        sent = upstream.requests[0]
+        raw = data.encode() if isinstance(data, str) else bytes(data)
+        assert zlib.decompress(sent.data) == raw
+        assert sent.headers is not None
+        assert sent.headers["Content-Encoding"] == "deflate"
+        assert sent.headers.get("Content-Type") == content_type
+
+    @pytest.mark.parametrize(
+        "request_data",
+        [
+            _request(json={"small": True}),
+            _request(data=b"x" * 2000, headers=CIMultiDict({"Content-Encoding": "br"})),
+            _request(data={"form": "x" * 2000}),
+            _request(),
+            # incompressible
+            _request(data=os.urandom(2000)),
+        ],
+    )
+    async def test_not_compressed(self, request_data: RequestData):
+        upstream = _RecordingExecutor()
+        executor = CompressionExecutor(upstream)
+
+        await executor.execute(request_data)
+
+        assert upstream.requests == [request_data]
+        assert executor.compressed == 0
+
+    async def test_offload(self, mocker):
+        upstream = _RecordingExecutor()
+        with ThreadPoolExecutor(1) as pool:
+            submit = mocker.spy(pool, "submit")
+            executor = CompressionExecutor(
+                upstream, min_size=10, offload_size=1000, thread_pool=pool
+            )
+
+            await executor.execute(_request(data=b"small " * 10))
+            assert submit.call_count == 0
+
+            await executor.execute(_request(data=b"large " * 1000))
+            assert submit.call_count == 1
+
+        assert [gzip.decompress(r.data) for r in upstream.requests] == [
+            b"small " * 10,
+            b"large " * 1000,
+        ]
+
+    async def test_compressed_once_for_retries(self, mocker):
+        upstream = _RecordingExecutor(statuses=(500, 500, 200))
+        executor = CompressionExecutor(
+            RetryableExecutor(upstream, retry_sleep_timeout=0)
+        )
+        compress = mocker.spy(executor, "_compress")
+
+        response = await executor.execute(_request(json=PAYLOAD))
+
+        assert response.status == 200
+        assert compress.call_count == 1
+        assert len({id(r.data) for r in upstream.requests}) == 1
+
+    async def test_compressed_once_inside_retries(self, mocker):
+        upstream = _RecordingExecutor(statuses=(500, 500, 200))
+        executor = CompressionExecutor(upstream)
+        compress = mocker.spy(executor, "_compress")
+
+        response = await RetryableExecutor(executor, retry_sleep_timeout=0).execute(
+            _request(json=PAYLOAD)
+        )
+
+        assert response.status == 200
+        assert compress.call_count == 1
+        assert len({id(r.data) for r in upstream.requests}) == 1
+
+    async def test_backend_json_codec(self):
+        class _Codec(StdlibJsonCodec):
+            def encode(self, obj: Any) -> bytes:
+                return b'{"encoded": "by backend"}' * 100
+
+        upstream = _RecordingExecutor(json_codec=_Codec())
+        executor = CompressionExecutor(RetryableExecutor(upstream))
+
+        await executor.execute(_request(json=PAYLOAD))
+
+        sent = upstream.requests[0]
+        assert gzip.decompress(sent.data) == b'{"encoded": "by backend"}' * 100
+
+
+class TestCompressors:
+    def test_unsupported(self):
+        with pytest.raises(ValueError, match="unsupported"):
+            get_compressor("lzma")
+
+    @pytest.mark.skipif(has_zstandard, reason="zstandard is installed")
+    def test_zstd_not_installed(self):
+        with pytest.raises(ImportError, match="zstandard"):
+            get_compressor("zstd")
+
+    @pytest.mark.skipif(has_brotli, reason="brotli is installed")
+    def test_brotli_not_installed(self):
+        with pytest.raises(ImportError, match="brotli"):
+            get_compressor("br")
+
+    @pytest.mark.skipif(not has_zstandard, reason="zstandard is not installed")
+    def test_zstd(self):  # pragma: no cover
+        import zstandard
+
+        data = b"data " * 100
+        compressed = get_compressor("zstd", 5)(data)
+        assert zstandard.ZstdDecompressor().decompress(compressed) == data
+
+    @pytest.mark.skipif(not has_brotli, reason="brotli is not installed")
+    def test_brotli(self):  # pragma: no cover
+        import brotli
+
+        data = b"data " * 100
+        assert brotli.decompress(get_compressor("br")(data)) == data
@@ -0,0 +1,198 @@
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+import pytest
+from multidict import CIMultiDict
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.executors.hedge import HedgedExecutor
+from extapi.http.executors.wrapped import WrappedExecutor
+from extapi.http.types import RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+class _ClosableResponse(DummyBackendResponse):
+    def __init__(self, attempt: int):
+        super().__init__(str(attempt).encode())
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _ScriptedExecutor(AbstractExecutor[Any]):
+    # every attempt takes (delay, status or exception) from the script
+    def __init__(self, script: Iterable[tuple[float, int | Exception]]):
+        self._script = list(script)
+        self.requests: list[RequestData] = []
+        self.backend_responses: list[_ClosableResponse] = []
+        self.cancelled = 0
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        attempt = len(self.requests)
+        self.requests.append(request)
+        delay, result = self._script[attempt]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        if isinstance(result, Exception):
+            raise result
+
+        backend_response = _ClosableResponse(attempt)
+        self.backend_responses.append(backend_response)
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=result,
+            backend_response=backend_response,
+        )
+
+
+class _AuthExecutor(WrappedExecutor[Any]):
+    # modifies the request it is given, like addons do
+    async def execute(self, request: RequestData) -> Response[Any]:
+        headers = request.mutable_headers()
+        assert "Authorization" not in headers
+        headers["Authorization"] = "token"
+        return await super().execute(request)
+
+
+class TestHedgedExecutor:
+    async def test_fast_no_hedge(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(0, 200)])
+        executor = HedgedExecutor(base, delay=0.05)
+
+        response = await executor.execute(request_simple)
+
+        assert response.status == 200
+        assert len(base.requests) == 1
+        assert executor.hedges_sent == 0
+
+    async def test_hedge_wins(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(1, 200), (0, 200)])
+        executor = HedgedExecutor(base, delay=0.01)
+
+        response = await executor.execute(request_simple)
+
+        assert await response.read() == b"1"
+        assert executor.hedges_sent == 1
+        assert executor.hedges_won == 1
+        assert base.cancelled == 1
+
+    async def test_primary_wins(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(0.05, 200), (1, 200)])
+        executor = HedgedExecutor(base, delay=0.01)
+
+        response = await executor.execute(request_simple)
+
+        assert await response.read() == b"0"
+        assert executor.hedges_sent == 1
+        assert executor.hedges_won == 0
+        assert base.cancelled == 1
+
+    async def test_max_hedges(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(1, 200), (1, 200), (1, 200), (0, 200)])
+        executor = HedgedExecutor(base, delay=0.01, max_hedges=2)
+
+        response = await executor.execute(request_simple)
+
+        assert await response.read() == b"0"
+        assert len(base.requests) == 3
+        assert executor.hedges_sent == 2
+
+    async def test_failure_waits_for_hedge(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(0.05, 500), (0.05, 200)])
+        executor = HedgedExecutor(base, delay=0.01)
+
+        response = await executor.execute(request_simple)
+
+        assert response.status == 200
+        assert base.backend_responses[0].closed is True
+        assert base.backend_responses[1].closed is False
+
+    async def test_all_failed_response(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(0.05, 500), (0.05, 502)])
+        executor = HedgedExecutor(base, delay=0.01)
+
+        response = await executor.execute(request_simple)
+
+        assert response.status in (500, 502)
+        assert response.backend_response in base.backend_responses
+        assert sum(r.closed for r in base.backend_responses) == 1
+
+    async def test_all_failed_error(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(0.05, ConnectionError()), (0.05, TimeoutError())])
+        executor = HedgedExecutor(base, delay=0.01)
+
+        with pytest.raises((ConnectionError, TimeoutError)):
+            await executor.execute(request_simple)
+
+    async def test_not_idempotent(self, request_simple: RequestData):
+        request_simple.method = "POST"
+        base = _ScriptedExecutor([(0.05, 200)])
+        executor = HedgedExecutor(base, delay=0.01)
+
+        await executor.execute(request_simple)
+        assert len(base.requests) == 1
+
+    async def test_copies_request(self, request_simple: RequestData):
+        request_simple.headers = CIMultiDict({"X-Test": "1"})
+        base = _ScriptedExecutor([(1, 200), (0, 200)])
+        executor = HedgedExecutor(_AuthExecutor(base), delay=0.01)
+
+        await executor.execute(request_simple)
+
+        primary, hedge = base.requests
+        assert primary is not request_simple
+        assert hedge is not request_simple
+        assert hedge.headers is not primary.headers
+        # the hedge is not a copy of the primary modified down the chain
+        assert primary.headers == {"X-Test": "1", "Authorization": "token"}
+        assert hedge.headers == {"X-Test": "1", "Authorization": "token"}
+        assert request_simple.headers == {"X-Test": "1"}
+
+    async def test_cancel(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(1, 200), (1, 200)])
+        executor = HedgedExecutor(base, delay=0.01)
+
+        task = asyncio.ensure_future(executor.execute(request_simple))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert base.cancelled == 2
+
+    async def test_percentile_delay(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(0, 200)] * 10 + [(1, 200), (0, 200)])
+        executor = HedgedExecutor(base, percentile=90, min_samples=10)
+
+        for _ in range(10):
+            assert executor.hedge_delay is None
+            await executor.execute(request_simple)
+
+        delay = executor.hedge_delay
+        assert delay is not None
+        assert delay < 0.05
+
+        await executor.execute(request_simple)
+        assert executor.hedges_sent == 1
+        assert executor.hedges_won == 1
+
+    async def test_latency_from_request_start(self, request_simple: RequestData):
+        base = _ScriptedExecutor([(1, 200), (0, 200)] * 2)
+        executor = HedgedExecutor(base, delay=0.05, min_samples=2)
+
+        for _ in range(2):
+            await executor.execute(request_simple)
+
+        # the winning hedge is not timed from its own start: the cancelled
+        # slow attempt counts with its elapsed time
+        assert executor.hedges_won == 2
+        assert all(latency >= 0.05 for latency in executor._latencies)
+        assert executor._percentile_delay is not None
+        assert executor._percentile_delay >= 0.05
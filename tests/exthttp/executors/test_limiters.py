@@ -0,0 +1,75 @@
+import pytest
+
+from extapi.http.executors.limiters import (
+    ConcurrencyLimitedExecutor,
+    RateLimitedExecutor,
+)
+from extapi.http.types import RequestData
+from extapi.limiters.concurrency.local import LocalConcurrencyLimiter
+from extapi.limiters.rps.local import LocalRateLimiter
+from tests.exthttp._helpers import DummyExecutor
+
+
+class _RecordingLimiter(LocalConcurrencyLimiter):
+    def __init__(self):
+        super().__init__(max_concurrency=10)
+        self.samples: list[tuple[float, bool]] = []
+
+    @property
+    def limit(self) -> int:
+        return 10  # pragma: no cover
+
+    def on_sample(self, *, latency: float, dropped: bool) -> None:
+        self.samples.append((latency, dropped))
+
+
+class _FailingExecutor(DummyExecutor):
+    async def execute(self, request: RequestData):
+        raise ConnectionError()
+
+
+class TestConcurrencyLimitedExecutor:
+    async def test_execute(self, request_simple: RequestData):
+        executor = ConcurrencyLimitedExecutor(
+            DummyExecutor(200),
+            concurrency_limiter=LocalConcurrencyLimiter(max_concurrency=1),
+        )
+
+        response = await executor.execute(request_simple)
+        assert response.status == 200
+
+    @pytest.mark.parametrize("status,dropped", [(200, False), (429, True), (503, True)])
+    async def test_adaptive_samples(
+        self, request_simple: RequestData, status: int, dropped: bool
+    ):
+        limiter = _RecordingLimiter()
+        executor = ConcurrencyLimitedExecutor(
+            DummyExecutor(status), concurrency_limiter=limiter
+        )
+
+        await executor.execute(request_simple)
+        assert len(limiter.samples) == 1
+        assert limiter.samples[0][1] is dropped
+
+    async def test_adaptive_error(self, request_simple: RequestData):
+        limiter = _RecordingLimiter()
+        executor = ConcurrencyLimitedExecutor(
+            _FailingExecutor(), concurrency_limiter=limiter
+        )
+
+        with pytest.raises(ConnectionError):
+            await executor.execute(request_simple)
+
+        assert len(limiter.samples) == 1
+        assert limiter.samples[0][1] is True
+
+
+class TestRateLimitedExecutor:
+    async def test_execute(self, request_simple: RequestData):
+        executor = RateLimitedExecutor(
+            DummyExecutor(200),
+            rate_limiter=LocalRateLimiter(rate_limit=1),
+        )
+
+        response = await executor.execute(request_simple)
+        assert response.status == 200
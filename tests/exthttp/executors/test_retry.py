@@ -1,16 +1,25 @@
 import inspect
+import io
 import time
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
 from typing import Any
 
 import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
 from pytest_mock.plugin import MockerFixture
 
 from extapi.http.abc import AbstractExecutor, Addon
 from extapi.http.addons.auth import BearerAuthAddon
 from extapi.http.addons.retry import Retry5xxAddon
-from extapi.http.executors.retry import RetryableExecutor
-from extapi.http.types import ExecuteError, HttpExecuteError, RequestData, Response
+from extapi.http.backoff import ExponentialBackoff
+from extapi.http.executors.retry import RetryableExecutor, RetryBudget
+from extapi.http.types import (
+    BodyTooLargeError,
+    ExecuteError,
+    HttpExecuteError,
+    RequestData,
+    Response,
+)
 from tests.exthttp._helpers import DummyBackendResponse
 
 
@@ -202,6 +211,58 @@ class TestRetryExecutor:
         assert response.status == 200
         assert base.call_count == 2
 
+    async def test_file_body_rewound(self, request_simple: RequestData):
+        positions = []
+
+        class _Executor(_DummyExecutor):
+            async def execute(self, request: RequestData) -> Response:
+                positions.append(request.data.tell())
+                request.data.read()
+                return await super().execute(request)
+
+        request_simple.data = io.BytesIO(b"header|body")
+        request_simple.data.seek(7)
+        base = _Executor(responses=[Exception("some error"), 200])
+        executor = RetryableExecutor(
+            base, max_retries=3, retry_sleep_timeout=0, default_addons=()
+        )
+
+        response = await executor.execute(request_simple)
+
+        assert response.status == 200
+        assert positions == [7, 7]
+
+    async def test_one_shot_body_not_retried(self, request_simple: RequestData):
+        async def body() -> AsyncIterator[bytes]:
+            yield b"data"  # pragma: no cover
+
+        request_simple.data = body()
+        base = _DummyExecutor(responses=[Exception("some error"), 200])
+        executor = RetryableExecutor(
+            base, max_retries=3, retry_sleep_timeout=0, default_addons=()
+        )
+
+        with pytest.raises(ExecuteError, match="after 1 retries"):
+            await executor.execute(request_simple)
+
+        assert base.call_count == 1
+
+    async def test_body_too_large_not_retried(self, request_simple: RequestData):
+        error = BodyTooLargeError(request_simple.url, 1000, 2000)
+        base = _DummyExecutor(responses=[error, 200])
+        executor = RetryableExecutor(
+            base, max_retries=3, retry_sleep_timeout=0, default_addons=()
+        )
+
+        with pytest.raises(BodyTooLargeError) as err:
+            await executor.execute(request_simple)
+
+        assert err.value is error
+        assert str(err.value) == (
+            "BodyTooLargeError(url=https://example.com, size=2000, max_body_size=1000)"
+        )
+        assert base.call_count == 1
+
     async def test_exception_propagate(self, request_simple: RequestData):
         base = _DummyExecutor(responses=[Exception("some error"), 200])
         executor = RetryableExecutor(
@@ -285,6 +346,200 @@ class TestRetryExecutor:
         assert response.status == 200
         assert base.call_count == 3
 
+    async def test_default_hooks_skipped(self):
+        class _OnlyResponse(Addon[Any]):
+            async def process_response(
+                self, request: RequestData, response: Response[Any]
+            ) -> Response[Any]:
+                return response
+
+        addon = _OnlyResponse()
+        executor = RetryableExecutor(
+            _DummyExecutor(), addons=[addon, Retry5xxAddon()], default_addons=[]
+        )
+
+        assert executor._before_request_hooks == []
+        assert executor._process_error_hooks == []
+        assert executor._process_response_hooks == [(addon.process_response, True)]
+        assert len(executor._need_retry_hooks) == 1
+
+    async def test_sync_hooks(self, request_simple: RequestData):
+        calls: list[str] = []
+
+        class _SyncAddon:
+            copy_on_write_headers = True
+
+            def before_request(self, request: RequestData) -> None:
+                calls.append("before_request")
+
+            def process_response(
+                self, request: RequestData, response: Response[Any]
+            ) -> Response[Any]:
+                calls.append("process_response")
+                return response
+
+            def process_error(self, request: RequestData, error: Exception) -> None:
+                calls.append("process_error")
+
+            def need_retry(self, response: Response[Any]) -> tuple[bool, float | None]:
+                calls.append("need_retry")
+                return response.status >= 500, None
+
+        addon = _SyncAddon()
+        executor = RetryableExecutor(
+            _DummyExecutor(responses=[500, ValueError, 200]),
+            retry_sleep_timeout=0,
+            addons=[addon],  # type: ignore[list-item]
+            default_addons=[],
+        )
+        assert executor._before_request_hooks == [(addon.before_request, False)]
+
+        response = await executor.execute(request_simple)
+
+        assert response.status == 200
+        assert calls == [
+            "before_request",
+            "process_response",
+            "need_retry",
+            "before_request",
+            "process_error",
+            "before_request",
+            "process_response",
+            "need_retry",
+        ]
+
+    async def test_hooks_order(self, request_simple: RequestData):
+        calls: list[str] = []
+
+        class _Addon(Addon[Any]):
+            async def before_request(self, request: RequestData) -> None:
+                calls.append("before_request")
+
+            async def process_response(
+                self, request: RequestData, response: Response[Any]
+            ) -> Response[Any]:
+                calls.append("process_response")
+                return response
+
+            async def process_error(
+                self, request: RequestData, error: Exception
+            ) -> None:
+                calls.append("process_error")
+
+            async def need_retry(
+                self, response: Response[Any]
+            ) -> tuple[bool, float | None]:
+                calls.append("need_retry")
+                return response.status >= 500, None
+
+        executor = RetryableExecutor(
+            _DummyExecutor(responses=[500, ValueError, 200]),
+            retry_sleep_timeout=0,
+            addons=[_Addon()],
+            default_addons=[],
+        )
+        response = await executor.execute(request_simple)
+
+        assert response.status == 200
+        assert calls == [
+            "before_request",
+            "process_response",
+            "need_retry",
+            "before_request",
+            "process_error",
+            "before_request",
+            "process_response",
+            "need_retry",
+        ]
+
+    async def test_headers_shared(self, request_filled: RequestData):
+        original = request_filled.headers
+        seen: list[Any] = []
+
+        class _Executor(_DummyExecutor):
+            async def execute(self, request: RequestData) -> Response:
+                seen.append(request.headers)
+                return await super().execute(request)
+
+        executor = RetryableExecutor(
+            _Executor(responses=[500, 500, 200]), retry_sleep_timeout=0
+        )
+        await executor.execute(request_filled)
+
+        # a read-only view of the original, nothing is copied
+        assert seen == [original] * 3
+        for headers in seen:
+            assert isinstance(headers, CIMultiDictProxy)
+
+    async def test_headers_copied_on_write(self, request_filled: RequestData):
+        original = request_filled.headers
+        assert original is not None
+        original_items = list(original.items())
+        seen: list[Any] = []
+
+        class _Executor(_DummyExecutor):
+            async def execute(self, request: RequestData) -> Response:
+                seen.append(request.headers)
+                return await super().execute(request)
+
+        executor = RetryableExecutor(
+            _Executor(responses=[500, 200]),
+            retry_sleep_timeout=0,
+            addons=[BearerAuthAddon(lambda: "token")],
+        )
+        await executor.execute(request_filled)
+
+        assert list(original.items()) == original_items
+        assert len(seen) == 2
+        assert seen[0] is not seen[1]
+        for headers in seen:
+            assert headers is not original
+            assert headers.getall("Authorization") == ["Bearer token"]
+
+    async def test_headers_copied_for_unknown_addons(self, request_filled: RequestData):
+        original = request_filled.headers
+        assert original is not None
+
+        class _InPlaceAddon(Addon[Any]):
+            async def before_request(self, request: RequestData) -> None:
+                assert isinstance(request.headers, CIMultiDict)
+                request.headers.add("X-Added", "1")
+
+        executor = RetryableExecutor(
+            _DummyExecutor(responses=[500, 200]),
+            retry_sleep_timeout=0,
+            addons=[_InPlaceAddon()],
+        )
+        await executor.execute(request_filled)
+
+        assert "X-Added" not in original
+        assert request_filled.headers is not None
+        assert request_filled.headers.getall("X-Added") == ["1"]
+
+    async def test_headers_read_only_downstream(self, request_filled: RequestData):
+        original = request_filled.headers
+        assert original is not None
+        original_items = list(original.items())
+        errors: list[Exception] = []
+
+        class _Executor(_DummyExecutor):
+            async def execute(self, request: RequestData) -> Response:
+                try:
+                    request.headers["X-Added"] = "1"  # type: ignore[index]
+                except TypeError as e:
+                    errors.append(e)
+                request.mutable_headers()["X-Other"] = "1"
+                return await super().execute(request)
+
+        executor = RetryableExecutor(
+            _Executor(responses=[500, 200]), retry_sleep_timeout=0
+        )
+        response = await executor.execute(request_filled)
+
+        assert response.status == 200
+        assert len(errors) == 2
+        assert list(original.items()) == original_items
+
     async def test_correct_sleep_count(
         self, request_simple: RequestData, mocker: MockerFixture
     ):
@@ -301,3 +556,120 @@ class TestRetryExecutor:
         assert response.status == 500
         assert base.call_count == 2
         assert mock_sleep.await_count == 1
+
+    async def test_close_discarded_responses(
+        self, request_simple: RequestData, mocker: MockerFixture
+    ):
+        mock_close = mocker.patch.object(DummyBackendResponse, "close")
+        base = _DummyExecutor(responses=[500, 500, 200])
+        executor = RetryableExecutor(
+            base,
+            max_retries=3,
+            retry_sleep_timeout=0,
+        )
+
+        response = await executor.execute(request_simple)
+
+        assert response.status == 200
+        assert mock_close.await_count == 2
+
+    async def test_backoff(self, request_simple: RequestData, mocker: MockerFixture):
+        mock_sleep = mocker.patch("asyncio.sleep")
+        base = _DummyExecutor(responses=[500, 500, 500, 200])
+        executor = RetryableExecutor(
+            base,
+            max_retries=4,
+            backoff=ExponentialBackoff(base=0.1, jitter="none"),
+        )
+
+        response = await executor.execute(request_simple)
+
+        assert response.status == 200
+        delays = [call.args[0] for call in mock_sleep.await_args_list]
+        assert delays == pytest.approx([0.1, 0.2, 0.4])
+
+    async def test_backoff_addon_timeout_wins(
+        self, request_simple: RequestData, mocker: MockerFixture
+    ):
+        mock_sleep = mocker.patch("asyncio.sleep")
+        base = _DummyExecutor(responses=[500, 200])
+        executor = RetryableExecutor(
+            base,
+            max_retries=2,
+            backoff=ExponentialBackoff(base=10, jitter="none"),
+            addons=[Retry5xxAddon(default_timeout=0.5)],
+            default_addons=(),
+        )
+
+        await executor.execute(request_simple)
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [0.5]
+
+    async def test_retry_budget_exhausted(self, request_simple: RequestData):
+        budget = RetryBudget(ratio=0.5, min_retries_per_second=0)
+        base = _DummyExecutor(responses=[500, 500, 500, 500, 500])
+        executor = RetryableExecutor(
+            base, max_retries=3, retry_sleep_timeout=0, retry_budget=budget
+        )
+
+        # one request deposits half a retry - not enough to retry
+        response = await executor.execute(request_simple)
+        assert response.status == 500
+        assert base.call_count == 1
+
+        # two requests deposited one retry
+        response = await executor.execute(request_simple)
+        assert response.status == 500
+        assert base.call_count == 3
+
+    async def test_retry_budget_exhausted_error(self, request_simple: RequestData):
+        budget = RetryBudget(ratio=0, min_retries_per_second=0)
+        base = _DummyExecutor(responses=[Exception("some error"), 200])
+        executor = RetryableExecutor(
+            base, max_retries=3, retry_sleep_timeout=0, retry_budget=budget
+        )
+
+        with pytest.raises(ExecuteError) as err:
+            await executor.execute(request_simple)
+
+        assert (
+            str(err.value)
+            == "request failed, retry budget exhausted: Exception(some error)"
+        )
+
+
+class TestRetryBudget:
+    def test_reserve(self):
+        budget = RetryBudget(ratio=0, min_retries_per_second=1, window_seconds=2)
+        assert budget.try_withdraw()
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+
+    def test_ratio(self):
+        budget = RetryBudget(ratio=0.1, min_retries_per_second=0)
+        for _ in range(25):
+            budget.deposit()
+
+        assert budget.balance == pytest.approx(2.5)
+        assert budget.try_withdraw()
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+
+    def test_window_expiry(self, mocker: MockerFixture):
+        now = 1000.0
+        mocker.patch("extapi.http._window.time.monotonic", side_effect=lambda: now)
+        budget = RetryBudget(ratio=1, min_retries_per_second=0, window_seconds=10)
+
+        budget.deposit()
+        assert budget.try_withdraw()
+        budget.deposit()
+
+        now += 5
+        budget.deposit()
+        assert budget.balance == pytest.approx(2)
+
+        # the first two deposits and the withdrawal are out of the window
+        now += 5.5
+        assert budget.balance == pytest.approx(1)
+
+        now += 100
+        assert budget.balance == 0
@@ -0,0 +1,128 @@
+from typing import Any
+
+import pytest
+from aiohttp.test_utils import TestServer
+from yarl import URL
+
+from extapi.http.abc import AbstractExecutor
+from extapi.http.backends.aiohttp import AiohttpExecutor
+from extapi.http.executors.sse import EventStreamExecutor
+from extapi.http.sse import ServerSentEvent
+from extapi.http.types import ExecuteError, HttpExecuteError, RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+class _StreamExecutor(AbstractExecutor[Any]):
+    # replies with the given (status, body) or raises, one per connection
+    def __init__(self, *replies: tuple[int, bytes] | Exception):
+        self.replies = list(replies)
+        self.requests: list[RequestData] = []
+
+    async def execute(self, request: RequestData) -> Response[Any]:
+        self.requests.append(request)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+
+        status, body = reply
+        return Response(
+            method=request.method,
+            url=request.url,
+            status=status,
+            backend_response=DummyBackendResponse(body),
+        )
+
+
+def _request() -> RequestData:
+    return RequestData(method="GET", url=URL("https://example.com/events"))
+
+
+class TestEventStreamExecutor:
+    async def test_reconnect(self, dummy_server: TestServer):
+        async with AiohttpExecutor() as backend:
+            executor = EventStreamExecutor(backend)
+            request = RequestData(
+                method="GET",
+                url=URL(f"http://localhost:{dummy_server.port}/events"),
+            )
+
+            events = [event async for event in executor.events(request)]
+
+        assert [event.data for event in events] == ["event 1", "event 2", "event 3"]
+        assert executor.reconnects == 3
+        assert request.headers is None
+
+    async def test_headers(self):
+        upstream = _StreamExecutor(
+            (200, b"retry: 0\nid: 7\ndata: a\n\n"),
+            ConnectionResetError(),
+            (200, b"data: b\n\n"),
+            (204, b""),
+        )
+        executor = EventStreamExecutor(upstream)
+
+        events = [event async for event in executor.events(_request())]
+
+        assert events == [
+            ServerSentEvent(data="a", id="7", retry=0),
+            ServerSentEvent(data="b"),
+        ]
+        assert executor.reconnects == 3
+
+        first, *rest = upstream.requests
+        assert first.auto_read_body is False
+        assert first.headers == {
+            "Accept": "text/event-stream",
+            "Cache-Control": "no-cache",
+        }
+        # the last id is kept across connections
+        assert [r.headers["Last-Event-ID"] for r in rest if r.headers] == ["7"] * 3
+
+    async def test_state_without_events(self, mocker):
+        sleep = mocker.patch("asyncio.sleep")
+        upstream = _StreamExecutor(
+            (200, b"data: a\n\nid: 7\nretry: 20\n\n"),
+            (204, b""),
+        )
+        executor = EventStreamExecutor(upstream)
+
+        events = [event async for event in executor.events(_request())]
+
+        assert events == [ServerSentEvent(data="a")]
+        # the id and the retry of a block without data are used to reconnect
+        assert upstream.requests[1].headers is not None
+        assert upstream.requests[1].headers["Last-Event-ID"] == "7"
+        sleep.assert_awaited_once_with(0.02)
+
+    async def test_last_event_id(self):
+        upstream = _StreamExecutor((204, b""))
+        executor = EventStreamExecutor(upstream)
+
+        assert [e async for e in executor.events(_request(), last_event_id="5")] == []
+        assert upstream.requests[0].headers is not None
+        assert upstream.requests[0].headers["Last-Event-ID"] == "5"
+
+    async def test_http_error(self):
+        executor = EventStreamExecutor(_StreamExecutor((503, b"")), retry_delay=0)
+
+        with pytest.raises(HttpExecuteError):
+            async for _ in executor.events(_request()):
+                pass  # pragma: no cover
+
+    async def test_max_reconnects(self):
+        upstream = _StreamExecutor(
+            ConnectionResetError(),
+            (200, b"retry: 0\ndata: a\n\n"),
+            ConnectionResetError(),
+            ConnectionResetError(),
+        )
+        executor = EventStreamExecutor(upstream, retry_delay=0, max_reconnects=1)
+
+        events = []
+        with pytest.raises(ExecuteError, match="after 1 reconnects"):
+            async for event in executor.events(_request()):
+                events.append(event)
+
+        # receiving an event resets the counter
+        assert events == [ServerSentEvent(data="a", retry=0)]
+        assert len(upstream.requests) == 3
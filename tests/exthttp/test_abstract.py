@@ -1,11 +1,15 @@
+import asyncio
+from contextlib import aclosing
 from typing import Any
 
 import pytest
 from multidict import CIMultiDict
+from yarl import URL
 
 from extapi._meta import PY311
 from extapi.http.abc import AbstractExecutor, Addon
 from extapi.http.types import RequestData, Response
+from tests.exthttp._helpers import DummyBackendResponse
 
 if PY311:
     from typing import assert_type  # type: ignore[attr-defined]
@@ -127,6 +131,30 @@ class TestAbstractExecutor:
         await executor.execute(request_filled)
         assert executed is True
 
+    async def test_execute_model(self, request_filled: RequestData):
+        closed = False
+
+        class _Backend(DummyBackendResponse):
+            async def close(self) -> None:
+                nonlocal closed
+                closed = True
+
+        class _Executor(AbstractExecutor[Any]):
+            async def execute(self, request: RequestData) -> Response[Any]:
+                return Response(
+                    method=request.method,
+                    url=request.url,
+                    status=200,
+                    backend_response=_Backend(b'{"id": 1}'),
+                )
+
+        result = await _Executor().execute_model(
+            request_filled, response_model=dict[str, int]
+        )
+        assert_type(result, dict[str, int])
+        assert result == {"id": 1}
+        assert closed is True
+
     async def test_start_close(self, response_simple: Response[Any]):
         executed_start = False
         executed_close = False
@@ -212,3 +240,132 @@ class TestAddon:
 
         result = await addon.process_error(request_simple, Exception("hi"))  # type: ignore[func-returns-value]
         assert result is None
+
+
+class _DelayedExecutor(AbstractExecutor[bytes]):
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def execute(self, request: RequestData) -> Response[bytes]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = float(request.kwargs.get("delay", 0))
+            await asyncio.sleep(delay)
+            if request.kwargs.get("error"):
+                raise RuntimeError(request.url.path)
+        finally:
+            self.in_flight -= 1
+
+        return Response(
+            status=200,
+            method=request.method,
+            url=request.url,
+            backend_response=DummyBackendResponse(),
+        )
+
+
+def _make_requests(*delays: float, error_at: int | None = None) -> list[RequestData]:
+    return [
+        RequestData(
+            method="GET",
+            url=URL(f"https://example.com/{i}"),
+            kwargs={"delay": delay, "error": i == error_at},
+        )
+        for i, delay in enumerate(delays)
+    ]
+
+
+class TestExecuteMany:
+    async def test_bounded(self):
+        executor = _DelayedExecutor()
+        requests = _make_requests(*([0.01] * 20))
+
+        results = [
+            (request, response)
+            async for request, response in executor.execute_many(
+                requests, max_in_flight=3
+            )
+        ]
+
+        assert len(results) == 20
+        assert executor.max_in_flight == 3
+        assert {request.url for request, _ in results} == {r.url for r in requests}
+        assert all(request.url == response.url for request, response in results)
+
+    async def test_lazy_pull(self):
+        executor = _DelayedExecutor()
+        pulled = 0
+
+        def gen():
+            nonlocal pulled
+            for request in _make_requests(*([0] * 100)):
+                pulled += 1
+                yield request
+
+        async with aclosing(executor.execute_many(gen(), max_in_flight=2)) as results:
+            async for _ in results:
+                break
+
+        assert pulled == 2
+        assert executor.in_flight == 0
+
+    async def test_async_iterable(self):
+        executor = _DelayedExecutor()
+
+        async def gen():
+            for request in _make_requests(0, 0, 0):
+                yield request
+
+        results = [r async for r in executor.execute_many(gen(), max_in_flight=2)]
+        assert len(results) == 3
+
+    async def test_completion_order(self):
+        executor = _DelayedExecutor()
+        requests = _make_requests(0.1, 0.01, 0.05)
+
+        paths = [
+            request.url.path
+            async for request, _ in executor.execute_many(requests, max_in_flight=3)
+        ]
+
+        assert paths == ["/1", "/2", "/0"]
+
+    async def test_ordered(self):
+        executor = _DelayedExecutor()
+        requests = _make_requests(0.1, 0.01, 0.05)
+
+        paths = [
+            request.url.path
+            async for request, _ in executor.execute_many(
+                requests, max_in_flight=3, ordered=True
+            )
+        ]
+
+        assert paths == ["/0", "/1", "/2"]
+
+    async def test_raise(self):
+        executor = _DelayedExecutor()
+        requests = _make_requests(0.01, 0.5, 0.5, error_at=0)
+
+        with pytest.raises(RuntimeError):
+            async for _ in executor.execute_many(requests, max_in_flight=3):
+                pass  # pragma: no cover
+
+        assert executor.in_flight == 0
+
+    async def test_return_exceptions(self):
+        executor = _DelayedExecutor()
+        requests = _make_requests(0, 0, 0, error_at=1)
+
+        results = {
+            request.url.path: response
+            async for request, response in executor.execute_many(
+                requests, return_exceptions=True
+            )
+        }
+
+        assert isinstance(results["/1"], RuntimeError)
+        assert isinstance(results["/0"], Response)
+        assert isinstance(results["/2"], Response)
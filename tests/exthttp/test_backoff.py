@@ -0,0 +1,48 @@
+import pytest
+
+from extapi.http.backoff import (
+    BackoffPolicy,
+    ConstantBackoff,
+    DecorrelatedJitterBackoff,
+    ExponentialBackoff,
+)
+
+
+class TestConstantBackoff:
+    def test_delay(self):
+        policy = ConstantBackoff(1.5)
+        assert isinstance(policy, BackoffPolicy)
+        assert [policy.delay(i, 0) for i in range(3)] == [1.5, 1.5, 1.5]
+
+
+class TestExponentialBackoff:
+    def test_no_jitter(self):
+        policy = ExponentialBackoff(base=0.1, factor=2, max_delay=1, jitter="none")
+        delays = [policy.delay(i, 0) for i in range(6)]
+        assert delays == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+    def test_full_jitter(self):
+        policy = ExponentialBackoff(base=0.1, factor=2, max_delay=1, jitter="full")
+        for attempt in range(10):
+            delay = policy.delay(attempt, 0)
+            assert 0 <= delay <= min(1, 0.1 * 2**attempt)
+
+    def test_equal_jitter(self):
+        policy = ExponentialBackoff(base=0.1, factor=2, max_delay=1, jitter="equal")
+        for attempt in range(10):
+            cap = min(1, 0.1 * 2**attempt)
+            assert cap / 2 <= policy.delay(attempt, 0) <= cap
+
+    def test_huge_attempt(self):
+        policy = ExponentialBackoff(max_delay=5, jitter="none")
+        assert policy.delay(10_000, 0) == 5
+
+
+class TestDecorrelatedJitterBackoff:
+    def test_bounds(self):
+        policy = DecorrelatedJitterBackoff(base=0.1, max_delay=2)
+        previous = 0.0
+        for attempt in range(20):
+            delay = policy.delay(attempt, previous)
+            assert 0.1 <= delay <= min(2, max(0.1, previous * 3))
+            previous = delay
@@ -0,0 +1,80 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from extapi.http.bodies import (
+    FileBody,
+    MmapBody,
+    ReplayableBody,
+    StreamBody,
+)
+
+
+async def _read(body: ReplayableBody) -> list[bytes]:
+    return [bytes(chunk) async for chunk in body.chunks()]
+
+
+class TestBodies:
+    @pytest.mark.parametrize("body_type", [FileBody, MmapBody])
+    async def test_file(self, body_type: type[FileBody | MmapBody], tmp_path: Path):
+        path = tmp_path / "body"
+        path.write_bytes(b"0123456789")
+
+        body = body_type(path, chunk_size=4, content_type="text/plain")
+
+        assert isinstance(body, ReplayableBody)
+        assert body.size == 10
+        assert body.content_type == "text/plain"
+        # replayed from the beginning
+        for _ in range(2):
+            assert await _read(body) == [b"0123", b"4567", b"89"]
+
+    @pytest.mark.parametrize("body_type", [FileBody, MmapBody])
+    async def test_empty_file(
+        self, body_type: type[FileBody | MmapBody], tmp_path: Path
+    ):
+        path = tmp_path / "body"
+        path.write_bytes(b"")
+
+        body = body_type(path)
+
+        assert body.size == 0
+        assert await _read(body) == []
+
+    @pytest.mark.parametrize("body_type", [FileBody, MmapBody])
+    async def test_size_changed(
+        self, body_type: type[FileBody | MmapBody], tmp_path: Path
+    ):
+        path = tmp_path / "body"
+        path.write_bytes(b"0123456789")
+        body = body_type(path)
+
+        path.write_bytes(b"01234")
+        with pytest.raises(ValueError, match="size changed from 10 to 5"):
+            await _read(body)
+
+    async def test_mmap_zero_copy(self, tmp_path: Path):
+        path = tmp_path / "body"
+        path.write_bytes(b"data")
+
+        chunks = [chunk async for chunk in MmapBody(path).chunks()]
+        assert isinstance(chunks[0], memoryview)
+
+    async def test_stream(self):
+        calls = 0
+
+        async def factory() -> AsyncIterator[bytes]:
+            nonlocal calls
+            calls += 1
+            yield b"a"
+            yield b"b"
+
+        body = StreamBody(factory, size=2)
+
+        assert isinstance(body, ReplayableBody)
+        assert body.size == 2
+        assert body.content_type == "application/octet-stream"
+        assert await _read(body) == [b"a", b"b"]
+        assert await _read(body) == [b"a", b"b"]
+        assert calls == 2
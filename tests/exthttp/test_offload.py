@@ -0,0 +1,123 @@
+import dataclasses
+import json
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from yarl import URL
+
+from extapi.http._offload import run_decode
+from extapi.http.codecs.json import StdlibJsonCodec
+from extapi.http.types import Response
+from tests.exthttp._helpers import DummyBackendResponse
+
+
+@dataclasses.dataclass
+class Item:
+    id: int
+
+
+def _decode_in_thread(data: bytes) -> tuple[str, bytes]:
+    return threading.current_thread().name, data
+
+
+class TestRunDecode:
+    async def test_inline(self):
+        with ThreadPoolExecutor(1, thread_name_prefix="decode") as pool:
+            name, _ = await run_decode(_decode_in_thread, b"x", pool=None)
+            assert not name.startswith("decode")
+
+            name, _ = await run_decode(
+                _decode_in_thread, b"small", pool=pool, offload_size=10
+            )
+            assert not name.startswith("decode")
+
+    async def test_offloaded(self):
+        with ThreadPoolExecutor(1, thread_name_prefix="decode") as pool:
+            name, data = await run_decode(
+                _decode_in_thread, b"large body", pool=pool, offload_size=10
+            )
+
+        assert name.startswith("decode")
+        assert data == b"large body"
+
+
+class TestResponseJsonOffload:
+    async def test_process_pool(self):
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=DummyBackendResponse(json.dumps({"a": [1]}).encode()),
+        )
+
+        with ProcessPoolExecutor(1) as pool:
+            assert await response.json(decode_pool=pool, offload_size=0) == {"a": [1]}
+            assert await response.json(
+                encoding="latin-1", loads=json.loads, decode_pool=pool, offload_size=0
+            ) == {"a": [1]}
+
+    async def test_backend_settings(self):
+        class _Backend(DummyBackendResponse):
+            async def run_decode(self, decode, data, **kwargs):
+                return "offloaded"
+
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=_Backend(b"[1]"),
+        )
+
+        assert await response.json() == "offloaded"
+        assert await response.decode(list[int]) == "offloaded"
+
+    async def test_backend_json_called(self):
+        # the backend checks (e.g. an empty body is None) are kept
+        calls: list[dict] = []
+
+        class _Backend(DummyBackendResponse):
+            async def json(self, **kwargs):
+                calls.append(kwargs)
+                return None
+
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=_Backend(b""),
+        )
+
+        with ThreadPoolExecutor(1) as pool:
+            assert await response.json(decode_pool=pool) is None
+
+        assert calls == [
+            {
+                "encoding": None,
+                "loads": json.loads,
+                "decode_pool": pool,
+                "offload_size": None,
+            }
+        ]
+
+
+class TestDecodeOffload:
+    async def test_process_pool(self):
+        class _Backend(DummyBackendResponse):
+            async def run_decode(self, decode, data, **kwargs):
+                return await super().run_decode(decode, data, pool=pool, offload_size=0)
+
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=_Backend(b'[{"id": 1}, {"id": 2}]'),
+        )
+
+        with ProcessPoolExecutor(1) as pool:
+            for _ in range(2):
+                assert await response.decode(list[Item]) == [Item(1), Item(2)]
+
+    def test_codec_unpickled_once(self):
+        codec = StdlibJsonCodec()
+        assert pickle.loads(pickle.dumps(codec)) is pickle.loads(pickle.dumps(codec))
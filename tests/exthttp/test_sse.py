@@ -0,0 +1,67 @@
+from collections.abc import AsyncIterator
+
+from extapi.http._streams import iter_lines
+from extapi.http.sse import EventStreamState, ServerSentEvent, iter_sse
+
+
+async def _events(
+    data: bytes, size: int = 3, state: EventStreamState | None = None
+) -> list[ServerSentEvent]:
+    async def chunks() -> AsyncIterator[bytes]:
+        for offset in range(0, len(data), size):
+            yield data[offset : offset + size]
+
+    return [event async for event in iter_sse(iter_lines(chunks()), state=state)]
+
+
+class TestIterSse:
+    async def test_events(self):
+        events = await _events(
+            "\ufeffdata: first\r\n\r\n"
+            ": comment\n"
+            "event: update\n"
+            "id: 42\n"
+            "retry: 1500\n"
+            'data: {"a":\n'
+            "data:1}\n"
+            "\n"
+            "data\n"
+            "\n".encode()
+        )
+
+        assert events == [
+            ServerSentEvent(data="first"),
+            ServerSentEvent(event="update", data='{"a":\n1}', id="42", retry=1500),
+            # the last id is kept
+            ServerSentEvent(data="", id="42"),
+        ]
+        assert events[1].json() == {"a": 1}
+
+    async def test_ignored(self):
+        events = await _events(
+            b"event: no-data\n\n"
+            b"id: a\0b\nretry: soon\nunknown: field\ndata: x\n\n"
+            b"data: not dispatched"
+        )
+
+        assert events == [ServerSentEvent(data="x")]
+
+    async def test_retry_without_data(self):
+        events = await _events(b"retry: 10\n\ndata: x\n\ndata: y\n\n")
+
+        assert events == [
+            ServerSentEvent(data="x", retry=10),
+            ServerSentEvent(data="y"),
+        ]
+
+    async def test_state_without_events(self):
+        state = EventStreamState(last_id="1")
+
+        events = await _events(
+            b"data: x\nid: 2\n\nid: 3\nretry: 50\n\nid: 4\n", state=state
+        )
+
+        assert events == [ServerSentEvent(data="x", id="2")]
+        # applied although no event is dispatched,
+        # an id of an unterminated block is not
+        assert state == EventStreamState(last_id="3", retry=50)
@@ -0,0 +1,89 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from extapi.http._streams import iter_json_items
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for offset in range(0, len(data), size):
+        yield data[offset : offset + size]
+
+
+async def _items(data: bytes, size: int, path: Any = ()) -> list[Any]:
+    return [item async for item in iter_json_items(_chunks(data, size), path)]
+
+
+DOCUMENT: dict[str, Any] = {
+    "meta": {"items": ["not this one"], "tricky": 'a"[,]{\\'},
+    "data": {
+        "items": [
+            {"id": 1, "text": 'q\\"],[{', "nested": [1, {"a": None}]},
+            [],
+            {},
+            "str,]",
+            -1.5e3,
+            None,
+            True,
+        ],
+    },
+}
+
+
+class TestIterJsonItems:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1024])
+    async def test_path(self, size: int):
+        data = json.dumps(DOCUMENT).encode()
+
+        assert await _items(data, size, "data.items") == DOCUMENT["data"]["items"]
+        assert await _items(data, size, ["meta", "items"]) == ["not this one"]
+
+    @pytest.mark.parametrize("size", [1, 5])
+    async def test_top_level(self, size: int):
+        assert await _items(b'[1, "two", {"three": [3]}]', size) == [
+            1,
+            "two",
+            {"three": [3]},
+        ]
+
+    @pytest.mark.parametrize("data", [b"[]", b" [ \n ] "])
+    async def test_empty(self, data: bytes):
+        assert await _items(data, 1) == []
+
+    @pytest.mark.parametrize("data", [b'{"error": "bad"}', b"{}", b"1"])
+    async def test_top_level_not_found(self, data: bytes):
+        with pytest.raises(ValueError, match="top-level JSON array not found"):
+            await _items(data, 4)
+
+    @pytest.mark.parametrize(
+        "data", [b'{"data": {"other": [1, 2]}}', b'{"data": [1]}', b"[1]"]
+    )
+    async def test_path_not_found(self, data: bytes):
+        with pytest.raises(ValueError, match="'data.items' not found"):
+            await _items(data, 4, "data.items")
+
+    async def test_bounded_buffer(self):
+        # the whole array is never kept in memory
+        sizes = []
+
+        def decode(item: bytes) -> Any:
+            sizes.append(len(item))
+            return json.loads(item)
+
+        data = json.dumps([{"id": i} for i in range(1000)]).encode()
+        items = [
+            item async for item in iter_json_items(_chunks(data, 64), decode=decode)
+        ]
+
+        assert len(items) == 1000
+        assert max(sizes) < 20
+
+    async def test_truncated(self):
+        with pytest.raises(ValueError, match="unexpected end"):
+            await _items(b'{"items": [1, 2', 4, "items")
+
+    async def test_unexpected(self):
+        with pytest.raises(ValueError, match="unexpected"):
+            await _items(b"]", 4)
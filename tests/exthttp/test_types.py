@@ -1,12 +1,22 @@
+import dataclasses
+from collections.abc import AsyncIterator
 from typing import Any
 
-from multidict import CIMultiDict
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
 from yarl import URL
 
-from extapi.http.types import BackendResponseProtocol, Response
+from extapi.http.codecs.json import JsonCodec, StdlibJsonCodec
+from extapi.http.types import BackendResponseProtocol, RequestData, Response
 from tests.exthttp._helpers import DummyBackendResponse
 
 
+@dataclasses.dataclass
+class Item:
+    id: int
+    name: str
+
+
 class TestResponse:
     async def test_has_data(self):
         response = Response(
@@ -40,6 +50,52 @@ class TestResponse:
             "b": [10, 20],
         }
 
+    async def test_iter_chunks(self):
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=DummyBackendResponse(b"some-data"),
+        )
+
+        chunks = [chunk async for chunk in response.iter_chunks(4)]
+        assert chunks == [b"some", b"-dat", b"a"]
+
+    async def test_iter_lines(self):
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=DummyBackendResponse(b"one\r\ntwo\n\nthree"),
+        )
+
+        lines = [line async for line in response.iter_lines(2)]
+        assert lines == [b"one", b"two", b"", b"three"]
+
+        lines = [line async for line in response.iter_lines(2, keepends=True)]
+        assert lines == [b"one\r\n", b"two\n", b"\n", b"three"]
+
+    async def test_iter_json_items(self):
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=DummyBackendResponse(
+                b'{"data": {"items": [{"id": 1, "name": "one"}, {"id": 2, "name": "two"}]}}'
+            ),
+        )
+
+        items = [item async for item in response.iter_json_items("data.items")]
+        assert items == [{"id": 1, "name": "one"}, {"id": 2, "name": "two"}]
+
+        models = [
+            item
+            async for item in response.iter_json_items(
+                ("data", "items"), type_=Item, chunk_size=3
+            )
+        ]
+        assert models == [Item(id=1, name="one"), Item(id=2, name="two")]
+
     async def test_has_data_double(self):
         response = Response(
             method="GET",
@@ -106,6 +162,21 @@ class TestResponse:
             async def json(self, **kwargs) -> Any:
                 return None  # pragma: no cover
 
+            async def decode(self, type_: Any) -> Any:
+                return None  # pragma: no cover
+
+            async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+                yield b""  # pragma: no cover
+
+            def headers(self) -> CIMultiDict:
+                return CIMultiDict()  # pragma: no cover
+
+            def json_codec(self) -> JsonCodec:
+                return StdlibJsonCodec()  # pragma: no cover
+
+            async def run_decode(self, decode: Any, data: bytes, **kwargs) -> Any:
+                return decode(data)  # pragma: no cover
+
         response = Response(
             method="GET", url=URL("example.com"), status=200, backend_response=_Resp()
         )
@@ -116,3 +187,123 @@ class TestResponse:
             assert resp.original == b""
 
         assert called is True
+
+    async def test_decode(self):
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=DummyBackendResponse(b'[{"id": 1, "name": "one"}]'),
+        )
+
+        assert await response.decode(list[Item]) == [Item(id=1, name="one")]
+
+    async def test_explicit_headers(self):
+        headers = CIMultiDict({"X-Header": "value"})
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            headers=headers,
+            backend_response=DummyBackendResponse(),
+        )
+
+        assert response.headers is headers
+        response.headers = CIMultiDict()
+        assert response.headers == {}
+
+    async def test_default_headers(self):
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=DummyBackendResponse(),
+        )
+
+        assert response.headers == {}
+        assert response == Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            headers=CIMultiDict(),
+            backend_response=response.backend_response,
+        )
+
+    async def test_lazy_headers(self):
+        calls = 0
+
+        class _Backend(DummyBackendResponse):
+            def headers(self) -> CIMultiDict:
+                nonlocal calls
+                calls += 1
+                return CIMultiDict({"X-Header": "value"})
+
+        response = Response(
+            method="GET",
+            url=URL("example.com"),
+            status=200,
+            backend_response=_Backend(),
+        )
+        assert calls == 0
+
+        assert response.headers == {"X-Header": "value"}
+        assert response.headers is response.headers
+        assert calls == 1
+
+
+class TestRequestData:
+    def test_mutable_headers_none(self, request_simple: RequestData):
+        headers = request_simple.mutable_headers()
+
+        assert headers == {}
+        assert request_simple.headers is headers
+        assert request_simple.mutable_headers() is headers
+
+    def test_mutable_headers_own(self, request_filled: RequestData):
+        headers = request_filled.headers
+        assert request_filled.mutable_headers() is headers
+
+    def test_copy(self, request_filled: RequestData):
+        body = request_filled.encode_json(StdlibJsonCodec())
+        copy = request_filled.copy()
+
+        assert copy == request_filled
+        assert copy.headers is not request_filled.headers
+        assert copy.kwargs is not request_filled.kwargs
+        assert copy.encode_json(StdlibJsonCodec()) == body
+
+        copy.mutable_headers()["X-Other"] = "1"
+        copy.kwargs["other"] = 1
+        assert "X-Other" not in (request_filled.headers or {})
+        assert "other" not in request_filled.kwargs
+
+    def test_copy_on_write(self, request_filled: RequestData):
+        shared = CIMultiDict({"X-Header": "value"})
+        request_filled.share_headers(shared)
+        assert isinstance(request_filled.headers, CIMultiDictProxy)
+        assert request_filled.headers == shared
+        with pytest.raises(TypeError):
+            request_filled.headers["X-Other"] = "other"  # type: ignore[index]
+
+        request_filled.mutable_headers()["X-Other"] = "other"
+
+        assert request_filled.headers == {"X-Header": "value", "X-Other": "other"}
+        assert shared == {"X-Header": "value"}
+        assert request_filled.mutable_headers() is request_filled.headers
+
+    def test_encode_json_once(self, request_filled: RequestData, mocker):
+        codec = StdlibJsonCodec()
+        encode = mocker.spy(StdlibJsonCodec, "encode")
+
+        body = request_filled.encode_json(codec)
+        assert body == b'{"json1": "one", "json2": "two"}'
+        assert request_filled.encode_json(codec) is body
+        assert encode.call_count == 1
+
+        request_filled.json = {"other": 1}
+        assert request_filled.encode_json(codec) == b'{"other": 1}'
+        assert encode.call_count == 2
+
+    def test_encode_json_bytes(self, request_simple: RequestData):
+        request_simple.json = b'{"raw": true}'
+        assert request_simple.encode_json(StdlibJsonCodec()) is request_simple.json
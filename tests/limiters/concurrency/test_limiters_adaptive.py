@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from extapi.limiters.concurrency.abc import AdaptiveConcurrencyLimiter
+from extapi.limiters.concurrency.adaptive import (
+    AIMDConcurrencyLimiter,
+    GradientConcurrencyLimiter,
+)
+
+
+async def _saturate(limiter: AdaptiveConcurrencyLimiter) -> list:
+    semaphores = [limiter.get_semaphore() for _ in range(limiter.limit)]
+    for semaphore in semaphores:
+        await semaphore.acquire()
+    return semaphores
+
+
+class TestAdaptiveSemaphore:
+    async def test_protocol(self):
+        assert isinstance(AIMDConcurrencyLimiter(), AdaptiveConcurrencyLimiter)
+        assert isinstance(GradientConcurrencyLimiter(), AdaptiveConcurrencyLimiter)
+
+    async def test_limit(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=2)
+        semaphores = await _saturate(limiter)
+        assert limiter.inflight == 2
+
+        waiting = asyncio.ensure_future(limiter.get_semaphore().acquire())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        await semaphores[0].release()
+        await asyncio.wait_for(waiting, timeout=0.01)
+        assert limiter.inflight == 2
+
+    async def test_limit_growth_wakes_waiters(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=1)
+        await _saturate(limiter)
+
+        waiting = asyncio.ensure_future(limiter.get_semaphore().acquire())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        limiter.on_sample(latency=0.01, dropped=False)
+        assert limiter.limit == 2
+        await asyncio.wait_for(waiting, timeout=0.01)
+        assert limiter.inflight == 2
+
+    async def test_cancelled_waiter(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=1)
+        semaphores = await _saturate(limiter)
+
+        cancelled = asyncio.ensure_future(limiter.get_semaphore().acquire())
+        waiting = asyncio.ensure_future(limiter.get_semaphore().acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await semaphores[0].release()
+        await asyncio.wait_for(waiting, timeout=0.01)
+        assert limiter.inflight == 1
+
+
+class TestAIMDConcurrencyLimiter:
+    async def test_increase_when_utilized(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=10)
+
+        limiter.on_sample(latency=0.01, dropped=False)
+        assert limiter.limit == 10
+
+        await _saturate(limiter)
+        limiter.on_sample(latency=0.01, dropped=False)
+        assert limiter.limit == 11
+
+    async def test_decrease(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+
+        limiter.on_sample(latency=0.01, dropped=True)
+        assert limiter.limit == 5
+
+    async def test_timeout(self):
+        limiter = AIMDConcurrencyLimiter(
+            initial_limit=10, backoff_ratio=0.5, timeout=1.0
+        )
+
+        limiter.on_sample(latency=2.0, dropped=False)
+        assert limiter.limit == 5
+
+    @pytest.mark.parametrize("dropped", [True, False])
+    async def test_bounds(self, dropped: bool):
+        limiter = AIMDConcurrencyLimiter(initial_limit=2, min_limit=2, max_limit=2)
+        await _saturate(limiter)
+
+        limiter.on_sample(latency=0.01, dropped=dropped)
+        assert limiter.limit == 2
+
+
+class TestGradientConcurrencyLimiter:
+    async def test_steady_latency_grows(self):
+        limiter = GradientConcurrencyLimiter(initial_limit=10, smoothing=1.0)
+        await _saturate(limiter)
+
+        for _ in range(5):
+            limiter.on_sample(latency=0.1, dropped=False)
+
+        assert limiter.limit > 10
+
+    async def test_latency_growth_shrinks(self):
+        limiter = GradientConcurrencyLimiter(
+            initial_limit=100, smoothing=1.0, tolerance=1.0
+        )
+        await _saturate(limiter)
+
+        for _ in range(20):
+            limiter.on_sample(latency=0.1, dropped=False)
+        grown = limiter.limit
+
+        for _ in range(20):
+            limiter.on_sample(latency=1.0, dropped=False)
+
+        assert limiter.limit < grown
+        assert limiter.short_latency is not None
+        assert limiter.long_latency is not None
+        assert limiter.short_latency > limiter.long_latency
+
+    async def test_not_utilized(self):
+        limiter = GradientConcurrencyLimiter(initial_limit=10)
+
+        for _ in range(5):
+            limiter.on_sample(latency=0.1, dropped=False)
+
+        assert limiter.limit == 10
+
+    async def test_dropped(self):
+        limiter = GradientConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+
+        limiter.on_sample(latency=0.1, dropped=True)
+        assert limiter.limit == 5
+
+    @pytest.mark.parametrize("backoff_ratio", [0.4, 1.0])
+    async def test_backoff_ratio_range(self, backoff_ratio: float):
+        with pytest.raises(AssertionError):
+            GradientConcurrencyLimiter(backoff_ratio=backoff_ratio)
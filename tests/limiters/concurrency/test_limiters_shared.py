@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="shared limiters are POSIX only"
+)
+if sys.platform == "win32":
+    # the module is not importable, the check is also seen by type checkers
+    pytest.skip("shared limiters are POSIX only", allow_module_level=True)
+
+from extapi.limiters.concurrency.shared import SharedConcurrencyLimiter  # noqa: E402
+
+
+def _hold_permits(path: str, count: int, acquired) -> None:  # pragma: no cover
+    async def main():
+        limiter = SharedConcurrencyLimiter(path=path, max_concurrency=count)
+        for _ in range(count):
+            await limiter.get_semaphore().acquire()
+        acquired.set()
+        await asyncio.sleep(60)
+
+    asyncio.run(main())
+
+
+class TestSharedConcurrencyLimiter:
+    def test_name_or_path(self):
+        with pytest.raises(ValueError):
+            SharedConcurrencyLimiter(max_concurrency=1)
+
+        limiter = SharedConcurrencyLimiter(name="test", max_concurrency=1)
+        assert limiter.path.endswith("extapi-concurrency-test")
+
+    async def test_limit(self, tmp_path: Path):
+        limiter = SharedConcurrencyLimiter(path=tmp_path / "sem", max_concurrency=2)
+        first = limiter.get_semaphore()
+        second = limiter.get_semaphore()
+        third = limiter.get_semaphore()
+
+        await first.acquire()
+        await second.acquire()
+        assert limiter.held == 2
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(third.acquire(), timeout=0.1)
+
+        waiting = asyncio.ensure_future(third.acquire())
+        await asyncio.sleep(0)
+        await first.release()
+        await asyncio.wait_for(waiting, timeout=0.01)
+        assert limiter.held == 2
+
+        await second.release()
+        await third.release()
+        assert limiter.held == 0
+
+        limiter.close()
+
+    async def test_context_manager(self, tmp_path: Path):
+        limiter = SharedConcurrencyLimiter(path=tmp_path / "sem", max_concurrency=1)
+
+        async with limiter.get_semaphore():
+            assert limiter.held == 1
+
+        assert limiter.held == 0
+        limiter.close()
+
+    async def test_instances_share_process_state(self, tmp_path: Path):
+        first = SharedConcurrencyLimiter(path=tmp_path / "sem", max_concurrency=1)
+        second = SharedConcurrencyLimiter(path=tmp_path / "sem", max_concurrency=1)
+
+        await first.get_semaphore().acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(second.get_semaphore().acquire(), timeout=0.1)
+
+        first.close()
+
+    async def test_limit_mismatch(self, tmp_path: Path):
+        first = SharedConcurrencyLimiter(path=tmp_path / "sem", max_concurrency=1)
+        second = SharedConcurrencyLimiter(path=tmp_path / "sem", max_concurrency=2)
+
+        await first.get_semaphore().acquire()
+        with pytest.raises(ValueError):
+            await second.get_semaphore().acquire()
+
+        first.close()
+
+    async def test_cancelled_after_wakeup(self, tmp_path: Path):
+        limiter = SharedConcurrencyLimiter(
+            path=tmp_path / "sem", max_concurrency=1, poll_interval=60
+        )
+        holder = limiter.get_semaphore()
+        await holder.acquire()
+
+        woken = asyncio.ensure_future(limiter.get_semaphore().acquire())
+        await asyncio.sleep(0)
+        waiting = limiter.get_semaphore()
+        waiting_task = asyncio.ensure_future(waiting.acquire())
+        await asyncio.sleep(0)
+
+        # the first waiter is woken up and cancelled before it runs
+        await holder.release()
+        woken.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await woken
+
+        await asyncio.wait_for(waiting_task, timeout=1)
+        assert limiter.held == 1
+
+        await waiting.release()
+        limiter.close()
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="fork is not available",
+    )
+    async def test_reclaim_after_crash(self, tmp_path: Path):
+        path = str(tmp_path / "sem")
+        ctx = multiprocessing.get_context("fork")
+        acquired = ctx.Event()
+        process = ctx.Process(target=_hold_permits, args=(path, 2, acquired))
+        process.start()
+        try:
+            assert await asyncio.to_thread(acquired.wait, 10)
+
+            limiter = SharedConcurrencyLimiter(
+                path=path, max_concurrency=2, poll_interval=0.01
+            )
+            semaphore = limiter.get_semaphore()
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(semaphore.acquire(), timeout=0.1)
+
+            assert process.pid is not None
+            os.kill(process.pid, signal.SIGKILL)
+
+            await asyncio.wait_for(semaphore.acquire(), timeout=5)
+            assert limiter.held == 1
+            limiter.close()
+        finally:
+            process.kill()
+            process.join()
@@ -1,6 +1,14 @@
+import asyncio
 import time
 
-from extapi.limiters.rps.local import LocalRateLimiter
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from extapi.limiters.rps.local import (
+    GCRARateLimiter,
+    LocalRateLimiter,
+    TokenBucketRateLimiter,
+)
 
 
 class TestLocalLimiter:
@@ -23,3 +31,98 @@ class TestLocalLimiter:
         started_at = time.monotonic()
         await limiter.rate_limit()
         assert time.monotonic() - started_at >= 1.5
+
+
+class TestLocalLimiterFair:
+    async def test_free_space(self):
+        started_at = time.monotonic()
+        limiter = LocalRateLimiter(rate_limit=100, fair=True)
+        await limiter.rate_limit()
+        assert time.monotonic() - started_at < 0.01
+
+    async def test_fifo_slots(self):
+        limiter = LocalRateLimiter(rate_limit=2, rate_limit_window_seconds=1, fair=True)
+        started_at = time.monotonic()
+        woken: list[tuple[int, float]] = []
+
+        async def worker(i: int):
+            await limiter.rate_limit()
+            woken.append((i, time.monotonic() - started_at))
+
+        await asyncio.gather(*(worker(i) for i in range(5)))
+
+        assert [i for i, _ in woken] == [0, 1, 2, 3, 4]
+        elapsed = [t for _, t in woken]
+        assert elapsed[1] < 0.1
+        assert 0.9 <= elapsed[2] < 1.2
+        assert 0.9 <= elapsed[3] < 1.2
+        assert 1.9 <= elapsed[4] < 2.2
+
+    async def test_cancelled_waiter(self):
+        limiter = LocalRateLimiter(rate_limit=1, rate_limit_window_seconds=1, fair=True)
+        await limiter.rate_limit()
+
+        cancelled = asyncio.ensure_future(limiter.rate_limit())
+        waiting = asyncio.ensure_future(limiter.rate_limit())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        started_at = time.monotonic()
+        await waiting
+        assert 0.8 <= time.monotonic() - started_at < 1.2
+
+
+def _frozen_clock(mocker: MockerFixture, now: float = 100.0) -> list[float]:
+    sleeps: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    mocker.patch("extapi.limiters.rps.local.time.monotonic", return_value=now)
+    mocker.patch("extapi.limiters.rps.local.asyncio.sleep", side_effect=sleep)
+    return sleeps
+
+
+@pytest.mark.parametrize("limiter_cls", [TokenBucketRateLimiter, GCRARateLimiter])
+class TestO1Limiters:
+    async def test_no_limit(self, limiter_cls):
+        started_at = time.monotonic()
+        limiter = limiter_cls(rate_limit=0)
+        await limiter.rate_limit()
+        assert time.monotonic() - started_at < 0.01
+
+    async def test_burst(self, limiter_cls, mocker: MockerFixture):
+        sleeps = _frozen_clock(mocker)
+        limiter = limiter_cls(rate_limit=10, burst=3)
+
+        for _ in range(3):
+            await limiter.rate_limit()
+
+        assert sleeps == []
+
+    async def test_exact_sleeps(self, limiter_cls, mocker: MockerFixture):
+        sleeps = _frozen_clock(mocker)
+        limiter = limiter_cls(rate_limit=10, burst=2)
+
+        for _ in range(5):
+            await limiter.rate_limit()
+
+        # burst of 2 passes, every next waiter gets its own 0.1s slot
+        assert sleeps == pytest.approx([0.1, 0.2, 0.3])
+
+    async def test_window(self, limiter_cls, mocker: MockerFixture):
+        sleeps = _frozen_clock(mocker)
+        limiter = limiter_cls(rate_limit=2, rate_limit_window_seconds=10, burst=1)
+
+        for _ in range(3):
+            await limiter.rate_limit()
+
+        assert sleeps == pytest.approx([5.0, 10.0])
+
+    async def test_rate_limited(self, limiter_cls):
+        limiter = limiter_cls(rate_limit=1, rate_limit_window_seconds=0.2)
+        await limiter.rate_limit()  # no rate limit
+
+        started_at = time.monotonic()
+        await limiter.rate_limit()
+        assert time.monotonic() - started_at >= 0.15
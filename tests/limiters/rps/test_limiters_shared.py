@@ -0,0 +1,91 @@
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+pytest.importorskip("fcntl")
+
+from extapi.limiters.rps.shared import SharedRateLimiter  # noqa: E402
+
+
+def _frozen_clock(mocker: MockerFixture, now: float = 100.0) -> list[float]:
+    sleeps: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    mocker.patch("extapi.limiters.rps.shared.time.monotonic", return_value=now)
+    mocker.patch("extapi.limiters.rps.shared.asyncio.sleep", side_effect=sleep)
+    return sleeps
+
+
+class TestSharedRateLimiter:
+    def test_name_or_path(self):
+        with pytest.raises(ValueError):
+            SharedRateLimiter(rate_limit=1)
+
+        limiter = SharedRateLimiter(name="test", rate_limit=1)
+        assert limiter.path.endswith("extapi-rps-test")
+
+    async def test_no_limit(self, tmp_path: Path):
+        limiter = SharedRateLimiter(path=tmp_path / "rps", rate_limit=0)
+        await limiter.rate_limit()
+        assert not (tmp_path / "rps").exists()
+
+    async def test_shared_state(self, tmp_path: Path, mocker: MockerFixture):
+        sleeps = _frozen_clock(mocker)
+        path = tmp_path / "rps"
+
+        first = SharedRateLimiter(path=path, rate_limit=10, burst=1)
+        second = SharedRateLimiter(path=path, rate_limit=10, burst=1)
+
+        await first.rate_limit()
+        await second.rate_limit()
+        await first.rate_limit()
+
+        first.close()
+        second.close()
+
+        assert sleeps == pytest.approx([0.1, 0.2])
+
+    async def test_clock_reset(self, tmp_path: Path, mocker: MockerFixture):
+        sleeps = _frozen_clock(mocker)
+        limiter = SharedRateLimiter(path=tmp_path / "rps", rate_limit=1, burst=1)
+
+        await limiter.rate_limit()
+        await limiter.rate_limit()
+        assert sleeps == pytest.approx([1.0])
+
+        # simulate a reboot - monotonic clock is not in sync with the stored state
+        mocker.patch("extapi.limiters.rps.shared.time.time", return_value=0.0)
+        await limiter.rate_limit()
+        assert sleeps == pytest.approx([1.0])
+
+        limiter.close()
+
+    async def test_reopen_after_fork(self, tmp_path: Path, mocker: MockerFixture):
+        limiter = SharedRateLimiter(path=tmp_path / "rps", rate_limit=100)
+        await limiter.rate_limit()
+        old_mmap = limiter._mmap
+        assert old_mmap is not None
+
+        mocker.patch("extapi.limiters.rps.shared.os.getpid", return_value=-1)
+        await limiter.rate_limit()
+        assert limiter._pid == -1
+        assert limiter._mmap is not old_mmap
+        assert old_mmap.closed
+
+        limiter.close()
+
+    async def test_rate_limited(self, tmp_path: Path):
+        limiter = SharedRateLimiter(
+            path=tmp_path / "rps", rate_limit=1, rate_limit_window_seconds=0.2
+        )
+        await limiter.rate_limit()
+
+        started_at = time.monotonic()
+        await limiter.rate_limit()
+        assert time.monotonic() - started_at >= 0.15
+
+        limiter.close()